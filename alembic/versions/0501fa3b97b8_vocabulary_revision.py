@@ -0,0 +1,26 @@
+"""vocabulary revision
+
+Revision ID: 0501fa3b97b8
+Revises: 5d2e8a7c4f13
+Create Date: 2026-10-18 09:01:22.329276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0501fa3b97b8'
+down_revision: Union[str, None] = '5d2e8a7c4f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('vocabulary_revision', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'vocabulary_revision')
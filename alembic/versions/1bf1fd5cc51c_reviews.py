@@ -0,0 +1,45 @@
+"""reviews
+
+Revision ID: 1bf1fd5cc51c
+Revises: 9e3b7c5d2a10
+Create Date: 2026-10-18 08:35:29.526951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1bf1fd5cc51c'
+down_revision: Union[str, None] = '9e3b7c5d2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('miolingo_review',
+    sa.Column('translation_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('due_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('ease', sa.SmallInteger(), server_default='2500', nullable=False),
+    sa.Column('interval', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('repetitions', sa.SmallInteger(), server_default='0', nullable=False),
+    sa.Column('lapses', sa.SmallInteger(), server_default='0', nullable=False),
+    sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['translation_id'], ['miolingo_translation.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('translation_id')
+    )
+    op.create_index('ix_miolingo_review_user_id_due_at', 'miolingo_review', ['user_id', 'due_at'], unique=False)
+    # Existing translations are new cards, due since their creation.
+    op.execute(
+        "INSERT INTO miolingo_review (translation_id, user_id, due_at) "
+        "SELECT id, user_id, created_at FROM miolingo_translation"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_miolingo_review_user_id_due_at', table_name='miolingo_review')
+    op.drop_table('miolingo_review')
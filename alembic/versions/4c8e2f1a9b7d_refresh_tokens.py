@@ -0,0 +1,35 @@
+"""refresh tokens
+
+Revision ID: 4c8e2f1a9b7d
+Revises: da1d40d806a0
+Create Date: 2026-10-18 10:12:31.482113
+
+"""
+from typing import Sequence, Union
+
+import fastapi_users_db_sqlalchemy
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2f1a9b7d'
+down_revision: Union[str, None] = 'da1d40d806a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('refreshtoken',
+    sa.Column('token', sa.String(length=64), nullable=False),
+    sa.Column('user_id', fastapi_users_db_sqlalchemy.generics.GUID(), nullable=False),
+    sa.Column('created_at', fastapi_users_db_sqlalchemy.generics.TIMESTAMPAware(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('token')
+    )
+    op.create_index(op.f('ix_refreshtoken_created_at'), 'refreshtoken', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_refreshtoken_created_at'), table_name='refreshtoken')
+    op.drop_table('refreshtoken')
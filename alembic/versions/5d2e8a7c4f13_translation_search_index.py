@@ -0,0 +1,29 @@
+"""translation search index
+
+Revision ID: 5d2e8a7c4f13
+Revises: 1bf1fd5cc51c
+Create Date: 2026-10-18 14:02:47.118306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a7c4f13'
+down_revision: Union[str, None] = '1bf1fd5cc51c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.create_index('ix_miolingo_translation_user_id_slug_trgm', 'miolingo_translation', ['user_id', 'slug'], unique=False, postgresql_using='gin', postgresql_ops={'slug': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    # Extensions are left in place, they may be used by anything else.
+    op.drop_index('ix_miolingo_translation_user_id_slug_trgm', table_name='miolingo_translation', postgresql_using='gin', postgresql_ops={'slug': 'gin_trgm_ops'})
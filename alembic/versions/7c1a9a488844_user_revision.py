@@ -0,0 +1,26 @@
+"""user revision
+
+Revision ID: 7c1a9a488844
+Revises: 0501fa3b97b8
+Create Date: 2026-10-18 16:12:40.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1a9a488844'
+down_revision: Union[str, None] = '0501fa3b97b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'revision')
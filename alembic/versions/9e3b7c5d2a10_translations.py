@@ -0,0 +1,51 @@
+"""translations
+
+Revision ID: 9e3b7c5d2a10
+Revises: 4c8e2f1a9b7d
+Create Date: 2026-10-18 11:03:47.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3b7c5d2a10'
+down_revision: Union[str, None] = '4c8e2f1a9b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('miolingo_translation',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('lang', sa.String(length=2), nullable=False),
+    sa.Column('text', sa.String(length=2048), nullable=False),
+    sa.Column('slug', sa.String(length=2048), nullable=False),
+    sa.Column('priority', sa.SmallInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('modified_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_miolingo_translation_user_id_lang_slug', 'miolingo_translation', ['user_id', 'lang', 'slug'], unique=True)
+    op.create_index('ix_miolingo_translation_user_id_lang_priority', 'miolingo_translation', ['user_id', 'lang', 'priority', 'id'], unique=False, postgresql_include=['text'])
+    op.create_table('miolingo_translation_link',
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['source_id'], ['miolingo_translation.id'], ondelete='cascade'),
+    sa.ForeignKeyConstraint(['target_id'], ['miolingo_translation.id'], ondelete='cascade'),
+    sa.PrimaryKeyConstraint('source_id', 'target_id')
+    )
+    op.create_index('ix_miolingo_translation_link_target_id_source_id', 'miolingo_translation_link', ['target_id', 'source_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_miolingo_translation_link_target_id_source_id', table_name='miolingo_translation_link')
+    op.drop_table('miolingo_translation_link')
+    op.drop_index('ix_miolingo_translation_user_id_lang_priority', table_name='miolingo_translation')
+    op.drop_index('ux_miolingo_translation_user_id_lang_slug', table_name='miolingo_translation')
+    op.drop_table('miolingo_translation')
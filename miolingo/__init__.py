@@ -1,13 +1,27 @@
 import logging
+from typing import TYPE_CHECKING, Any
 
 from miolingo.conf.loggers import LOGGER_MIOLINGO  # noqa
-from miolingo.conf.settings import Settings
+
+if TYPE_CHECKING:
+    from miolingo.conf.settings import Settings
+
+    settings: Settings
 
 VERSION = (0, 0, 1)
 __version__ = ".".join(map(str, VERSION))
 
-# Load settings at root package level to be available as quickly as possible.
-settings = Settings()
-
 # Declare logger here to be available at root package, but would be configured later.
 logger: logging.Logger = logging.getLogger(LOGGER_MIOLINGO)
+
+
+def __getattr__(name: str) -> Any:
+    # Settings are loaded at root package level on first access (i.e: `from
+    # miolingo import settings`), not to import pydantic and read the
+    # environment for nothing when only importing the package (i.e: its version).
+    if name == "settings":
+        from miolingo.conf.settings import Settings
+
+        globals()["settings"] = Settings()
+        return globals()["settings"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,26 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi_users import BaseUserManager
+
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.backends.authentication import JWTRefreshStrategy, get_jwt_strategy
+from miolingo.managers.users import get_user_manager
+from miolingo.models.users import User
+from miolingo.schemas.auth import BearerRefreshResponse, RefreshTokenRequest
+
+router: APIRouter = APIRouter()
+
+
+@router.post("/refresh", response_model=BearerRefreshResponse, name="auth:jwt.refresh")
+async def refresh(
+    payload: RefreshTokenRequest,
+    user_manager: BaseUserManager[User, uuid.UUID] = Depends(get_user_manager),
+    strategy: JWTRefreshStrategy = Depends(get_jwt_strategy),
+) -> BearerRefreshResponse:
+    tokens = await strategy.refresh(payload.refresh_token, user_manager)
+    if tokens is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=ErrorCode.REFRESH_BAD_TOKEN)
+
+    access_token, refresh_token = tokens
+    return BearerRefreshResponse(access_token=access_token, refresh_token=refresh_token)
@@ -0,0 +1,29 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from miolingo.crud.users import current_superuser
+from miolingo.db.pool import get_pool_status
+from miolingo.db.session import async_engine
+from miolingo.schemas.internal import DBPoolStatus, RouteLatency
+from miolingo.utils.timing import http_request_duration
+
+router: APIRouter = APIRouter(dependencies=[Depends(current_superuser)])
+
+
+@router.get("/db/pool", response_model=DBPoolStatus, name="internal:db_pool")
+async def db_pool() -> dict[str, Any]:
+    return get_pool_status(async_engine)
+
+
+@router.get("/timings", response_model=list[RouteLatency], name="internal:timings")
+async def timings() -> list[dict[str, Any]]:
+    """
+    Latencies of the routes served by this worker, since it started.
+    """
+    timings = []
+    # By path, then method.
+    for (method, path), value in sorted(http_request_duration.values.items(), key=lambda item: item[0][::-1]):
+        buckets = dict(http_request_duration.cumulative(value))
+        timings.append(dict(method=method, path=path, count=buckets["+Inf"], sum=value[-1], buckets=buckets))
+    return timings
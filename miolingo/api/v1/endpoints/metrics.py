@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from miolingo.utils.metrics import CONTENT_TYPE, metrics_registry
+
+# Mounted at the root, to be scraped by Prometheus.
+router: APIRouter = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, name="metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Metrics of all the workers, in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from miolingo import settings
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.backends.answers import AnswerChecker
+from miolingo.crud.reviews import InvalidReviews, ReviewDatabase
+from miolingo.deps.reviews import get_review_db
+from miolingo.models.core import Review
+from miolingo.schemas.reviews import (
+    AnswerResult,
+    DueReview,
+    Quiz,
+    ReviewRead,
+    ReviewSession,
+)
+from miolingo.utils.responses import ModelResponse
+
+router: APIRouter = APIRouter()
+
+
+@router.get("/due", response_model=list[DueReview], name="reviews:due")
+async def list_due_reviews(
+    limit: int = Query(default=20, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    review_db: ReviewDatabase = Depends(get_review_db),
+) -> Response:
+    return ModelResponse([DueReview.model_validate(row) for row in await review_db.get_due(limit=limit)])
+
+
+@router.post("", response_model=list[ReviewRead], name="reviews:grade")
+async def grade_reviews(
+    review_session: ReviewSession,
+    review_db: ReviewDatabase = Depends(get_review_db),
+) -> list[Review]:
+    answers = [(answer.translation_id, answer.grade) for answer in review_session.answers]
+    try:
+        return await review_db.grade(answers)
+    except InvalidReviews:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.REVIEW_INVALID_TRANSLATIONS)
+
+
+@router.post("/check", response_model=list[AnswerResult], name="reviews:check")
+async def check_answers(
+    quiz: Quiz,
+    review_db: ReviewDatabase = Depends(get_review_db),
+) -> list[AnswerResult]:
+    """
+    Check the typed answers of a whole quiz, in order. Nothing is saved: the
+    suggested grades are to be submitted to grade the cards.
+    """
+    answers = [(answer.translation_id, answer.answer) for answer in quiz.answers]
+    try:
+        return await AnswerChecker(review_db).check(answers)
+    except InvalidReviews:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.REVIEW_INVALID_TRANSLATIONS)
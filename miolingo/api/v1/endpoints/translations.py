@@ -0,0 +1,186 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from miolingo import settings
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.backends.exports import ExportFormat, VocabularyExport
+from miolingo.backends.imports import VocabularyImport
+from miolingo.crud.translations import (
+    InvalidTranslationLinks,
+    TranslationAlreadyExists,
+    TranslationDatabase,
+)
+from miolingo.crud.users import current_verified_user
+from miolingo.db.pagination import InvalidCursor
+from miolingo.deps.caching import conditional_get
+from miolingo.deps.pagination import Pagination, get_pagination
+from miolingo.deps.translations import get_translation_db, get_vocabulary_version
+from miolingo.models.core import Translation
+from miolingo.models.users import User
+from miolingo.schemas.pagination import Page
+from miolingo.schemas.translations import (
+    Lang,
+    TranslationCreate,
+    TranslationItem,
+    TranslationMatch,
+    TranslationRead,
+    TranslationUpdate,
+)
+from miolingo.utils.responses import ModelResponse
+from miolingo.utils.streams import RequestStreamingResponse
+
+router: APIRouter = APIRouter()
+
+# Mobile clients poll the vocabulary, only send it again once changed.
+vocabulary_not_modified = conditional_get(get_vocabulary_version)
+
+
+async def get_translation_or_404(
+    id: int,
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> Translation:
+    translation = await translation_db.get(id)
+    if translation is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return translation
+
+
+@router.get(
+    "",
+    response_model=Page[TranslationItem],
+    name="translations:list",
+    dependencies=[Depends(vocabulary_not_modified)],
+)
+async def list_translations(
+    response: Response,
+    lang: Lang | None = None,
+    pagination: Pagination = Depends(get_pagination),
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> Response:
+    try:
+        rows, next_cursor = await translation_db.get_list(lang=lang, limit=pagination.limit, cursor=pagination.cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.PAGINATION_BAD_CURSOR)
+
+    total = await translation_db.estimate_count(lang=lang) if pagination.with_total else None
+    page = Page[TranslationItem](
+        items=[TranslationItem.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+        total=total,
+    )
+    # With the ETag of the vocabulary version.
+    return ModelResponse(page, headers=response.headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    name="translations:export",
+    responses={status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}}},
+)
+async def export_translations(
+    lang: Lang | None = None,
+    file_format: ExportFormat = Query("csv", alias="format"),
+    user: User = Depends(current_verified_user),
+) -> StreamingResponse:
+    """
+    Download the whole vocabulary, streamed while it is read from the DB.
+    """
+    exporter = VocabularyExport(user.id, lang=lang, file_format=file_format)
+    return StreamingResponse(
+        exporter.run(),
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{exporter.filename}"'},
+    )
+
+
+@router.get("/search", response_model=list[TranslationMatch], name="translations:search")
+async def search_translations(
+    q: str = Query(min_length=1, max_length=2048),
+    lang: Lang | None = None,
+    limit: int = Query(default=settings.SEARCH_DEFAULT_LIMIT, ge=1, le=settings.SEARCH_MAX_LIMIT),
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> Response:
+    """
+    Fuzzy search of words, tolerating typos, or completion of their beginning.
+    """
+    rows = await translation_db.search(q, lang=lang, limit=limit)
+    return ModelResponse([TranslationMatch.model_validate(row) for row in rows])
+
+
+@router.post("", response_model=TranslationRead, status_code=status.HTTP_201_CREATED, name="translations:create")
+async def create_translation(
+    translation_create: TranslationCreate,
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> Translation:
+    try:
+        return await translation_db.create(translation_create.model_dump())
+    except TranslationAlreadyExists:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.TRANSLATION_ALREADY_EXISTS)
+    except InvalidTranslationLinks:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.TRANSLATION_INVALID_LINKS)
+
+
+@router.post(
+    "/import",
+    response_class=RequestStreamingResponse,
+    name="translations:import",
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}}},
+)
+async def import_translations(
+    request: Request,
+    source: Lang,
+    target: Lang | None = None,
+    file_format: Literal["csv", "tsv"] = Query("csv", alias="format"),
+    header: bool = False,
+    user: User = Depends(current_verified_user),
+) -> RequestStreamingResponse:
+    """
+    Import a deck of words sent as the raw request body, parsed while it is
+    uploaded. Progress, then the result (or the failure) are streamed back as
+    JSON lines.
+    """
+    importer = VocabularyImport(
+        user.id,
+        source=source,
+        target=target,
+        delimiter="\t" if file_format == "tsv" else ",",
+        header=header,
+    )
+    events = (event.model_dump_json() + "\n" async for event in importer.run(request.stream()))
+    return RequestStreamingResponse(events, media_type="application/x-ndjson")
+
+
+@router.get(
+    "/{id}",
+    response_model=TranslationRead,
+    name="translations:get",
+    dependencies=[Depends(vocabulary_not_modified)],
+)
+async def get_translation(translation: Translation = Depends(get_translation_or_404)) -> Translation:
+    return translation
+
+
+@router.patch("/{id}", response_model=TranslationRead, name="translations:patch")
+async def update_translation(
+    translation_update: TranslationUpdate,
+    translation: Translation = Depends(get_translation_or_404),
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> Translation:
+    update_dict = translation_update.model_dump(exclude_unset=True, exclude_none=True)
+    try:
+        return await translation_db.update(translation, update_dict)
+    except TranslationAlreadyExists:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.TRANSLATION_ALREADY_EXISTS)
+    except InvalidTranslationLinks:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.TRANSLATION_INVALID_LINKS)
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response, name="translations:delete")
+async def delete_translation(
+    translation: Translation = Depends(get_translation_or_404),
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> None:
+    await translation_db.delete(translation)
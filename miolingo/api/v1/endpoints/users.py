@@ -0,0 +1,73 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.crud.users import current_superuser, current_verified_user
+from miolingo.db.pagination import InvalidCursor, estimate_count, paginate
+from miolingo.deps.caching import conditional_get
+from miolingo.deps.db import get_async_read_session, get_async_session
+from miolingo.deps.pagination import Pagination, get_pagination
+from miolingo.models.users import User
+from miolingo.schemas.pagination import Page
+from miolingo.schemas.users import UserRead
+from miolingo.utils.responses import ModelResponse
+
+router: APIRouter = APIRouter(dependencies=[Depends(current_superuser)])
+# Mounted along the fastapi-users routes of the current user, replacing its GET.
+current_user_router: APIRouter = APIRouter()
+
+
+@router.get("", response_model=Page[UserRead], name="users:list")
+async def list_users(
+    pagination: Pagination = Depends(get_pagination),
+    session: AsyncSession = Depends(get_async_read_session),
+) -> Response:
+    stmt = select(User)
+    try:
+        # Emails are unique, so enough as keyset, with their unique index.
+        users, next_cursor = await paginate(
+            session,
+            stmt,
+            columns=(User.email,),
+            limit=pagination.limit,
+            cursor=pagination.cursor,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.PAGINATION_BAD_CURSOR)
+
+    total = await estimate_count(session, stmt) if pagination.with_total else None
+    page = Page[UserRead](
+        items=[UserRead.model_validate(user, from_attributes=True) for user in users],
+        next_cursor=next_cursor,
+        total=total,
+    )
+    return ModelResponse(page)
+
+
+async def get_current_user_version(
+    user: User = Depends(current_verified_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> tuple[Any, ...]:
+    # The authenticated user is a snapshot (cached by each worker, or carried by
+    # a JWT) which may be stale, so not trusted here: only its revision is read
+    # again, from the primary.
+    stmt = select(User.revision).where(User.id == user.id)
+    return user.id, (await session.execute(stmt)).scalar_one()
+
+
+@current_user_router.get(
+    "/me",
+    response_model=UserRead,
+    name="users:current_user",
+    dependencies=[Depends(conditional_get(get_current_user_version))],
+)
+async def get_current_user(
+    user: User = Depends(current_verified_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> User:
+    # Not modified answers don't get there, the whole row is only read otherwise.
+    stmt = select(User).where(User.id == user.id).execution_options(populate_existing=True)
+    return (await session.execute(stmt)).scalar_one()
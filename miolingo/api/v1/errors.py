@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ErrorCode(str, Enum):
+    IMPORT_BAD_ENCODING = "IMPORT_BAD_ENCODING"
+    IMPORT_BAD_FORMAT = "IMPORT_BAD_FORMAT"
+    IMPORT_TOO_MANY_ROWS = "IMPORT_TOO_MANY_ROWS"
+    PAGINATION_BAD_CURSOR = "PAGINATION_BAD_CURSOR"
+    REFRESH_BAD_TOKEN = "REFRESH_BAD_TOKEN"
+    REVIEW_INVALID_TRANSLATIONS = "REVIEW_INVALID_TRANSLATIONS"
+    TRANSLATION_ALREADY_EXISTS = "TRANSLATION_ALREADY_EXISTS"
+    TRANSLATION_INVALID_LINKS = "TRANSLATION_INVALID_LINKS"
@@ -1,3 +1,9 @@
 from fastapi import APIRouter
 
+from miolingo.api.v1.endpoints import internal, reviews, translations, users
+
 api_router: APIRouter = APIRouter()
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(translations.router, prefix="/translations", tags=["translations"])
+api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
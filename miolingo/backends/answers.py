@@ -0,0 +1,210 @@
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from miolingo import settings
+from miolingo.crud.reviews import InvalidReviews, ReviewDatabase
+from miolingo.schemas.reviews import AnswerResult
+from miolingo.utils.cache import TTLCache
+from miolingo.utils.text import slugify
+
+# Leading articles (or infinitive marker) of the languages learnt, accepted but
+# not required: "the cat", "cat" and "le chat" answer "chat" alike.
+ARTICLES: frozenset[str] = frozenset(
+    {
+        *("the", "a", "an", "to"),
+        *("le", "la", "les", "l", "un", "une", "des"),
+        *("der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem", "einer"),
+        *("el", "los", "las", "uno", "una", "unos", "unas"),
+        *("il", "lo", "gli", "i"),
+    }
+)
+
+# Suggested grades of answers, from 0 (blackout) to 5 (perfect).
+GRADE_EXACT: int = 5
+GRADE_TYPOS: int = 4
+GRADE_WRONG: int = 1
+GRADE_BLANK: int = 0
+
+_alternatives = re.compile(r"[/;]")
+
+
+def answer_key(text: str) -> str:
+    """
+    Comparison key of an answer: its slug, without leading article.
+    """
+    slug = slugify(text)
+    article, _, rest = slug.partition("-")
+    return rest if rest and article in ARTICLES else slug
+
+
+def answer_variants(text: str) -> frozenset[str]:
+    """
+    Keys of the answers accepted for a translation, its alternatives being
+    separated by slashes or semicolons (i.e: "chat / chatte").
+    """
+    keys = (answer_key(alternative) for alternative in _alternatives.split(text))
+    return frozenset(key for key in keys if key)
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int | None:
+    """
+    Optimal string alignment distance (Levenshtein, plus transpositions of
+    adjacent characters) between both strings, or None when greater than
+    `max_distance`.
+
+    Only the diagonal band within the maximum distance is computed, and the
+    computation stops as soon as a whole row exceeds it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    over = max_distance + 1
+    before: list[int] = []
+    previous = [min(j, over) for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        current[0] = min(i, over)
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                distance = min(distance, before[j - 2] + 1)
+            current[j] = min(distance, over)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return None
+        before, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+@dataclass(frozen=True, slots=True)
+class ExpectedAnswers:
+    """
+    Accepted answers of a card: texts of its translations as written, and
+    their precomputed comparison keys.
+    """
+
+    texts: tuple[str, ...]
+    variants: frozenset[str]
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> "ExpectedAnswers":
+        texts = tuple(texts)
+        return cls(texts=texts, variants=frozenset().union(*(answer_variants(text) for text in texts)))
+
+
+class AnswerCache(TTLCache[tuple[uuid.UUID, int], ExpectedAnswers]):
+    """
+    Expected answers of cards, by user and translation ID: the same cards come
+    back session after session (i.e: failed ones).
+    """
+
+    def evict(self, user_id: uuid.UUID, translation_ids: Iterable[int]) -> None:
+        for translation_id in translation_ids:
+            self.pop((user_id, translation_id))
+
+    def evict_user(self, user_id: uuid.UUID) -> None:
+        # Linear scan, but only triggered by imports.
+        for key, _ in list(self):
+            if key[0] == user_id:
+                self.pop(key)
+
+
+answer_cache: AnswerCache = AnswerCache(maxsize=settings.ANSWER_CACHE_SIZE, ttl=settings.ANSWER_CACHE_TTL)
+
+
+class AnswerChecker:
+    """
+    Check typed answers of cards against the translations they are linked
+    to, regardless of case, accents and leading articles, and tolerating a
+    few typos (proportionally to the length of the expected answer).
+    """
+
+    def __init__(
+        self,
+        review_db: ReviewDatabase,
+        cache: AnswerCache = answer_cache,
+        max_typos: int = settings.ANSWER_MAX_TYPOS,
+        chars_per_typo: int = settings.ANSWER_CHARS_PER_TYPO,
+    ) -> None:
+        self.review_db = review_db
+        self.cache = cache
+        self.max_typos = max_typos
+        self.chars_per_typo = chars_per_typo
+
+    async def check(self, answers: Sequence[tuple[int, str]]) -> list[AnswerResult]:
+        """
+        Check the (translation ID, answer) pairs of a quiz, loading expected
+        answers of the cards missing from the cache with a single query.
+        Raise InvalidReviews if a card does not exist.
+        """
+        expected = await self.get_expected(list(dict.fromkeys(translation_id for translation_id, _ in answers)))
+        return [self.check_answer(id, answer, expected[id]) for id, answer in answers]
+
+    async def get_expected(self, translation_ids: list[int]) -> dict[int, ExpectedAnswers]:
+        user_id = self.review_db.user_id
+        expected: dict[int, ExpectedAnswers] = {}
+        missing: list[int] = []
+        for translation_id in translation_ids:
+            cached = self.cache.get((user_id, translation_id))
+            if cached is None:
+                missing.append(translation_id)
+            else:
+                expected[translation_id] = cached
+
+        if missing:
+            texts = await self.review_db.get_answers(missing)
+            if len(texts) != len(missing):
+                raise InvalidReviews()
+            for translation_id, translation_texts in texts.items():
+                expected[translation_id] = ExpectedAnswers.from_texts(translation_texts)
+                self.cache.set((user_id, translation_id), expected[translation_id])
+
+        return expected
+
+    def check_answer(self, translation_id: int, answer: str, expected: ExpectedAnswers) -> AnswerResult:
+        key = answer_key(answer)
+        distance = self.distance(key, expected.variants) if key else None
+
+        if not key:
+            grade = GRADE_BLANK
+        elif distance is None:
+            grade = GRADE_WRONG
+        elif distance == 0:
+            grade = GRADE_EXACT
+        else:
+            grade = GRADE_TYPOS
+
+        return AnswerResult(
+            translation_id=translation_id,
+            correct=distance is not None,
+            typos=distance,
+            grade=grade,
+            expected=list(expected.texts),
+        )
+
+    def distance(self, key: str, variants: frozenset[str]) -> int | None:
+        """
+        Smallest edit distance to an accepted variant, within the tolerance of
+        that variant.
+        """
+        if key in variants:
+            return 0
+
+        best: int | None = None
+        for variant in variants:
+            tolerance = min(self.max_typos, len(variant) // self.chars_per_typo)
+            if best is not None:
+                # Only a closer variant matters.
+                tolerance = min(tolerance, best - 1)
+            if tolerance < 1:
+                continue
+            distance = edit_distance(key, variant, tolerance)
+            if distance is not None:
+                best = distance
+        return best
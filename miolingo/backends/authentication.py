@@ -1,24 +1,316 @@
-from fastapi import Depends
-from fastapi_users.authentication import AuthenticationBackend, BearerTransport
+import hashlib
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import Depends, Response
+from fastapi.responses import JSONResponse
+from fastapi_users import BaseUserManager, exceptions
+from fastapi_users.authentication import (
+    AuthenticationBackend,
+    BearerTransport,
+    JWTStrategy,
+    Strategy,
+)
 from fastapi_users.authentication.strategy.db import (
     AccessTokenDatabase,
     DatabaseStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
+from sqlalchemy.orm import make_transient_to_detached
+
+import jwt
 
-from miolingo.deps.users import get_access_token_db
-from miolingo.models.users import AccessToken
+from miolingo import settings
+from miolingo.crud.tokens import RefreshTokenDatabase
+from miolingo.deps.users import get_access_token_db, get_refresh_token_db
+from miolingo.models.users import AccessToken, User
+from miolingo.schemas.auth import BearerRefreshResponse
+from miolingo.utils.cache import TTLCache
 
 bearer_transport = BearerTransport(tokenUrl="auth/login")
 
 
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# Columns needed to authenticate the user and to read it (i.e: UserRead), but
+# not the password hash nor values changing along (i.e: vocabulary_revision).
+USER_SNAPSHOT_FIELDS: tuple[str, ...] = (
+    "id",
+    "email",
+    "is_active",
+    "is_superuser",
+    "is_verified",
+    "first_name",
+    "last_name",
+)
+
+
+def snapshot_user(user: User) -> dict[str, Any]:
+    return {name: getattr(user, name) for name in USER_SNAPSHOT_FIELDS}
+
+
+async def attach_user(snapshot: dict[str, Any], user_manager: BaseUserManager[User, uuid.UUID]) -> User:
+    """
+    Rebuild a persistent instance into the request session without any
+    SELECT. Other columns are left unloaded: read them explicitly where
+    needed (i.e: `await user.awaitable_attrs.hashed_password`).
+    """
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await user_manager.user_db.session.merge(user, load=False)  # type: ignore[attr-defined]
+
+
+class AccessTokenCache(TTLCache[str, dict[str, Any]]):
+    """
+    Map a token hash to a snapshot of some columns of its user.
+
+    Snapshots are stored instead of ORM instances, which are bound to the
+    session of the request that loaded them.
+    """
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hash_token(token)
+
+    def evict_user(self, user_id: uuid.UUID) -> None:
+        # Linear scan, but only triggered by rare user writes.
+        for key, snapshot in list(self):
+            if snapshot["id"] == user_id:
+                self.pop(key)
+
+
+token_cache: AccessTokenCache = AccessTokenCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_CACHE_TTL,
+)
+
+
+class TokenRevocationList:
+    """
+    Remember revoked JWT (or all the JWT of a user issued before a date)
+    until they would expire anyway.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.tokens: TTLCache[str, bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.users: TTLCache[str, float] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        self.tokens.set(jti, True, ttl=expires_at - time.time())
+
+    def revoke_user(self, user_id: uuid.UUID) -> None:
+        self.users.set(str(user_id), time.time())
+
+    def is_revoked(self, claims: dict[str, Any]) -> bool:
+        if claims["jti"] in self.tokens:
+            return True
+        revoked_at = self.users.get(claims["sub"])
+        return revoked_at is not None and claims["iat"] < revoked_at
+
+    def clear(self) -> None:
+        self.tokens.clear()
+        self.users.clear()
+
+
+token_revocations: TokenRevocationList = TokenRevocationList(
+    maxsize=settings.AUTH_REVOCATION_LIST_SIZE,
+    ttl=settings.AUTH_JWT_LIFETIME,
+)
+
+
+def revoke_user_tokens(user_id: uuid.UUID) -> None:
+    """
+    Stop trusting the user snapshots of cached tokens and issued JWT.
+    """
+    token_cache.evict_user(user_id)
+    token_revocations.revoke_user(user_id)
+
+
+class CachedDatabaseStrategy(DatabaseStrategy[User, uuid.UUID, AccessToken]):
+    """
+    Database strategy looking up the token cache before hitting the DB.
+
+    Tokens are only read from the primary, never from a replica which may
+    still have a token deleted by a logout.
+    """
+
+    def __init__(self, *args: Any, cache: AccessTokenCache = token_cache, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    async def read_token(self, token: str | None, user_manager: BaseUserManager[User, uuid.UUID]) -> User | None:
+        if token is None:
+            return None
+
+        key = self.cache.key(token)
+        snapshot = self.cache.get(key)
+        if snapshot is not None:
+            return await attach_user(snapshot, user_manager)
+
+        access_token = await self._get_access_token(token)
+        if access_token is None:
+            return None
+
+        try:
+            user = await user_manager.get(user_manager.parse_id(access_token.user_id))
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        self.cache.set(key, snapshot_user(user), ttl=self._remaining(access_token))
+        return user
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        self.cache.pop(self.cache.key(token))
+        await super().destroy_token(token, user)
+
+    async def _get_access_token(self, token: str) -> AccessToken | None:
+        max_age = None
+        if self.lifetime_seconds:
+            max_age = datetime.now(timezone.utc) - timedelta(seconds=self.lifetime_seconds)
+        return await self.database.get_by_token(token, max_age)
+
+    def _remaining(self, access_token: AccessToken) -> float | None:
+        if not self.lifetime_seconds:
+            return None
+        elapsed = (datetime.now(timezone.utc) - access_token.created_at).total_seconds()
+        return self.lifetime_seconds - elapsed
+
+
+class JWTRefreshStrategy(JWTStrategy[User, uuid.UUID]):
+    """
+    Stateless strategy where access tokens are short-lived JWT carrying a
+    snapshot of the user, so that reading them doesn't query the DB at all.
+
+    Refresh tokens are stored (hashed) in DB and rotated on each use. The
+    JWT issued with them reference them (`sid`) to be deleted on logout.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        refresh_token_db: RefreshTokenDatabase,
+        refresh_lifetime_seconds: int,
+        revocations: TokenRevocationList = token_revocations,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.refresh_token_db = refresh_token_db
+        self.refresh_lifetime_seconds = refresh_lifetime_seconds
+        self.revocations = revocations
+
+    async def read_token(self, token: str | None, user_manager: BaseUserManager[User, uuid.UUID]) -> User | None:
+        if token is None:
+            return None
+
+        try:
+            claims = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+            user_id = user_manager.parse_id(claims["sub"])
+            snapshot = claims["user"]
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+
+        if self.revocations.is_revoked(claims):
+            return None
+
+        return await attach_user({"id": user_id, **snapshot}, user_manager)
+
+    async def write_token(self, user: User) -> str:
+        return self._encode(user)
+
+    async def write_tokens(self, user: User) -> tuple[str, str]:
+        """
+        Issue an access token along with a new refresh token.
+        """
+        refresh_token = secrets.token_urlsafe()
+        sid = hash_token(refresh_token)
+        await self.refresh_token_db.create({"token": sid, "user_id": user.id})
+        return self._encode(user, sid=sid), refresh_token
+
+    async def refresh(
+        self,
+        refresh_token: str,
+        user_manager: BaseUserManager[User, uuid.UUID],
+    ) -> tuple[str, str] | None:
+        max_age = datetime.now(timezone.utc) - timedelta(seconds=self.refresh_lifetime_seconds)
+        # Consumed whatever happens next, a refresh token is only usable once.
+        user_id = await self.refresh_token_db.pop(hash_token(refresh_token), max_age)
+        if user_id is None:
+            return None
+
+        user = await user_manager.get(user_id)
+        if not user.is_active or not user.is_verified:
+            return None
+
+        return await self.write_tokens(user)
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        try:
+            claims = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+        except jwt.PyJWTError:
+            return
+
+        self.revocations.revoke(claims["jti"], expires_at=claims["exp"])
+        if sid := claims.get("sid"):
+            await self.refresh_token_db.delete_by_token(sid)
+
+    def _encode(self, user: User, sid: str | None = None) -> str:
+        snapshot = snapshot_user(user)
+        del snapshot["id"]
+
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "iat": time.time(),
+            "jti": secrets.token_urlsafe(16),
+            "user": snapshot,
+        }
+        if sid is not None:
+            data["sid"] = sid
+
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+
+class RefreshAuthenticationBackend(AuthenticationBackend[User, uuid.UUID]):
+    """
+    Authentication backend giving a refresh token along with the access one on login.
+    """
+
+    async def login(self, strategy: Strategy[User, uuid.UUID], user: User) -> Response:
+        assert isinstance(strategy, JWTRefreshStrategy)
+        access_token, refresh_token = await strategy.write_tokens(user)
+        return JSONResponse(BearerRefreshResponse(access_token=access_token, refresh_token=refresh_token).model_dump())
+
+
 def get_database_strategy(
     access_token_db: AccessTokenDatabase[AccessToken] = Depends(get_access_token_db),
 ) -> DatabaseStrategy:
-    return DatabaseStrategy(access_token_db, lifetime_seconds=3600)
+    return CachedDatabaseStrategy(access_token_db, lifetime_seconds=settings.AUTH_TOKEN_LIFETIME)
 
 
-auth_backend = AuthenticationBackend(
+def get_jwt_strategy(
+    refresh_token_db: RefreshTokenDatabase = Depends(get_refresh_token_db),
+) -> JWTRefreshStrategy:
+    return JWTRefreshStrategy(
+        settings.SECRET,
+        lifetime_seconds=settings.AUTH_JWT_LIFETIME,
+        refresh_token_db=refresh_token_db,
+        refresh_lifetime_seconds=settings.AUTH_REFRESH_TOKEN_LIFETIME,
+    )
+
+
+database_auth_backend = AuthenticationBackend(
     name="database",
     transport=bearer_transport,
     get_strategy=get_database_strategy,
 )
+jwt_auth_backend = RefreshAuthenticationBackend(
+    name="jwt",
+    transport=bearer_transport,
+    get_strategy=get_jwt_strategy,
+)
+auth_backend: AuthenticationBackend = jwt_auth_backend if settings.AUTH_BACKEND == "jwt" else database_auth_backend
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import uuid
+from typing import Any, AsyncIterator, Iterable, Literal, Sequence
+
+from sqlalchemy import Row
+
+from miolingo import settings
+from miolingo.crud.translations import TranslationDatabase
+from miolingo.deps.db import get_async_read_session
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+class VocabularyExport:
+    """
+    Export the whole vocabulary of a user, encoded by batches of rows as they
+    are fetched, so that memory stays flat whatever the size of the vocabulary.
+    """
+
+    columns: tuple[str, ...] = ("id", "lang", "text", "priority", "translation_ids")
+    media_types: dict[str, str] = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+    def __init__(
+        self,
+        user_id: uuid.UUID,
+        lang: str | None = None,
+        file_format: ExportFormat = "csv",
+        batch_size: int = settings.EXPORT_BATCH_SIZE,
+    ) -> None:
+        self.user_id = user_id
+        self.lang = lang
+        self.file_format = file_format
+        self.batch_size = batch_size
+
+    @property
+    def media_type(self) -> str:
+        return self.media_types[self.file_format]
+
+    @property
+    def filename(self) -> str:
+        return f"vocabulary.{self.file_format}"
+
+    async def run(self) -> AsyncIterator[str]:
+        # Not the session of the request, which is closed before its response is streamed.
+        async for session in get_async_read_session():
+            translation_db = TranslationDatabase(session, self.user_id)
+            if self.file_format == "csv":
+                yield self.encode_csv([self.columns])
+            async for rows in translation_db.stream_export(lang=self.lang, batch_size=self.batch_size):
+                yield self.encode(rows)
+
+    def encode(self, rows: Sequence[Row]) -> str:
+        if self.file_format == "csv":
+            # Linked translations are space separated.
+            return self.encode_csv(
+                (id, lang, text, priority, " ".join(map(str, translation_ids or [])))
+                for id, lang, text, priority, translation_ids in rows
+            )
+
+        return "".join(
+            json.dumps(
+                {
+                    "id": id,
+                    "lang": lang,
+                    "text": text,
+                    "priority": priority,
+                    "translation_ids": translation_ids or [],
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            for id, lang, text, priority, translation_ids in rows
+        )
+
+    @staticmethod
+    def encode_csv(rows: Iterable[Sequence[Any]]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
@@ -0,0 +1,158 @@
+import csv
+import uuid
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import BaseModel
+
+from miolingo import settings
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.crud.translations import TranslationDatabase
+from miolingo.db.session import async_session_factory
+from miolingo.schemas.translations import (
+    ImportFailure,
+    ImportProgress,
+    ImportResult,
+    ImportRowError,
+)
+from miolingo.utils.streams import read_csv
+from miolingo.utils.text import slugify_batch
+
+
+class VocabularyImport:
+    """
+    Import a deck of words (i.e: exported by Anki) in the source language, one
+    per row, with their translation in the target language in the next column.
+    Other columns are ignored.
+
+    Rows are normalized and deduplicated by batches while the file is
+    uploaded, keeping at most `max_rows` of them in memory. The DB is only hit
+    once the file is read to the end, so that a slow upload doesn't hold a
+    connection: the records are then copied to a staging table and merged in a
+    single transaction. Row errors are reported, but don't prevent the other
+    rows from being imported.
+    """
+
+    def __init__(
+        self,
+        user_id: uuid.UUID,
+        source: str,
+        target: str | None = None,
+        delimiter: str = ",",
+        header: bool = False,
+        max_rows: int = settings.IMPORT_MAX_ROWS,
+        max_errors: int = settings.IMPORT_MAX_ERRORS,
+        progress_rows: int = settings.IMPORT_PROGRESS_ROWS,
+        batch_rows: int = settings.IMPORT_BATCH_ROWS,
+    ) -> None:
+        self.user_id = user_id
+        self.source = source
+        self.target = target
+        self.delimiter = delimiter
+        self.header = header
+        self.max_rows = max_rows
+        self.max_errors = max_errors
+        self.progress_rows = progress_rows
+        self.batch_rows = batch_rows
+
+        self.rows: int = 0
+        self.error_count: int = 0
+        self.errors: list[ImportRowError] = []
+        # Line and texts of the rows parsed since the last batch, normalized all at once.
+        self._batch: list[tuple[int, str, str | None]] = []
+        # Valid records by pair of slugs, only the first row of each pair.
+        self._records: dict[tuple[str, str | None], tuple[int, str, str, str | None, str | None]] = {}
+
+    async def run(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[BaseModel]:
+        """
+        Yield progress events while parsing, then the result or the failure.
+        """
+        try:
+            async for line, row in read_csv(chunks, delimiter=self.delimiter):
+                if self.header:
+                    self.header = False
+                    continue
+                # Leading comments, i.e: "#separator:tab" headers of Anki exports.
+                if not self.rows and row[0].startswith("#"):
+                    continue
+
+                self.rows += 1
+                if self.rows > self.max_rows:
+                    yield ImportFailure(detail=ErrorCode.IMPORT_TOO_MANY_ROWS)
+                    return
+                self.add(line, row)
+
+                if len(self._batch) >= self.batch_rows:
+                    self.normalize()
+                if self.rows % self.progress_rows == 0:
+                    yield ImportProgress(rows=self.rows)
+        except UnicodeDecodeError:
+            yield ImportFailure(detail=ErrorCode.IMPORT_BAD_ENCODING)
+            return
+        except csv.Error:
+            yield ImportFailure(detail=ErrorCode.IMPORT_BAD_FORMAT)
+            return
+
+        self.normalize()
+        created, linked = await self.save()
+        yield ImportResult(
+            rows=self.rows,
+            created=created,
+            linked=linked,
+            error_count=self.error_count,
+            errors=self.errors,
+        )
+
+    def add(self, line: int, row: list[str]) -> None:
+        target_text: str | None = None
+        if self.target is not None:
+            target_text = row[1].strip() if len(row) > 1 else ""
+        self._batch.append((line, row[0].strip(), target_text))
+
+    def normalize(self) -> None:
+        """
+        Add the valid rows of the current batch to the records with their
+        slugs, then clear it. Invalid ones are reported as errors.
+        """
+        batch, self._batch = self._batch, []
+        source_slugs = slugify_batch(source_text for _, source_text, _ in batch)
+        target_slugs = slugify_batch(target_text or "" for _, _, target_text in batch)
+
+        for (line, source_text, target_text), source_slug, slug in zip(batch, source_slugs, target_slugs):
+            if not self._check(line, source_text, source_slug):
+                continue
+            target_slug: str | None = None
+            if target_text is not None:
+                if not self._check(line, target_text, slug):
+                    continue
+                target_slug = slug
+            self._records.setdefault(
+                (source_slug, target_slug),
+                (line, source_text, source_slug, target_text, target_slug),
+            )
+
+    async def save(self) -> tuple[int, int]:
+        if not self._records:
+            return 0, 0
+
+        async with async_session_factory() as session:
+            translation_db = TranslationDatabase(session, self.user_id)
+            await translation_db.create_import_table()
+            await translation_db.copy_import_records(self._records.values())
+            return await translation_db.merge_import(self.source, self.target)
+
+    def _check(self, line: int, text: str, slug: str) -> bool:
+        detail: str | None = None
+        if not text:
+            detail = "Text is missing"
+        elif len(text) > 2048 or len(slug) > 2048:
+            detail = "Text should have at most 2048 characters"
+        elif not slug:
+            detail = "Text should contain at least a letter or a digit"
+
+        if detail is None:
+            return True
+
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ImportRowError(line=line, detail=detail))
+        return False
@@ -0,0 +1,162 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from pydantic import EmailStr
+
+from miolingo import logger, settings
+
+
+@dataclass(frozen=True)
+class Mail:
+    subject: str
+    recipients: list[EmailStr]
+    template_name: str
+    template_body: dict[str, Any]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+async def send_mail(mail: Mail) -> None:
+    # Imported on the first mail only, fastapi-mail being slow to import.
+    # Then resolved at call time to use the current mailer (i.e: patched by tests).
+    from miolingo.utils import mails as mail_utils
+
+    await mail_utils.send_mail_with_template(
+        subject=mail.subject,
+        recipients=mail.recipients,
+        template_name=mail.template_name,
+        template_body=mail.template_body,
+        **mail.kwargs,
+    )
+
+
+class MailDispatcher:
+    """
+    Send mails in background with a pool of workers consuming a bounded queue.
+
+    Each worker pulls a batch of pending mails at once, then sends them
+    concurrently over the pooled SMTP sessions (the pool bounding them), and
+    retries each failing one with an exponential backoff, without holding the
+    others. When not started (i.e: CLI), mails are sent inline.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Mail], Awaitable[None]] = send_mail,
+        maxsize: int = 0,
+        workers: int = 1,
+        batch_size: int = 1,
+        max_retries: int = 0,
+        retry_delay: float = 1.0,
+        retry_delay_max: float = 60.0,
+    ) -> None:
+        self.send = send
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retry_delay_max = retry_delay_max
+
+        self.sent: int = 0
+        self.failed: int = 0
+
+        self._queue: asyncio.Queue[Mail] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"mail-dispatcher-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Wait for pending mails to be sent until the deadline, then stop workers.
+        """
+        if not self.running:
+            return
+
+        try:
+            await self.join(timeout=timeout)
+        except TimeoutError:
+            logger.error("Mail dispatcher stopped with %d pending mail(s) lost", self.pending)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def join(self, timeout: float | None = None) -> None:
+        if self._queue is not None:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+
+    async def enqueue(self, mail: Mail) -> None:
+        if self._queue is None:
+            await self._send(mail)
+            return
+        # Wait for a free slot when the queue is full to apply backpressure.
+        await self._queue.put(mail)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await self._send_batch(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _send_batch(self, batch: list[Mail]) -> None:
+        # Failures are handled per mail, none is raised.
+        await asyncio.gather(*(self._send(mail) for mail in batch))
+
+    async def _send(self, mail: Mail) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.send(mail)
+            except Exception:
+                if attempt >= self.max_retries:
+                    self.failed += 1
+                    logger.exception("Failed to send mail %r after %d attempt(s)", mail.subject, attempt + 1)
+                    return
+
+                delay = min(self.retry_delay * 2**attempt, self.retry_delay_max)
+                logger.warning("Failed to send mail %r, retry in %.2fs", mail.subject, delay, exc_info=True)
+                # Full jitter to not retry all together against a recovering server.
+                await asyncio.sleep(random.uniform(0, delay))
+            else:
+                self.sent += 1
+                return
+
+
+mail_dispatcher: MailDispatcher = MailDispatcher(
+    maxsize=settings.MAIL_QUEUE_SIZE,
+    workers=settings.MAIL_QUEUE_WORKERS,
+    batch_size=settings.MAIL_QUEUE_BATCH_SIZE,
+    max_retries=settings.MAIL_QUEUE_MAX_RETRIES,
+    retry_delay=settings.MAIL_QUEUE_RETRY_DELAY,
+    retry_delay_max=settings.MAIL_QUEUE_RETRY_DELAY_MAX,
+)
@@ -0,0 +1,128 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, TypeVar
+
+from fastapi_users.password import PasswordHelper
+
+from miolingo import logger, settings
+from miolingo.utils.metrics import Histogram, metrics_registry
+
+T = TypeVar("T")
+
+PoolType = Literal["thread", "process", "none"]
+
+password_hash_duration: Histogram = metrics_registry.histogram(
+    "miolingo_password_hash_duration_seconds",
+    "Time to hash or verify passwords, waiting for the executor included.",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# Module level helper and functions to be picklable by process pools.
+password_helper: PasswordHelper = PasswordHelper()
+
+
+def _hash(password: str) -> str:
+    return password_helper.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return password_helper.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordExecutor:
+    """
+    Run CPU-bound password hashing out of the event loop.
+
+    Argon2 and bcrypt bindings release the GIL, so a thread pool is usually
+    enough. A process pool is available for hashers which don't. With "none",
+    hashing is done inline, mainly for testing purpose.
+    """
+
+    def __init__(self, pool: PoolType = "thread", max_workers: int | None = None) -> None:
+        self.pool = pool
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor | None:
+        # Lazily created to not spawn anything at import time.
+        if self._executor is None:
+            if self.pool == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password")
+            elif self.pool == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.pool == "none":
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def hash(self, password: str) -> str:
+        start = time.perf_counter()
+        try:
+            return await self.run(_hash, password)
+        finally:
+            password_hash_duration.observe(time.perf_counter() - start, "hash")
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        start = time.perf_counter()
+        try:
+            return await self.run(_verify_and_update, plain_password, hashed_password)
+        finally:
+            password_hash_duration.observe(time.perf_counter() - start, "verify")
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class ExecutorPasswordHelper(PasswordHelper):
+    """
+    Password helper of the user manager, which calls it synchronously from the
+    event loop. Results are rather computed ahead by the executor (see the
+    `prepare_*` methods), then served when asked for.
+
+    Anything not prepared (i.e: a new call of the base manager) is still
+    computed, inline but with a warning.
+    """
+
+    def __init__(self, executor: PasswordExecutor) -> None:
+        super().__init__()
+        self.executor = executor
+        self._hashes: dict[str, str] = {}
+        self._verifications: dict[tuple[str, str], tuple[bool, str | None]] = {}
+
+    async def prepare_hash(self, password: str) -> None:
+        self._hashes[password] = await self.executor.hash(password)
+
+    async def prepare_verify(self, plain_password: str, hashed_password: str) -> None:
+        key = (plain_password, hashed_password)
+        self._verifications[key] = await self.executor.verify_and_update(plain_password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        hashed_password = self._hashes.pop(password, None)
+        if hashed_password is None:
+            logger.warning("Password hashed in the event loop, as it was not prepared")
+            hashed_password = super().hash(password)
+        return hashed_password
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        result = self._verifications.pop((plain_password, hashed_password), None)
+        if result is None:
+            logger.warning("Password verified in the event loop, as it was not prepared")
+            result = super().verify_and_update(plain_password, hashed_password)
+        return result
+
+
+password_executor: PasswordExecutor = PasswordExecutor(
+    pool=settings.PASSWORD_HASHER_POOL,
+    max_workers=settings.PASSWORD_HASHER_POOL_SIZE,
+)
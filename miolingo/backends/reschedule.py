@@ -0,0 +1,106 @@
+import asyncio
+
+from sqlalchemy import ARRAY, Integer, SmallInteger, Update, func, literal, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise RuntimeError("Did you forgot to install numpy to reschedule reviews?")
+
+from miolingo import settings
+from miolingo.backends.scheduler import SchedulerParameters, scheduler_parameters
+from miolingo.db.session import async_session_factory
+from miolingo.models.core import Review
+
+
+def reschedule(
+    ease: np.ndarray,
+    interval: np.ndarray,
+    repetitions: np.ndarray,
+    previous: SchedulerParameters,
+    parameters: SchedulerParameters,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ease factors and intervals of cards scheduled with previous parameters, as
+    the new ones would have scheduled them. Vectorized version of the bounds
+    and modifier applied by `schedule()`, on whole columns at once.
+    """
+    ease = np.maximum(ease, parameters.min_ease)
+    # Only intervals of learnt cards are scaled, learning steps are fixed.
+    scaled = np.rint(interval * (parameters.interval_modifier / previous.interval_modifier))
+    scaled = np.clip(scaled, 1, parameters.max_interval).astype(interval.dtype)
+    interval = np.where(repetitions >= 2, scaled, np.minimum(interval, parameters.max_interval))
+    return ease, interval
+
+
+async def reschedule_reviews(
+    previous: SchedulerParameters,
+    parameters: SchedulerParameters = scheduler_parameters,
+    session_factory: async_sessionmaker = async_session_factory,
+    batch_size: int = settings.REVIEW_RESCHEDULE_BATCH_SIZE,
+) -> int:
+    """
+    Recompute the schedule of all the reviewed cards after a change of the
+    scheduler parameters. Return the number of cards rescheduled.
+
+    Cards are walked by batches along the primary key, each one locked, loaded
+    into arrays, recomputed and written back with a single UPDATE in its own
+    transaction, so that grading can go on meanwhile.
+    """
+    total = 0
+    last_id = 0
+    while True:
+        batch = (
+            select(Review.translation_id, Review.ease, Review.interval, Review.repetitions)
+            .where(Review.translation_id > last_id, Review.reviewed_at.is_not(None))
+            .order_by(Review.translation_id)
+            .limit(batch_size)
+            .with_for_update()
+            .subquery()
+        )
+        # Fetched as one array per column, much cheaper to load than rows. All
+        # of them are aggregated in the same pass, hence in the same order.
+        stmt = select(*(func.array_agg(column) for column in batch.c))
+        async with session_factory() as session:
+            columns = (await session.execute(stmt)).one()
+            if columns[0] is None:
+                break
+
+            ids, ease, interval, repetitions = np.array(columns, dtype=np.int32)
+            new_ease, new_interval = reschedule(ease, interval, repetitions, previous, parameters)
+
+            changed = (new_ease != ease) | (new_interval != interval)
+            if changed.any():
+                await session.execute(_update_stmt(ids[changed], new_ease[changed], new_interval[changed]))
+            await session.commit()
+
+        total += int(changed.sum())
+        last_id = int(ids.max())
+        if len(ids) < batch_size:
+            break
+        # Let other tasks run between batches.
+        await asyncio.sleep(0)
+
+    return total
+
+
+def _update_stmt(ids: np.ndarray, ease: np.ndarray, interval: np.ndarray) -> Update:
+    # Arrays bound as 3 parameters and zipped back into rows by unnest(), the
+    # statement stays the same whatever the batch size (unlike VALUES lists).
+    values = select(
+        func.unnest(literal(ids.tolist(), ARRAY(Integer))).label("translation_id"),
+        func.unnest(literal(ease.tolist(), ARRAY(SmallInteger))).label("ease"),
+        func.unnest(literal(interval.tolist(), ARRAY(Integer))).label("interval"),
+    ).subquery()
+    return (
+        update(Review)
+        # The range of the batch, to not join the whole table.
+        .where(Review.translation_id.between(int(ids.min()), int(ids.max())))
+        .where(Review.translation_id == values.c.translation_id)
+        .values(
+            ease=values.c.ease,
+            interval=values.c.interval,
+            due_at=Review.reviewed_at + func.make_interval(0, 0, 0, values.c.interval),
+        )
+    )
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, replace
+
+from miolingo import settings
+
+# Grades from which the answer is a success.
+PASSING_GRADE: int = 3
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryState:
+    """
+    Memory of a card, as scheduled by SM-2: ease factor in thousandths (i.e:
+    2500 for 2.5), interval in days, successful repetitions in a row and
+    failures after at least one success.
+    """
+
+    ease: int = 2500
+    interval: int = 0
+    repetitions: int = 0
+    lapses: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerParameters:
+    """
+    Bounds of SM-2, and a modifier scaling the intervals of learnt cards (i.e:
+    0.8 to review them more often).
+    """
+
+    min_ease: int = 1300
+    max_interval: int = 36500
+    interval_modifier: float = 1.0
+
+
+scheduler_parameters: SchedulerParameters = SchedulerParameters(
+    min_ease=settings.REVIEW_MIN_EASE,
+    max_interval=settings.REVIEW_MAX_INTERVAL,
+    interval_modifier=settings.REVIEW_INTERVAL_MODIFIER,
+)
+
+
+def schedule(state: MemoryState, grade: int, parameters: SchedulerParameters = scheduler_parameters) -> MemoryState:
+    """
+    Next memory state of a card given the grade of an answer, from 0 (complete
+    blackout) to 5 (perfect response), following the SM-2 algorithm.
+
+    On failure, the card is learnt again from the beginning (due the next day),
+    without changing its ease factor.
+    """
+    if grade < PASSING_GRADE:
+        lapses = state.lapses + 1 if state.repetitions else state.lapses
+        return replace(state, interval=1, repetitions=0, lapses=lapses)
+
+    if state.repetitions == 0:
+        interval = 1
+    elif state.repetitions == 1:
+        interval = 6
+    else:
+        interval = round(state.interval * state.ease / 1000 * parameters.interval_modifier)
+        interval = min(max(interval, 1), parameters.max_interval)
+
+    miss = 5 - grade
+    ease = max(state.ease + 100 - miss * (80 + miss * 20), parameters.min_ease)
+    return MemoryState(ease=ease, interval=interval, repetitions=state.repetitions + 1, lapses=state.lapses)
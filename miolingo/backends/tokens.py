@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from miolingo import logger, settings
+from miolingo.db.session import async_session_factory
+from miolingo.models.users import AccessToken, RefreshToken
+
+
+async def purge_expired_tokens(
+    model: type[AccessToken] | type[RefreshToken] = AccessToken,
+    session_factory: async_sessionmaker = async_session_factory,
+    lifetime: int = settings.AUTH_TOKEN_LIFETIME,
+    batch_size: int = settings.AUTH_TOKEN_PURGE_BATCH_SIZE,
+) -> int:
+    """
+    Delete access (or refresh) tokens older than their lifetime, by batches each committed
+    on its own to keep locks short. Return the number of tokens deleted.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lifetime)
+    # Oldest first with the created_at index, skipping rows locked by another janitor.
+    batch = (
+        select(model.token)
+        .where(model.created_at < cutoff)
+        .order_by(model.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = delete(model).where(model.token.in_(batch.scalar_subquery()))
+
+    total = 0
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            break
+        # Let other tasks (i.e: requests) run between batches.
+        await asyncio.sleep(0)
+
+    return total
+
+
+class TokenJanitor:
+    """
+    Periodically purge expired access and refresh tokens in background.
+    """
+
+    def __init__(
+        self,
+        interval: float = 3600.0,
+        lifetime: int = settings.AUTH_TOKEN_LIFETIME,
+        refresh_lifetime: int = settings.AUTH_REFRESH_TOKEN_LIFETIME,
+        batch_size: int = settings.AUTH_TOKEN_PURGE_BATCH_SIZE,
+    ) -> None:
+        self.interval = interval
+        self.lifetime = lifetime
+        self.refresh_lifetime = refresh_lifetime
+        self.batch_size = batch_size
+
+        self.purged: int = 0
+
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self.running or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run(), name="token-janitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def purge(self) -> int:
+        count = await purge_expired_tokens(AccessToken, lifetime=self.lifetime, batch_size=self.batch_size)
+        count += await purge_expired_tokens(RefreshToken, lifetime=self.refresh_lifetime, batch_size=self.batch_size)
+        self.purged += count
+        if count:
+            logger.info("Purged %d expired token(s)", count)
+        return count
+
+    async def _run(self) -> None:
+        while True:
+            # Wait first, to not slow down startup with a purge.
+            await asyncio.sleep(self.interval)
+            try:
+                await self.purge()
+            except Exception:
+                logger.exception("Failed to purge expired tokens")
+
+
+token_janitor: TokenJanitor = TokenJanitor(
+    interval=settings.AUTH_TOKEN_PURGE_INTERVAL,
+    lifetime=settings.AUTH_TOKEN_LIFETIME,
+    refresh_lifetime=settings.AUTH_REFRESH_TOKEN_LIFETIME,
+    batch_size=settings.AUTH_TOKEN_PURGE_BATCH_SIZE,
+)
@@ -0,0 +1,31 @@
+import argparse
+import asyncio
+
+from miolingo import settings
+from miolingo.backends.tokens import purge_expired_tokens
+from miolingo.db.session import async_engine
+from miolingo.models.users import AccessToken, RefreshToken
+
+
+async def purge(lifetime: int, refresh_lifetime: int, batch_size: int) -> int:
+    try:
+        count = await purge_expired_tokens(AccessToken, lifetime=lifetime, batch_size=batch_size)
+        count += await purge_expired_tokens(RefreshToken, lifetime=refresh_lifetime, batch_size=batch_size)
+        return count
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Delete expired access and refresh tokens.")
+    parser.add_argument("--lifetime", type=int, default=settings.AUTH_TOKEN_LIFETIME, help="Token lifetime in seconds")
+    parser.add_argument("--refresh-lifetime", type=int, default=settings.AUTH_REFRESH_TOKEN_LIFETIME)
+    parser.add_argument("--batch-size", type=int, default=settings.AUTH_TOKEN_PURGE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    count = asyncio.run(purge(args.lifetime, args.refresh_lifetime, args.batch_size))
+    print(f"{count} expired token(s) purged")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
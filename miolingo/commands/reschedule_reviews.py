@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+
+from miolingo import settings
+from miolingo.backends.reschedule import reschedule_reviews
+from miolingo.backends.scheduler import SchedulerParameters
+from miolingo.db.session import async_engine
+
+
+async def reschedule(previous: SchedulerParameters, batch_size: int) -> int:
+    try:
+        return await reschedule_reviews(previous, batch_size=batch_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute the schedule of reviewed cards with the current scheduler settings."
+    )
+    parser.add_argument(
+        "--previous-interval-modifier",
+        type=float,
+        default=settings.REVIEW_INTERVAL_MODIFIER,
+        help="Interval modifier the cards were scheduled with",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.REVIEW_RESCHEDULE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    previous = SchedulerParameters(interval_modifier=args.previous_interval_modifier)
+    count = asyncio.run(reschedule(previous, args.batch_size))
+    print(f"{count} review(s) rescheduled")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -11,6 +11,9 @@ conf: dict[str, Any] = {
             "format": "[%(asctime)s] %(levelname)s [%(name)s.%(funcName)s:%(lineno)d] %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
+        "json": {
+            "()": "miolingo.utils.logs.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
@@ -19,6 +22,27 @@ conf: dict[str, Any] = {
             "formatter": "default",
             "stream": "ext://sys.stdout",
         },
+        "console_json": {
+            "class": "logging.StreamHandler",
+            "level": "DEBUG",
+            "formatter": "json",
+            "stream": "ext://sys.stdout",
+        },
+        # Formatted and written to the console by a background thread, not to block the event loop.
+        "queue": {
+            "()": "miolingo.utils.logs.QueueHandler",
+            "level": "DEBUG",
+            "formatter": "default",
+            "stream": "ext://sys.stdout",
+            "maxsize": 10000,
+        },
+        "queue_json": {
+            "()": "miolingo.utils.logs.QueueHandler",
+            "level": "DEBUG",
+            "formatter": "json",
+            "stream": "ext://sys.stdout",
+            "maxsize": 10000,
+        },
         "null": {
             "class": "logging.NullHandler",
         },
@@ -43,17 +67,20 @@ conf: dict[str, Any] = {
 }
 
 
-def configure_loggers(handlers: list[str], level: int, propagate: bool = False) -> None:
+def configure_loggers(handlers: list[str], level: int, propagate: bool = False, queue_size: int = 10000) -> None:
     """
     By careful, this function MUST be called AFTER any loggers have been already initialized.
     """
     # Change level only for our logger for now.
     conf["loggers"][LOGGER_MIOLINGO]["level"] = level
+    # Records beyond are dropped (but errors).
+    conf["handlers"]["queue"]["maxsize"] = conf["handlers"]["queue_json"]["maxsize"] = queue_size
 
     # However, change handlers for all loggers defined to use the same.
     for logger in conf["loggers"].keys():
         conf["loggers"][logger]["handlers"] = handlers
         conf["loggers"][logger]["propagate"] = propagate
 
-    # Then lets Python std lib do its jobs!
-    logging.config.dictConfig(conf)
+    # Then lets Python std lib do its jobs! Only with handlers in use, not to start queue threads for nothing.
+    used = {*handlers, *conf["root"]["handlers"]}
+    logging.config.dictConfig({**conf, "handlers": {k: v for k, v in conf["handlers"].items() if k in used}})
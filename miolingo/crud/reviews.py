@@ -0,0 +1,93 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from miolingo.backends.scheduler import MemoryState, schedule
+from miolingo.models.core import Review, Translation, translation_link
+
+
+class InvalidReviews(Exception):
+    pass
+
+
+class ReviewDatabase:
+    """
+    Cards of a user, any other user ones being out of reach.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: uuid.UUID) -> None:
+        self.session = session
+        self.user_id = user_id
+
+    async def get_due(self, limit: int = 20, now: datetime | None = None) -> Sequence[Row]:
+        now = now or datetime.now(timezone.utc)
+        # A range scan of the due index, then a lookup of each translation by primary key.
+        stmt = (
+            select(*Review.__table__.columns, Translation.lang, Translation.text)
+            .join(Translation, Translation.id == Review.translation_id)
+            .where(Review.user_id == self.user_id, Review.due_at <= now)
+            .order_by(Review.due_at)
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    async def get_answers(self, translation_ids: Sequence[int]) -> dict[int, list[str]]:
+        """
+        Texts of the translations linked to each card, i.e: its accepted
+        answers, by priority. Cards of other users are left out.
+        """
+        target = aliased(Translation)
+        texts = func.array_agg(aggregate_order_by(target.text, target.priority.desc(), target.id))
+        stmt = (
+            select(Review.translation_id, texts.filter(target.id.is_not(None)))
+            .outerjoin(translation_link, translation_link.c.source_id == Review.translation_id)
+            .outerjoin(target, target.id == translation_link.c.target_id)
+            .where(Review.translation_id.in_(translation_ids), Review.user_id == self.user_id)
+            .group_by(Review.translation_id)
+        )
+        return {translation_id: texts or [] for translation_id, texts in await self.session.execute(stmt)}
+
+    async def grade(self, answers: Sequence[tuple[int, int]], now: datetime | None = None) -> list[Review]:
+        """
+        Schedule cards given the (translation ID, grade) answers of a session,
+        all in one transaction: the reviews are locked with a single query,
+        then updated with a single batch.
+        """
+        now = now or datetime.now(timezone.utc)
+        translation_ids = list(dict.fromkeys(translation_id for translation_id, _ in answers))
+        stmt = (
+            select(Review)
+            .where(Review.translation_id.in_(translation_ids), Review.user_id == self.user_id)
+            .with_for_update()
+        )
+        reviews = {review.translation_id: review for review in await self.session.scalars(stmt)}
+        if len(reviews) != len(translation_ids):
+            await self.session.rollback()
+            raise InvalidReviews()
+
+        for translation_id, grade in answers:
+            review = reviews[translation_id]
+            state = schedule(
+                MemoryState(
+                    ease=review.ease,
+                    interval=review.interval,
+                    repetitions=review.repetitions,
+                    lapses=review.lapses,
+                ),
+                grade,
+            )
+            review.ease = state.ease
+            review.interval = state.interval
+            review.repetitions = state.repetitions
+            review.lapses = state.lapses
+            review.due_at = now + timedelta(days=state.interval)
+            review.reviewed_at = now
+
+        # Updates of the same columns by primary key are flushed as one executemany().
+        await self.session.commit()
+        return [reviews[translation_id] for translation_id in translation_ids]
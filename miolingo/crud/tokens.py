@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from fastapi_users_db_sqlalchemy.access_token import SQLAlchemyAccessTokenDatabase
+from sqlalchemy import delete
+
+from miolingo.models.users import RefreshToken
+
+
+class RefreshTokenDatabase(SQLAlchemyAccessTokenDatabase[RefreshToken]):
+    async def pop(self, token: str, max_age: datetime | None = None) -> uuid.UUID | None:
+        """
+        Delete the token if still valid and return its user ID, in a single
+        statement so that a token can't be consumed twice concurrently.
+        """
+        stmt = delete(RefreshToken).where(RefreshToken.token == token).returning(RefreshToken.user_id)
+        if max_age is not None:
+            stmt = stmt.where(RefreshToken.created_at >= max_age)
+
+        user_id = await self.session.scalar(stmt)
+        await self.session.commit()
+        return user_id
+
+    async def delete_by_token(self, token: str) -> None:
+        await self.session.execute(delete(RefreshToken).where(RefreshToken.token == token))
+        await self.session.commit()
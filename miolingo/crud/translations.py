@@ -0,0 +1,346 @@
+import uuid
+from typing import Any, AsyncIterator, Iterable, Sequence
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Row,
+    Select,
+    String,
+    Table,
+    and_,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, selectinload
+
+from miolingo.backends.answers import answer_cache
+from miolingo.db.pagination import estimate_count, paginate
+from miolingo.models.core import Review, Translation, translation_link
+from miolingo.models.users import User
+from miolingo.utils.text import slugify
+
+
+# Staging table of imports, only living in the transaction of the connection
+# creating it, hence out of the models metadata.
+translation_import = Table(
+    "miolingo_translation_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("source_text", String(length=2048), nullable=False),
+    Column("source_slug", String(length=2048), nullable=False),
+    Column("target_text", String(length=2048)),
+    Column("target_slug", String(length=2048)),
+    prefixes=["TEMPORARY"],
+)
+
+
+class TranslationAlreadyExists(Exception):
+    pass
+
+
+class InvalidTranslationLinks(Exception):
+    pass
+
+
+class TranslationDatabase:
+    """
+    Translations of a user, any other user ones being out of reach.
+    """
+
+    def __init__(self, session: AsyncSession, user_id: uuid.UUID) -> None:
+        self.session = session
+        self.user_id = user_id
+
+    async def get_list(
+        self,
+        lang: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[Sequence[Row], str | None]:
+        # Columns and order of the listing index, without links: a single index-only scan.
+        return await paginate(
+            self.session,
+            self._list_stmt(lang),
+            columns=(Translation.lang, Translation.priority, Translation.id),
+            limit=limit,
+            cursor=cursor,
+            descending=True,
+        )
+
+    async def stream_export(self, lang: str | None = None, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yield batches of rows fetched through a server-side cursor.
+        """
+        result = await self.session.stream(self._export_stmt(lang).execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+    async def search(self, q: str, lang: str | None = None, limit: int = 20) -> Sequence[Row]:
+        """
+        Words similar to the query or starting with it, the most similar first,
+        then by priority. Compared as slugs, so regardless of case and accents.
+        """
+        term = slugify(q)
+        if not term:
+            return []
+
+        return (await self.session.execute(self._search_stmt(term, lang, limit))).all()
+
+    async def estimate_count(self, lang: str | None = None) -> int | None:
+        return await estimate_count(self.session, self._list_stmt(lang))
+
+    async def get_revision(self) -> int:
+        """
+        Revision of the vocabulary, incremented by each change of it.
+        """
+        stmt = select(User.vocabulary_revision).where(User.id == self.user_id)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def get(self, id: int) -> Translation | None:
+        stmt = (
+            select(Translation)
+            .where(Translation.id == id, Translation.user_id == self.user_id)
+            .options(selectinload(Translation.translations))
+            # Reload server side values (i.e: modified_at) of instances already in session.
+            .execution_options(populate_existing=True)
+        )
+        return await self.session.scalar(stmt)
+
+    async def create(self, create_dict: dict[str, Any]) -> Translation:
+        translation_ids = create_dict.pop("translation_ids", [])
+        translation = Translation(user_id=self.user_id, slug=slugify(create_dict["text"]), **create_dict)
+        self.session.add(translation)
+
+        await self._flush()
+        await self._set_links(translation.id, translation_ids)
+        # A new card to review, due right now.
+        await self.session.execute(insert(Review).values(translation_id=translation.id, user_id=self.user_id))
+        await self._bump_revision()
+        await self.session.commit()
+        # A new accepted answer of the linked cards.
+        answer_cache.evict(self.user_id, translation_ids)
+
+        return await self._reload(translation.id)
+
+    async def update(self, translation: Translation, update_dict: dict[str, Any]) -> Translation:
+        translation_ids = update_dict.pop("translation_ids", None)
+        # Answers of the card, and of the cards it is (or will be) an answer of.
+        evicted = [translation.id, *(t.id for t in translation.translations), *(translation_ids or [])]
+        for key, value in update_dict.items():
+            setattr(translation, key, value)
+        if "text" in update_dict:
+            translation.slug = slugify(translation.text)
+
+        await self._flush()
+        if translation_ids is not None:
+            await self._set_links(translation.id, translation_ids)
+        await self._bump_revision()
+        await self.session.commit()
+        answer_cache.evict(self.user_id, evicted)
+
+        return await self._reload(translation.id)
+
+    async def delete(self, translation: Translation) -> None:
+        evicted = [translation.id, *(t.id for t in translation.translations)]
+        # Links are deleted in cascade by the DB.
+        await self.session.execute(delete(Translation).where(Translation.id == translation.id))
+        await self._bump_revision()
+        await self.session.commit()
+        answer_cache.evict(self.user_id, evicted)
+
+    async def create_import_table(self) -> None:
+        """
+        Create the staging table of an import, to be filled with
+        `copy_import_records()` then merged with `merge_import()`, in the same
+        transaction.
+        """
+        conn = await self.session.connection()
+        await conn.run_sync(translation_import.create)
+
+    async def copy_import_records(self, records: Iterable[tuple[int, str, str, str | None, str | None]]) -> None:
+        """
+        Copy (line, source text, source slug, target text, target slug) records
+        into the staging table.
+        """
+        conn = await self.session.connection()
+        raw_conn = await conn.get_raw_connection()
+        await raw_conn.driver_connection.copy_records_to_table(
+            translation_import.name,
+            records=records,
+            columns=[c.name for c in translation_import.columns],
+        )
+
+    async def merge_import(self, source: str, target: str | None = None) -> tuple[int, int]:
+        """
+        Merge the staging table in a single statement: words already saved are
+        kept, as well as their links. Return the number of words created and
+        of pairs linked.
+        """
+        conn = await self.session.connection()
+
+        staging = translation_import.c
+        words = union_all(
+            select(
+                staging.line,
+                literal(source).label("lang"),
+                staging.source_text.label("text"),
+                staging.source_slug.label("slug"),
+            ),
+            select(staging.line, literal(target), staging.target_text, staging.target_slug).where(
+                staging.target_slug.is_not(None)
+            ),
+        ).subquery()
+        # The text of a word is taken from its first row.
+        user_id = literal(self.user_id, Translation.user_id.type)
+        created_words = (
+            insert(Translation)
+            .from_select(
+                ["user_id", "lang", "text", "slug", "priority"],
+                select(user_id, words.c.lang, words.c.text, words.c.slug, literal(0))
+                .distinct(words.c.lang, words.c.slug)
+                .order_by(words.c.lang, words.c.slug, words.c.line),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "lang", "slug"])
+            .returning(Translation.id, Translation.user_id)
+            .cte("created_words")
+        )
+        # Along with their cards to review, in the same statement.
+        stmt = insert(Review).from_select(
+            ["translation_id", "user_id"],
+            select(created_words.c.id, created_words.c.user_id),
+        )
+        created = (await self.session.execute(stmt)).rowcount
+
+        linked = 0
+        if target is not None:
+            source_word, target_word = aliased(Translation), aliased(Translation)
+            pairs = (
+                select(source_word.id.label("source_id"), target_word.id.label("target_id"))
+                .select_from(translation_import)
+                .join(
+                    source_word,
+                    and_(
+                        source_word.user_id == self.user_id,
+                        source_word.lang == source,
+                        source_word.slug == staging.source_slug,
+                    ),
+                )
+                .join(
+                    target_word,
+                    and_(
+                        target_word.user_id == self.user_id,
+                        target_word.lang == target,
+                        target_word.slug == staging.target_slug,
+                    ),
+                )
+                .where(source_word.id != target_word.id)
+                .cte()
+            )
+            # Links are symmetric, so stored in both directions.
+            links = union(
+                select(pairs.c.source_id, pairs.c.target_id),
+                select(pairs.c.target_id, pairs.c.source_id),
+            )
+            stmt = insert(translation_link).from_select(["source_id", "target_id"], links).on_conflict_do_nothing()
+            linked = (await self.session.execute(stmt)).rowcount // 2
+
+        await conn.run_sync(translation_import.drop)
+        if created or linked:
+            await self._bump_revision()
+        await self.session.commit()
+        if linked:
+            answer_cache.evict_user(self.user_id)
+
+        return created, linked
+
+    def _list_stmt(self, lang: str | None = None) -> Select:
+        stmt = select(Translation.id, Translation.lang, Translation.text, Translation.priority).where(
+            Translation.user_id == self.user_id
+        )
+        if lang is not None:
+            stmt = stmt.where(Translation.lang == lang)
+        return stmt
+
+    def _search_stmt(self, term: str, lang: str | None = None, limit: int = 20) -> Select:
+        # Both the similarity operator and the prefix match are served by the trigram index.
+        similarity = func.similarity(Translation.slug, term).label("similarity")
+        stmt = (
+            select(Translation.id, Translation.lang, Translation.text, Translation.priority, similarity)
+            .where(
+                Translation.user_id == self.user_id,
+                or_(Translation.slug.op("%")(term), Translation.slug.startswith(term)),
+            )
+            .order_by(similarity.desc(), Translation.priority.desc(), Translation.id.desc())
+            .limit(limit)
+        )
+        if lang is not None:
+            stmt = stmt.where(Translation.lang == lang)
+        return stmt
+
+    def _export_stmt(self, lang: str | None = None) -> Select:
+        link = translation_link.c
+        translation_ids = (
+            select(func.array_agg(aggregate_order_by(link.target_id, link.target_id)))
+            .where(link.source_id == Translation.id)
+            .scalar_subquery()
+        )
+        # In the listing order, to walk its index instead of sorting the whole
+        # vocabulary before the first row comes.
+        return (
+            self._list_stmt(lang)
+            .add_columns(translation_ids.label("translation_ids"))
+            .order_by(Translation.lang.desc(), Translation.priority.desc(), Translation.id.desc())
+        )
+
+    async def _bump_revision(self) -> None:
+        # In the same transaction as the change, so never ahead nor behind it.
+        await self.session.execute(
+            update(User)
+            .where(User.id == self.user_id)
+            # Not a change of the user itself.
+            .values(vocabulary_revision=User.vocabulary_revision + 1, revision=User.revision)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _flush(self) -> None:
+        try:
+            await self.session.flush()
+        except IntegrityError:
+            await self.session.rollback()
+            raise TranslationAlreadyExists()
+
+    async def _set_links(self, id: int, translation_ids: list[int]) -> None:
+        targets = set(translation_ids)
+        if targets:
+            stmt = select(Translation.id).where(Translation.id.in_(targets), Translation.user_id == self.user_id)
+            found = set(await self.session.scalars(stmt))
+            if id in targets or found != targets:
+                await self.session.rollback()
+                raise InvalidTranslationLinks()
+
+        await self.session.execute(
+            delete(translation_link).where(
+                or_(translation_link.c.source_id == id, translation_link.c.target_id == id),
+            )
+        )
+        if targets:
+            # Links are symmetric, so stored in both directions.
+            rows = [{"source_id": id, "target_id": t} for t in targets]
+            rows += [{"source_id": t, "target_id": id} for t in targets]
+            await self.session.execute(insert(translation_link).values(rows).on_conflict_do_nothing())
+
+    async def _reload(self, id: int) -> Translation:
+        translation = await self.get(id)
+        assert translation is not None
+        return translation
@@ -1,3 +1,16 @@
-from miolingo.main import fastapi_users
+import uuid
+
+from fastapi_users import FastAPIUsers
+
+from miolingo.backends.authentication import auth_backend
+from miolingo.managers.users import get_user_manager
+from miolingo.models.users import User
+
+fastapi_users: FastAPIUsers = FastAPIUsers[User, uuid.UUID](
+    get_user_manager,
+    [auth_backend],
+)
 
 current_active_user = fastapi_users.current_user(active=True)
+current_verified_user = fastapi_users.current_user(active=True, verified=True)
+current_superuser = fastapi_users.current_user(active=True, verified=True, superuser=True)
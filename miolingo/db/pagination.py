@@ -0,0 +1,116 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import ClauseElement, Executable, Select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN a statement, keeping its bound parameters.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], default=str)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[ColumnElement]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor()
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor()
+
+    # Back to the column types, i.e: for UUID or datetime values.
+    try:
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (AttributeError, TypeError, ValueError):
+        raise InvalidCursor()
+
+
+def _coerce(column: ColumnElement, value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if not isinstance(value, python_type):
+        return python_type(value)
+    return value
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    columns: Sequence[ColumnElement],
+    limit: int,
+    cursor: str | None = None,
+    descending: bool = False,
+) -> tuple[Sequence[Any], str | None]:
+    """
+    Fetch a page of the statement rows ordered by the keyset columns, the
+    last one being unique (i.e: the id), with the cursor of the next page.
+
+    Rows after the cursor are found with a row comparison, so that an index
+    on these columns seeks the page directly whatever its depth, unlike an
+    OFFSET. All columns are sorted the same way for that.
+    """
+    if cursor is not None:
+        keyset = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, columns))
+        stmt = stmt.where(keyset < values if descending else keyset > values)
+
+    stmt = stmt.order_by(*[c.desc() if descending else c for c in columns]).limit(limit + 1)
+    result = await session.execute(stmt)
+    # ORM entities (i.e: select(User)) or rows of columns.
+    rows = result.scalars().all() if len(stmt.column_descriptions) == 1 else result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in columns])
+
+    return rows, next_cursor
+
+
+async def estimate_count(session: AsyncSession, stmt: Select) -> int | None:
+    """
+    Estimate rows of a statement from the planner statistics, which is
+    way cheaper than a COUNT(*) scanning them all.
+    """
+    froms = stmt.get_final_froms()
+    if stmt.whereclause is None and len(froms) == 1:
+        # The whole table, as counted by the last VACUUM or ANALYZE.
+        reltuples = await session.scalar(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+            {"name": froms[0].name},  # type: ignore[attr-defined]
+        )
+        # Never analyzed yet.
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+    plan = await session.scalar(Explain(stmt))
+    return int(plan[0]["Plan"]["Plan Rows"])
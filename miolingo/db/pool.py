@@ -0,0 +1,111 @@
+import time
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+from miolingo import logger, settings
+from miolingo.utils.metrics import Counter, Gauge, Histogram, metrics_registry
+
+# Of all engines.
+db_pool_wait: Histogram = metrics_registry.histogram(
+    "miolingo_db_pool_wait_seconds",
+    "Time to acquire a DB connection, waiting for a free one or opening it.",
+)
+db_pool_timeouts: Counter = metrics_registry.counter(
+    "miolingo_db_pool_timeouts_total",
+    "DB connections not acquired in time.",
+)
+# Of the primary engine only, set on collection.
+db_pool_gauges: dict[str, Gauge] = {
+    "size": metrics_registry.gauge("miolingo_db_pool_size", "Connections kept open by the DB pool."),
+    "checked_out": metrics_registry.gauge("miolingo_db_pool_checked_out", "DB connections in use."),
+    "overflow": metrics_registry.gauge(
+        "miolingo_db_pool_overflow",
+        "DB connections opened beyond the pool size, negative until the pool is full.",
+    ),
+}
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    # Time spent to acquire connections (waiting for a free one, or opening it).
+    wait_time: float = 0.0
+    wait_time_max: float = 0.0
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool recording how long it takes to acquire a connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            db_pool_timeouts.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats.checkouts += 1
+            self.stats.wait_time += elapsed
+            self.stats.wait_time_max = max(self.stats.wait_time_max, elapsed)
+            db_pool_wait.observe(elapsed)
+
+            if elapsed >= settings.DB_POOL_WAIT_WARNING:
+                logger.warning("Waited %.3fs for a DB connection: %s", elapsed, self.status())
+
+
+def get_pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.pool
+    status: dict[str, Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Negative until the pool is full.
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedAsyncAdaptedQueuePool):
+        status.update(asdict(pool.stats))
+
+    return status
+
+
+def collect_pool_metrics(engine: AsyncEngine) -> None:
+    status = get_pool_status(engine)
+    for name, gauge in db_pool_gauges.items():
+        if name in status:
+            gauge.set(status[name])
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open connections ahead of the first requests, up to the pool size, and
+    check them with a trivial query before giving them back to the pool.
+    """
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+
+    try:
+        # All held at once, to open as many of them.
+        async with AsyncExitStack() as stack:
+            for _ in range(connections):
+                conn = await stack.enter_async_context(engine.connect())
+                await conn.execute(text("SELECT 1"))
+    except Exception:
+        # Connections will be opened on demand, once the DB is reachable.
+        logger.exception("Failed to warm up the DB pool")
@@ -0,0 +1,34 @@
+import itertools
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+ReplicaSelection = Literal["round_robin", "least_connections"]
+
+
+class ReplicaRouter:
+    """
+    Pick a read replica engine for read-only sessions.
+
+    Only sessions are routed, not statements, so that a transaction never
+    reads on a replica what it has just written on the primary.
+    """
+
+    def __init__(self, replicas: list[AsyncEngine], selection: ReplicaSelection = "round_robin") -> None:
+        self.replicas = replicas
+        self.selection = selection
+        self._cycle = itertools.cycle(replicas)
+
+    def get_engine(self) -> AsyncEngine | None:
+        if not self.replicas:
+            return None
+
+        if self.selection == "least_connections":
+            return min(self.replicas, key=self._checked_out)
+        return next(self._cycle)
+
+    @staticmethod
+    def _checked_out(engine: AsyncEngine) -> int:
+        pool = engine.pool
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
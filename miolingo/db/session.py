@@ -1,11 +1,40 @@
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from miolingo import settings
+from miolingo.db.instrumentation import instrument_engine
+from miolingo.db.pool import InstrumentedAsyncAdaptedQueuePool, collect_pool_metrics
+from miolingo.db.replicas import ReplicaRouter
+from miolingo.utils.metrics import metrics_registry
 
 if settings.POSTGRES_URI is None:  # pragma: no cover
     raise RuntimeError("Did you forgot to export POSTGRES_ env vars?")
 
-async_engine: AsyncEngine = create_async_engine(url=str(settings.POSTGRES_URI))
+
+def create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # SQLAlchemy cache of asyncpg prepared statements.
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            # asyncpg own cache of prepared statements.
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    instrument_engine(engine)
+    return engine
+
+
+async_engine: AsyncEngine = create_engine(str(settings.POSTGRES_URI))
+async_read_engines: list[AsyncEngine] = [create_engine(str(uri)) for uri in settings.POSTGRES_REPLICA_URIS]
+replica_router: ReplicaRouter = ReplicaRouter(async_read_engines, selection=settings.DB_REPLICA_SELECTION)
+metrics_registry.add_collector(lambda: collect_pool_metrics(async_engine))
+
 async_session_factory: async_sessionmaker = async_sessionmaker(
     bind=async_engine,
     # Prevent attributes from being expired after commit/transaction.
@@ -0,0 +1,44 @@
+import hashlib
+from typing import Any, Awaitable, Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+
+def make_etag(version: Any) -> str:
+    """
+    Weak ETag of a version key: the same key gives the same data, but not
+    necessarily the same bytes.
+    """
+    return f'W/"{hashlib.blake2b(repr(version).encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    # Weak comparison, as required for If-None-Match.
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def conditional_get(
+    version: Callable[..., Any],
+    cache_control: str = "private, no-cache",
+) -> Callable[..., Awaitable[None]]:
+    """
+    Dependency answering 304 Not Modified when the ETag of the version key
+    given by the `version` dependency is still the one of the client, before
+    the endpoint loads or serializes anything. Otherwise, the ETag and the
+    Cache-Control policy of the route are set on the response.
+
+    The version key should be cheap (i.e: a revision counter), and change
+    whenever the response would.
+    """
+
+    async def dependency(request: Request, response: Response, key: Any = Depends(version)) -> None:
+        etag = make_etag(key)
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None and etag_matches(etag, if_none_match):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
@@ -1,10 +1,25 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from miolingo.db.session import async_session_factory
+from miolingo.db.session import async_session_factory, replica_router
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         yield session
+
+
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only queries, bound to a replica if any, else to the primary.
+
+    Replicas may lag behind, so don't use it to read what was just written.
+    """
+    kwargs: dict[str, Any] = {}
+    engine = replica_router.get_engine()
+    if engine is not None:
+        kwargs["bind"] = engine
+
+    async with async_session_factory(**kwargs) as session:
+        yield session
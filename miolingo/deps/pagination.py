@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from fastapi import Query
+
+from miolingo import settings
+
+
+@dataclass
+class Pagination:
+    cursor: str | None
+    limit: int
+    with_total: bool
+
+
+def get_pagination(
+    cursor: str | None = Query(default=None, description="Cursor of the page, as given by the previous one"),
+    limit: int = Query(default=settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    with_total: bool = Query(default=False, description="Include an estimated total"),
+) -> Pagination:
+    return Pagination(cursor=cursor, limit=limit, with_total=with_total)
@@ -0,0 +1,16 @@
+from typing import AsyncGenerator
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.crud.reviews import ReviewDatabase
+from miolingo.crud.users import current_verified_user
+from miolingo.deps.db import get_async_session
+from miolingo.models.users import User
+
+
+async def get_review_db(
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_verified_user),
+) -> AsyncGenerator[ReviewDatabase, None]:
+    yield ReviewDatabase(session, user.id)
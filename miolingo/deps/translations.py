@@ -0,0 +1,24 @@
+from typing import Any, AsyncGenerator
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.crud.translations import TranslationDatabase
+from miolingo.crud.users import current_verified_user
+from miolingo.deps.db import get_async_session
+from miolingo.models.users import User
+
+
+async def get_translation_db(
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_verified_user),
+) -> AsyncGenerator[TranslationDatabase, None]:
+    yield TranslationDatabase(session, user.id)
+
+
+async def get_vocabulary_version(
+    request: Request,
+    translation_db: TranslationDatabase = Depends(get_translation_db),
+) -> tuple[Any, ...]:
+    # Responses also depend on the route and its parameters (i.e: the page cursor).
+    return translation_db.user_id, await translation_db.get_revision(), request.url.path, request.url.query
@@ -5,8 +5,9 @@ from fastapi_users.db import SQLAlchemyUserDatabase
 from fastapi_users_db_sqlalchemy.access_token import SQLAlchemyAccessTokenDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from miolingo.crud.tokens import RefreshTokenDatabase
 from miolingo.deps.db import get_async_session
-from miolingo.models.users import AccessToken, User
+from miolingo.models.users import AccessToken, RefreshToken, User
 
 
 async def get_user_db(
@@ -19,3 +20,9 @@ async def get_access_token_db(
     session: AsyncSession = Depends(get_async_session),
 ) -> AsyncGenerator[SQLAlchemyAccessTokenDatabase, None]:
     yield SQLAlchemyAccessTokenDatabase(session, AccessToken)
+
+
+async def get_refresh_token_db(
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[RefreshTokenDatabase, None]:
+    yield RefreshTokenDatabase(session, RefreshToken)
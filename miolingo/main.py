@@ -1,17 +1,51 @@
-import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_users import FastAPIUsers
 
 from miolingo import __version__ as pkg_version
 from miolingo import settings
+from miolingo.api.v1.endpoints import auth, metrics, users
 from miolingo.api.v1.router import api_router
 from miolingo.backends.authentication import auth_backend
+from miolingo.backends.mails import mail_dispatcher
+from miolingo.backends.password import password_executor
+from miolingo.backends.tokens import token_janitor
 from miolingo.conf.loggers import configure_loggers
-from miolingo.managers.users import get_user_manager
-from miolingo.models.users import User
+from miolingo.crud.users import fastapi_users
+from miolingo.db.pool import warm_up_pool
+from miolingo.db.session import async_engine, async_read_engines
 from miolingo.schemas.users import UserCreate, UserRead, UserUpdate
+from miolingo.utils.metrics import metrics_flusher
+from miolingo.utils.responses import get_json_response_class
+from miolingo.utils.timing import TimingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Mail singletons are only built once serving, not when importing the app (i.e: to generate the OpenAPI schema).
+    from miolingo.utils.mails import mail_templates, smtp_pool
+
+    engines = [async_engine, *async_read_engines]
+
+    mail_templates.load()
+    for engine in engines:
+        await warm_up_pool(engine, settings.DB_POOL_WARMUP)
+    mail_dispatcher.start()
+    token_janitor.start()
+    metrics_flusher.start()
+    yield
+    # On SIGTERM, once the server has waited for in-flight requests: pending mails are sent until the deadline.
+    await metrics_flusher.stop()
+    await token_janitor.stop()
+    await mail_dispatcher.stop(timeout=settings.MAIL_QUEUE_DRAIN_TIMEOUT)
+    await smtp_pool.close()
+    password_executor.shutdown()
+    # Last, nothing using the DB anymore.
+    for engine in engines:
+        await engine.dispose()
+
 
 # Declare FastAPI app to server HTTP requests.
 app: FastAPI = FastAPI(
@@ -20,11 +54,8 @@ app: FastAPI = FastAPI(
     version=pkg_version,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     debug=settings.DEBUG,
-)
-
-fastapi_users: FastAPIUsers = FastAPIUsers[User, uuid.UUID](
-    get_user_manager,
-    [auth_backend],
+    lifespan=lifespan,
+    default_response_class=get_json_response_class(settings.JSON_ENCODER),
 )
 
 # Set all CORS enabled origins (for frontend with FUN app)
@@ -37,6 +68,9 @@ if settings.BACKEND_CORS_ORIGINS:  # pragma: no cover
         allow_headers=["*"],
     )
 
+# Record latencies and queries of requests, only sending them back while debugging.
+app.add_middleware(TimingMiddleware, server_timing=settings.DEBUG)
+
 # Then attach users router.
 # Then attach user API auth.
 app.include_router(
@@ -44,6 +78,9 @@ app.include_router(
     prefix="/auth",
     tags=["auth"],
 )
+# Attach user API refresh, only issuing JWT.
+if settings.AUTH_BACKEND == "jwt":  # pragma: no cover
+    app.include_router(auth.router, prefix="/auth", tags=["auth"])
 # Attach user API register
 app.include_router(
     fastapi_users.get_register_router(UserRead, UserCreate),
@@ -62,15 +99,18 @@ app.include_router(
     prefix="/auth",
     tags=["auth"],
 )
-# Attach user API
-app.include_router(
-    fastapi_users.get_users_router(UserRead, UserUpdate, requires_verification=True),
-    prefix="/users",
-    tags=["users"],
-)
+# Attach user API, with our own GET of the current user answering conditional requests.
+users_router = fastapi_users.get_users_router(UserRead, UserUpdate, requires_verification=True)
+users_router.routes = [route for route in users_router.routes if getattr(route, "name", None) != "users:current_user"]
+app.include_router(users.current_user_router, prefix="/users", tags=["users"])
+app.include_router(users_router, prefix="/users", tags=["users"])
+
+# Attach metrics, out of the API.
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
 
 # Then finally attach main API router.
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 # All loggers should be fully initialized so overriding theirs configs.
-configure_loggers(handlers=settings.LOG_HANDLERS, level=settings.LOG_LEVEL)
+configure_loggers(handlers=settings.LOG_HANDLERS, level=settings.LOG_LEVEL, queue_size=settings.LOG_QUEUE_SIZE)
@@ -1,24 +1,58 @@
 import uuid
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
-from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, InvalidPasswordException, UUIDIDMixin
+from fastapi import Depends, Request, Response
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import (
+    BaseUserManager,
+    InvalidPasswordException,
+    UUIDIDMixin,
+    exceptions,
+)
+from fastapi_users.db import BaseUserDatabase
+from fastapi_users.jwt import decode_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 
+import jwt
+
 from miolingo import settings
+from miolingo.backends.authentication import revoke_user_tokens
+from miolingo.backends.mails import Mail, mail_dispatcher
+from miolingo.backends.password import ExecutorPasswordHelper, password_executor
 from miolingo.deps.users import get_user_db
 from miolingo.models.users import User
 from miolingo.schemas.users import UserCreate
-from miolingo.utils.mails import send_mail_with_template
+from miolingo.utils.metrics import Counter, metrics_registry
 from miolingo.utils.urls import build_frontend_url
 
+# Valid credentials of inactive or unverified users, rejected by the login route, count in neither.
+auth_logins: Counter = metrics_registry.counter(
+    "miolingo_auth_logins_total",
+    "Login attempts, by result: success, unknown_user or bad_password.",
+    ["result"],
+)
+
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
+    """
+    Passwords are hashed by the password executor instead of blocking the
+    loop: methods of the base manager calling the password helper are
+    overridden to only prepare its results, before calling the base ones.
+    """
+
     reset_password_token_secret = settings.SECRET
     verification_token_secret = settings.SECRET
 
-    def check_password(self, user: User, password: str) -> bool:
-        return self.password_helper.verify_and_update(password, user.hashed_password)[0]
+    password_helper: ExecutorPasswordHelper
+
+    def __init__(self, user_db: BaseUserDatabase[User, uuid.UUID]) -> None:
+        super().__init__(user_db, password_helper=ExecutorPasswordHelper(password_executor))
+
+    async def check_password(self, user: User, password: str) -> bool:
+        # Not loaded for an authenticated user.
+        hashed_password = await user.awaitable_attrs.hashed_password
+        verified, _ = await password_executor.verify_and_update(password, hashed_password)
+        return verified
 
     async def validate_password(self, password: str, user: UserCreate | User) -> None:
         if len(password) < 8:
@@ -26,32 +60,102 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
         if user.email in password:
             raise InvalidPasswordException(reason="Password should not contain e-mail")
 
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> User | None:
+        user = await self.user_db.get_by_email(credentials.username)
+        if user is None:
+            # Hashed anyway by the base manager to mitigate timing attack.
+            await self.password_helper.prepare_hash(credentials.password)
+        else:
+            await self.password_helper.prepare_verify(credentials.password, user.hashed_password)
+
+        authenticated = await super().authenticate(credentials)
+        if authenticated is None:
+            auth_logins.inc("unknown_user" if user is None else "bad_password")
+        return authenticated
+
+    async def create(self, user_create: UserCreate, safe: bool = False, request: Request | None = None) -> User:
+        # Not to hash an invalid password.
+        await self.validate_password(user_create.password, user_create)
+        await self.password_helper.prepare_hash(user_create.password)
+        return await super().create(user_create, safe=safe, request=request)
+
+    async def forgot_password(self, user: User, request: Request | None = None) -> None:
+        if user.is_active:
+            # Fingerprint of the password in the reset token.
+            await self.password_helper.prepare_hash(user.hashed_password)
+        await super().forgot_password(user, request=request)
+
+    async def reset_password(self, token: str, password: str, request: Request | None = None) -> User:
+        try:
+            data = decode_jwt(token, self.reset_password_token_secret, [self.reset_password_token_audience])
+            fingerprint = data["password_fgpt"]
+            user = await self.get(self.parse_id(data["sub"]))
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID, exceptions.UserNotExists):
+            # Rejected by the base manager.
+            pass
+        else:
+            await self.password_helper.prepare_verify(user.hashed_password, fingerprint)
+
+        return await super().reset_password(token, password, request=request)
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            await self.password_helper.prepare_hash(password)
+        return await super()._update(user, update_dict)
+
+    async def on_after_login(
+        self,
+        user: User,
+        request: Request | None = None,
+        response: Response | None = None,
+    ) -> None:
+        auth_logins.inc("success")
+
+    async def on_after_update(self, user: User, update_dict: dict[str, Any], request: Request | None = None) -> None:
+        # Cached tokens and JWT hold a snapshot of the user (i.e: is_active), revoke them.
+        revoke_user_tokens(user.id)
+
+    async def on_after_verify(self, user: User, request: Request | None = None) -> None:
+        revoke_user_tokens(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Request | None = None) -> None:
+        revoke_user_tokens(user.id)
+
+    async def on_after_delete(self, user: User, request: Request | None = None) -> None:
+        revoke_user_tokens(user.id)
+
     async def on_after_request_verify(self, user: User, token: str, request: Request | None = None) -> None:
-        await send_mail_with_template(
-            subject="Verify your account",
-            recipients=[user.email],
-            template_name="users/request_verify.html",
-            template_body={
-                "fullname": user.fullname,
-                "verify_link": build_frontend_url(
-                    path=settings.FRONTEND_URL_VERIFY,
-                    query={"token": token},
-                ),
-            },
+        await mail_dispatcher.enqueue(
+            Mail(
+                subject="Verify your account",
+                recipients=[user.email],
+                template_name="users/request_verify.html",
+                template_body={
+                    "fullname": user.fullname,
+                    "verify_link": build_frontend_url(
+                        path=settings.FRONTEND_URL_VERIFY,
+                        query={"token": token},
+                    ),
+                },
+            )
         )
 
     async def on_after_forgot_password(self, user: User, token: str, request: Request | None = None) -> None:
-        await send_mail_with_template(
-            subject="Reset your password",
-            recipients=[user.email],
-            template_name="users/reset_password.html",
-            template_body={
-                "fullname": user.fullname,
-                "reset_password_link": build_frontend_url(
-                    path=settings.FRONTEND_URL_RESET_PASSWORD,
-                    query={"token": token},
-                ),
-            },
+        await mail_dispatcher.enqueue(
+            Mail(
+                subject="Reset your password",
+                recipients=[user.email],
+                template_name="users/reset_password.html",
+                template_body={
+                    "fullname": user.fullname,
+                    "reset_password_link": build_frontend_url(
+                        path=settings.FRONTEND_URL_RESET_PASSWORD,
+                        query={"token": token},
+                    ),
+                },
+            )
         )
 
 
@@ -1 +1,2 @@
-from .users import AccessToken, User  # noqa
+from .core import Review, Translation, translation_link  # noqa
+from .users import AccessToken, RefreshToken, User  # noqa
@@ -1,44 +1,132 @@
-# from datetime import datetime
-#
-# from sqlalchemy import SmallInteger, String, DateTime, func
-# from sqlalchemy.orm import Mapped, mapped_column
-#
-# from miolingo.db.base_class import Base, BaseModelMixin
-#
-#
-# class Translation(BaseModelMixin, Base):
-#     lang: Mapped[str] = mapped_column(String(length=2))  # @todo enum or validate?
-#
-#     text: Mapped[str] = mapped_column(String(length=2048))
-#     # slug = models.SlugField(max_length=2048, null=True, editable=False)  # @todo
-#
-#     priority: Mapped[str] = mapped_column(SmallInteger, default=0)
-#
-#     created_at: Mapped[datetime] = mapped_column(
-#         DateTime(timezone=True),
-#         default=func.now(),
-#     )  # @FIXME store in UTC!
-#     modified_at: Mapped[datetime] = mapped_column(
-#         DateTime(timezone=True),
-#         default=func.now(),
-#         onupdate=func.now(),
-#     )  # @FIXME store in UTC!
-#
-#     # user = models.ForeignKey(
-#     #     User,
-#     #     on_delete=models.CASCADE,
-#     #     related_name="translations",
-#     # )
-#     #
-#     # trans = models.ManyToManyField("self")
-#     #
-#     # class Meta:
-#     #     unique_together = ("lang", "slug", "user")
-#     #
-#     # def __str__(self):
-#     #     return f"{self.text} ({self.lang})"
-#     #
-#     # def save(self, *args, **kwargs):
-#     #     if not self.slug:
-#     #         self.slug = slugify(self.text)
-#     #     return super().save(*args, **kwargs)
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    DDL,
+    Column,
+    Connection,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Table,
+    Uuid,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from miolingo.db.base_class import Base, BaseModelMixin
+
+# Links are symmetric, so stored in both directions: the primary key serves
+# lookups of a translation links, the reverse index its deletion cascade.
+translation_link = Table(
+    "miolingo_translation_link",
+    Base.metadata,
+    Column("source_id", Integer, ForeignKey("miolingo_translation.id", ondelete="cascade"), primary_key=True),
+    Column("target_id", Integer, ForeignKey("miolingo_translation.id", ondelete="cascade"), primary_key=True),
+    Index("ix_miolingo_translation_link_target_id_source_id", "target_id", "source_id"),
+)
+
+
+class Translation(BaseModelMixin, Base):
+    __table_args__ = (Index("ux_miolingo_translation_user_id_lang_slug", "user_id", "lang", "slug", unique=True),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("user.id", ondelete="cascade"), nullable=False)
+
+    lang: Mapped[str] = mapped_column(String(length=2), nullable=False)
+    text: Mapped[str] = mapped_column(String(length=2048), nullable=False)
+    slug: Mapped[str] = mapped_column(String(length=2048), nullable=False)
+
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    modified_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    # Never loaded implicitly, to not issue a query per word when listing.
+    translations: Mapped[list["Translation"]] = relationship(
+        "Translation",
+        secondary=translation_link,
+        primaryjoin=lambda: Translation.id == translation_link.c.source_id,
+        secondaryjoin=lambda: Translation.id == translation_link.c.target_id,
+        lazy="raise",
+        viewonly=True,
+        order_by=lambda: Translation.id,
+    )
+
+    def __str__(self) -> str:
+        return f"{self.text} ({self.lang})"
+
+
+# List a user vocabulary with an index-only scan, already in the listing order
+# (scanned backward), and seek pages by keyset on (lang, priority, id).
+Index(
+    "ix_miolingo_translation_user_id_lang_priority",
+    Translation.user_id,
+    Translation.lang,
+    Translation.priority,
+    Translation.id,
+    postgresql_include=["text"],
+)
+
+
+def _has_search_extensions(ddl: Any, target: Any, bind: Connection | None, **kw: Any) -> bool:
+    # Contrib modules may be missing from some servers (i.e: embedded ones for
+    # tests), tables are still created there, only without fuzzy search.
+    query = text("SELECT count(*) FROM pg_available_extensions WHERE name IN ('pg_trgm', 'btree_gin')")
+    return bind is not None and bind.scalar(query) == 2
+
+
+for extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Base.metadata,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}").execute_if(callable_=_has_search_extensions),
+    )
+
+# Fuzzy and prefix search of words, on slugs as they are already lowercased and
+# unaccented: trigrams serve both similarity (%) and LIKE 'prefix%' matches.
+# Along with the user (btree_gin), not to match the words of all the users.
+Index(
+    "ix_miolingo_translation_user_id_slug_trgm",
+    Translation.user_id,
+    Translation.slug,
+    postgresql_using="gin",
+    postgresql_ops={"slug": "gin_trgm_ops"},
+).ddl_if(callable_=_has_search_extensions)
+
+
+class Review(Base):
+    """
+    Memory state of a translation, reviewed as a card by its user: one per
+    translation, with the user copied to index the due queue.
+    """
+
+    __tablename__ = "miolingo_review"
+    # Next due cards of a user with a single index range scan.
+    __table_args__ = (Index("ix_miolingo_review_user_id_due_at", "user_id", "due_at"),)
+
+    translation_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("miolingo_translation.id", ondelete="cascade"),
+        primary_key=True,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("user.id", ondelete="cascade"), nullable=False)
+
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Ease factor in thousandths (i.e: 2500 for 2.5) and interval in days. New
+    # cards are inserted in bulk along with translations, hence server defaults.
+    ease: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="2500")
+    interval: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    repetitions: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="0")
+    lapses: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="0")
+    reviewed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,6 +1,10 @@
+import uuid
+from datetime import datetime
+
 from fastapi_users.db import SQLAlchemyBaseUserTableUUID
 from fastapi_users_db_sqlalchemy.access_token import SQLAlchemyBaseAccessTokenTableUUID
-from sqlalchemy import String
+from fastapi_users_db_sqlalchemy.generics import GUID, TIMESTAMPAware, now_utc
+from sqlalchemy import ForeignKey, Integer, String, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from miolingo.db.base_class import Base
@@ -9,6 +13,18 @@ from miolingo.db.base_class import Base
 class User(SQLAlchemyBaseUserTableUUID, Base):
     first_name: Mapped[str] = mapped_column(String(length=512), nullable=False)
     last_name: Mapped[str] = mapped_column(String(length=512), nullable=False)
+    # Incremented on each change of the user vocabulary, to tell clients whether
+    # what they read is still current without reading it again.
+    vocabulary_revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Incremented on each change of the user itself (but not of its vocabulary),
+    # to tell whether a snapshot of the user (i.e: in a token) is still current.
+    revision: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        onupdate=literal_column("revision + 1"),
+    )
 
     access_token: Mapped["AccessToken"] = relationship("AccessToken", uselist=False, back_populates="user")
 
@@ -19,3 +35,17 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
 
 class AccessToken(SQLAlchemyBaseAccessTokenTableUUID, Base):
     user: Mapped["User"] = relationship("User", uselist=False, back_populates="access_token")
+
+
+class RefreshToken(Base):
+    __tablename__ = "refreshtoken"
+
+    # Only the SHA-256 of the token given to the client is stored.
+    token: Mapped[str] = mapped_column(String(length=64), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID, ForeignKey("user.id", ondelete="cascade"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMPAware(timezone=True),
+        index=True,
+        nullable=False,
+        default=now_utc,
+    )
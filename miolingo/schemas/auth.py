@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class BearerRefreshResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
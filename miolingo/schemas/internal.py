@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class DBPoolStatus(BaseModel):
+    pool: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    checkouts: int | None = None
+    timeouts: int | None = None
+    wait_time: float | None = None
+    wait_time_max: float | None = None
+
+
+class RouteLatency(BaseModel):
+    method: str
+    path: str
+    count: int
+    # Total time, in seconds.
+    sum: float
+    # Cumulative count of requests by upper bound in seconds, up to "+Inf".
+    buckets: dict[str, int]
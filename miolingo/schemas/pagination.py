@@ -0,0 +1,13 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # Opaque cursor to pass to get the next page, none for the last one.
+    next_cursor: str | None = None
+    # Estimated from the planner statistics, only if requested.
+    total: int | None = None
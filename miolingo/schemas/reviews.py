@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+Grade = Annotated[int, Field(ge=0, le=5, description="Quality of the answer, from 0 (blackout) to 5 (perfect)")]
+
+
+class ReviewRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    translation_id: int
+    due_at: datetime
+    ease: int
+    interval: int
+    repetitions: int
+    lapses: int
+    reviewed_at: datetime | None
+
+
+class DueReview(ReviewRead):
+    """
+    Card to review, with the columns of its translation to ask for.
+    """
+
+    lang: str
+    text: str
+
+
+class ReviewAnswer(BaseModel):
+    translation_id: int
+    grade: Grade
+
+
+class ReviewSession(BaseModel):
+    """
+    Answers of a review session, applied in order: a card may be answered
+    again after a failure.
+    """
+
+    answers: list[ReviewAnswer] = Field(min_length=1, max_length=1000)
+
+
+class QuizAnswer(BaseModel):
+    translation_id: int
+    answer: str = Field(max_length=2048)
+
+
+class Quiz(BaseModel):
+    answers: list[QuizAnswer] = Field(min_length=1, max_length=1000)
+
+
+class AnswerResult(BaseModel):
+    """
+    Check of a typed answer, with the grade to submit suggested, and the
+    accepted answers to show.
+    """
+
+    translation_id: int
+    correct: bool
+    typos: int | None
+    grade: Grade
+    expected: list[str]
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Annotated, Literal
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.utils.text import slugify
+
+
+def check_text(v: str) -> str:
+    if not slugify(v):
+        raise ValueError("Text should contain at least a letter or a digit")
+    return v
+
+
+Lang = Annotated[str, Field(pattern=r"^[a-z]{2}$", description="ISO 639-1 code")]
+Text = Annotated[str, Field(min_length=1, max_length=2048), AfterValidator(check_text)]
+Priority = Annotated[int, Field(ge=-32768, le=32767)]
+
+
+class TranslationItem(BaseModel):
+    """
+    Only columns of the listing index, to be read with an index-only scan.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    lang: str
+    text: str
+    priority: int
+
+
+class TranslationMatch(TranslationItem):
+    """
+    Trigram similarity of the word with the query, from 0 to 1.
+    """
+
+    similarity: float
+
+
+class TranslationRead(TranslationItem):
+    slug: str
+    created_at: datetime
+    modified_at: datetime
+    translations: list[TranslationItem]
+
+
+class TranslationCreate(BaseModel):
+    lang: Lang
+    text: Text
+    priority: Priority = 0
+    translation_ids: list[int] = []
+
+
+class TranslationUpdate(BaseModel):
+    lang: Lang | None = None
+    text: Text | None = None
+    priority: Priority | None = None
+    translation_ids: list[int] | None = None
+
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportProgress(BaseModel):
+    event: Literal["progress"] = "progress"
+    rows: int
+
+
+class ImportFailure(BaseModel):
+    """
+    The import is aborted and nothing is saved.
+    """
+
+    event: Literal["error"] = "error"
+    detail: ErrorCode
+
+
+class ImportResult(BaseModel):
+    """
+    Only the first errors are reported, but they are all counted.
+    """
+
+    event: Literal["done"] = "done"
+    rows: int
+    created: int
+    linked: int
+    error_count: int
+    errors: list[ImportRowError]
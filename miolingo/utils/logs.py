@@ -0,0 +1,126 @@
+import json
+import logging
+import queue
+import sys
+import weakref
+from datetime import datetime, timezone
+from logging.handlers import QueueListener
+from logging.handlers import QueueHandler as BaseQueueHandler
+from typing import Any, ClassVar
+
+from miolingo.utils.metrics import Counter, metrics_registry
+
+# Attributes of any record, others are extra fields (i.e: logger.info("...", extra={"user_id": 1})).
+_RECORD_ATTRS: frozenset[str] = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+dropped_records: Counter = metrics_registry.counter(
+    "miolingo_log_records_dropped_total",
+    "Log records dropped because the logging queue was full.",
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per record, with its extra fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.module}.{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        data.update((key, value) for key, value in record.__dict__.items() if key not in _RECORD_ATTRS)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room in a full queue, rather than failing to stop.
+        self.queue.put(self._sentinel)
+
+
+class QueueHandler(BaseQueueHandler):
+    """
+    Only put records in a bounded queue, to be formatted then written to the
+    stream by a background thread, so that the event loop never blocks on
+    I/O.
+
+    Once the queue is full, new records are dropped and counted, except
+    errors which take the place of the oldest record. Records may be logged
+    by any thread, so drops are only counted on the handler, then exported
+    by a collector from the event loop.
+    """
+
+    # Open handlers, and the records dropped by the closed ones.
+    instances: ClassVar[weakref.WeakSet["QueueHandler"]] = weakref.WeakSet()
+    closed_dropped: ClassVar[int] = 0
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        stream: Any = None,
+        keep_level: int = logging.ERROR,
+    ) -> None:
+        super().__init__(queue.Queue(maxsize))
+        self.keep_level = keep_level
+        self.dropped = 0
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.listener = _Listener(self.queue, self.target)
+        self.listener.start()
+        QueueHandler.instances.add(self)
+
+    @classmethod
+    def total_dropped(cls) -> int:
+        return cls.closed_dropped + sum(handler.dropped for handler in list(cls.instances))
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        # Formatting is left to the background thread.
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments may change meanwhile, so merge them now. Anything else (i.e: exceptions) is formatted later.
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if record.levelno >= self.keep_level:
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):  # pragma: no cover
+                # Drained or filled by other threads meanwhile.
+                pass
+        # Called with the handler lock held.
+        self.dropped += 1
+
+    def close(self) -> None:
+        # Write the pending records before closing the stream, i.e: on exit.
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        if self in QueueHandler.instances:
+            QueueHandler.instances.discard(self)
+            QueueHandler.closed_dropped += self.dropped
+        super().close()
+
+
+def collect_dropped_records() -> None:
+    dropped_records.set(QueueHandler.total_dropped())
+
+
+metrics_registry.add_collector(collect_dropped_records)
@@ -1,16 +1,79 @@
+import time
 from typing import Any
 
 from pydantic import EmailStr
 
-from fastapi_mail import FastMail, MessageSchema, MessageType, MultipartSubtypeEnum
-from jinja2 import Template, TemplateNotFound
+from fastapi_mail import (
+    ConnectionConfig,
+    FastMail,
+    MessageSchema,
+    MessageType,
+    MultipartSubtypeEnum,
+)
+from fastapi_mail.fastmail import email_dispatched
 
 from miolingo import settings
+from miolingo.utils.metrics import Counter, Histogram, metrics_registry
+from miolingo.utils.smtp import SMTPConnectionPool
+from miolingo.utils.templates import MailTemplateRegistry
 
-if settings.SMTP_CONFIG is None:  # pragma: no cover
-    raise RuntimeError("Did you forgot to export MAIL_ env vars?")
 
-fast_mail: FastMail = FastMail(settings.SMTP_CONFIG)
+class PooledFastMail(FastMail):
+    """
+    FastMail sending messages through pooled SMTP sessions instead of opening
+    (and authenticating) a new connection per message, and rendering
+    precompiled templates instead of loading them for each message.
+    """
+
+    def __init__(
+        self,
+        config: ConnectionConfig,
+        pool: SMTPConnectionPool | None = None,
+        templates: MailTemplateRegistry | None = None,
+    ) -> None:
+        super().__init__(config)
+        self.pool = pool or SMTPConnectionPool(config)
+        if templates is None and config.TEMPLATE_FOLDER is not None:
+            templates = MailTemplateRegistry(config.TEMPLATE_FOLDER)
+        self.templates = templates
+
+    async def send_message(self, message: MessageSchema, template_name: str | None = None) -> None:
+        template = None
+        if self.templates is not None and template_name:
+            template = self.templates.get(template_name)
+        # Reuse the (private) message builder of FastMail.
+        msg = await self._FastMail__prepare_message(message, template)  # type: ignore[attr-defined]
+
+        if not self.config.SUPPRESS_SEND:
+            await self.pool.send_message(msg)
+
+        email_dispatched.send(msg)
+
+
+smtp_pool: SMTPConnectionPool = SMTPConnectionPool(
+    settings.SMTP_CONFIG,
+    size=settings.MAIL_POOL_SIZE,
+    max_messages=settings.MAIL_POOL_MAX_MESSAGES,
+    keepalive=settings.MAIL_POOL_KEEPALIVE,
+    max_idle=settings.MAIL_POOL_MAX_IDLE,
+)
+mail_templates: MailTemplateRegistry = MailTemplateRegistry(
+    settings.SMTP_CONFIG.TEMPLATE_FOLDER,
+    # File changes are only watched for in DEBUG mode.
+    auto_reload=settings.DEBUG and settings.MAIL_TEMPLATE_RELOAD,
+    bytecode_cache_dir=settings.MAIL_TEMPLATE_BYTECODE_CACHE_DIR,
+)
+mail_send_duration: Histogram = metrics_registry.histogram(
+    "miolingo_mail_send_duration_seconds",
+    "Time to render and send mails, by template.",
+    ["template"],
+)
+mail_send_failures: Counter = metrics_registry.counter(
+    "miolingo_mail_send_failures_total",
+    "Mails failing to be sent, by template (each attempt counts).",
+    ["template"],
+)
+fast_mail: PooledFastMail = PooledFastMail(settings.SMTP_CONFIG, pool=smtp_pool, templates=mail_templates)
 
 
 async def send_mail_with_template(
@@ -20,15 +83,9 @@ async def send_mail_with_template(
     template_body: dict[str, Any],
     **kwargs: Any,
 ) -> None:
-    # First prepare the alternative text to HTML
-    try:
-        template: Template = await fast_mail.get_mail_template(
-            env_path=fast_mail.config.template_engine(),
-            template_name=template_name.replace(".html", ".txt"),
-        )
-    except TemplateNotFound:
-        pass
-    else:
+    # First prepare the alternative text to HTML (from the registry, even empty until templates are loaded).
+    template = fast_mail.templates.get_alternative(template_name) if fast_mail.templates is not None else None
+    if template is not None:
         kwargs["alternative_body"] = template.render(**template_body)
         kwargs["multipart_subtype"] = MultipartSubtypeEnum.alternative
 
@@ -42,4 +99,11 @@ async def send_mail_with_template(
     )
 
     # Finally send the HTML email with text alternative.
-    await fast_mail.send_message(message, template_name=template_name)
+    start = time.perf_counter()
+    try:
+        await fast_mail.send_message(message, template_name=template_name)
+    except Exception:
+        mail_send_failures.inc(template_name)
+        raise
+    finally:
+        mail_send_duration.observe(time.perf_counter() - start, template_name)
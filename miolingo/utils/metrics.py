@@ -0,0 +1,375 @@
+import asyncio
+import bisect
+import fcntl
+import itertools
+import json
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+from miolingo import logger, settings
+
+# Upper bounds of the latency buckets, in seconds.
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# Counters and histograms of the stopped processes, added up in a single file.
+ARCHIVE_FILENAME: str = "archive.json"
+
+M = TypeVar("M", bound="Metric")
+
+
+class Metric:
+    """
+    Values of a metric by label values, given positionally in the order of
+    the label names.
+
+    Only updated from the event loop thread, so without any lock.
+    """
+
+    kind: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: dict[tuple[str, ...], Any] = {}
+
+    def merge(self, value: Any, other: Any) -> Any:
+        return value + other
+
+    def samples(self, labels: tuple[str, ...], value: Any) -> Iterator[tuple[str, dict[str, str], float]]:
+        yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def set(self, value: float, *labels: str) -> None:
+        # Only for counts kept elsewhere, read by a collector.
+        self.values[labels] = value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Count of observations by bucket (the last one being unbounded), followed
+    by their sum.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def merge(self, value: Any, other: Any) -> Any:
+        return [a + b for a, b in zip(value, other)]
+
+    def cumulative(self, value: list[float]) -> list[tuple[str, int]]:
+        """
+        Count of observations lower or equal to each bound, up to "+Inf".
+        """
+        bounds = [*map(str, self.buckets), "+Inf"]
+        return list(zip(bounds, itertools.accumulate(value[:-1])))
+
+    def samples(self, labels: tuple[str, ...], value: Any) -> Iterator[tuple[str, dict[str, str], float]]:
+        base = dict(zip(self.labelnames, labels))
+        cumulative = self.cumulative(value)
+        for bound, count in cumulative:
+            yield f"{self.name}_bucket", {**base, "le": bound}, count
+        yield f"{self.name}_sum", base, value[-1]
+        yield f"{self.name}_count", base, cumulative[-1][1]
+
+
+class MetricsRegistry:
+    """
+    Metrics of the process, in the Prometheus text format.
+
+    With several worker processes, each one dumps its metrics to its own file
+    of a shared directory, and the one serving the scrape adds up the others.
+    Once a worker stops (or is found dead), its counters and histograms are
+    added to the archive file and its own file is removed, so that the
+    directory doesn't grow with recycled workers. Gauges of a worker are
+    ignored once stale.
+    """
+
+    def __init__(self, directory: Path | None = None, stale_after: float = 60.0) -> None:
+        self.directory = directory
+        self.stale_after = stale_after
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self._pid: int | None = None
+        self._filename: str = ""
+
+    def register(self, metric: M) -> M:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Add a callback updating metrics read from elsewhere, before each dump
+        or scrape.
+        """
+        self.collectors.append(collector)
+
+    @property
+    def filename(self) -> str:
+        # Unique per process, even once forked or with a recycled PID.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._filename = f"{self._pid}-{secrets.token_hex(4)}.json"
+        return self._filename
+
+    def collect(self) -> None:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Failed to collect metrics")
+
+    def snapshot(self) -> dict[str, Any]:
+        self.collect()
+        metrics = {name: [[list(key), value] for key, value in m.values.items()] for name, m in self.metrics.items()}
+        return {"time": time.time(), "metrics": metrics}
+
+    def dump(self) -> None:
+        if self.directory is None:
+            return
+        self._write(self.directory / self.filename, self.snapshot())
+
+    def load(self) -> list[dict[str, Any]]:
+        """
+        Snapshots of the other processes, and the archive.
+        """
+        if self.directory is None:
+            return []
+        # Not to add up a file being archived twice.
+        with self._lock(shared=True):
+            return [snapshot for path, snapshot in self._read_all() if path.name != self.filename]
+
+    def aggregate(self) -> dict[str, dict[tuple[str, ...], Any]]:
+        # Live values of this process, then the last ones dumped by the others.
+        own = self.snapshot()
+        now = time.time()
+
+        values: dict[str, dict[tuple[str, ...], Any]] = {name: {} for name in self.metrics}
+        for snapshot in [own, *self.load()]:
+            stale = snapshot is not own and now - snapshot["time"] > self.stale_after
+            self._merge(values, snapshot, gauges=not stale)
+        return values
+
+    def retire(self) -> None:
+        """
+        Move the counters and histograms of this (stopping) process to the
+        archive, then remove its file.
+        """
+        if self.directory is None:
+            return
+
+        with self._lock():
+            self._archive([self.snapshot()])
+            (self.directory / self.filename).unlink(missing_ok=True)
+
+    def archive_dead(self) -> None:
+        """
+        Archive the files of processes gone without retiring (i.e: killed).
+        """
+        if self.directory is None:
+            return
+
+        with self._lock():
+            now = time.time()
+            dead = [
+                (path, snapshot)
+                for path, snapshot in self._read_all()
+                if path.name not in (ARCHIVE_FILENAME, self.filename)
+                and now - snapshot["time"] > self.stale_after
+                and not _is_running(path.name)
+            ]
+            if dead:
+                self._archive([snapshot for _, snapshot in dead])
+                for path, _ in dead:
+                    path.unlink(missing_ok=True)
+
+    def _merge(self, values: dict[str, dict[tuple[str, ...], Any]], snapshot: dict[str, Any], gauges: bool) -> None:
+        for name, items in snapshot["metrics"].items():
+            metric = self.metrics.get(name)
+            if metric is None or (metric.kind == "gauge" and not gauges):
+                continue
+            merged = values.setdefault(name, {})
+            for labels, value in items:
+                key = tuple(labels)
+                merged[key] = metric.merge(merged[key], value) if key in merged else value
+
+    def _archive(self, snapshots: list[dict[str, Any]]) -> None:
+        # Called with the lock held, not to lose or add twice any values.
+        assert self.directory is not None
+        path = self.directory / ARCHIVE_FILENAME
+        values: dict[str, dict[tuple[str, ...], Any]] = {}
+        for snapshot in [*self._read(path), *snapshots]:
+            self._merge(values, snapshot, gauges=False)
+
+        metrics = {name: [[list(key), value] for key, value in items.items()] for name, items in values.items()}
+        self._write(path, {"time": time.time(), "metrics": metrics})
+
+    @contextmanager
+    def _lock(self, shared: bool = False) -> Iterator[None]:
+        # Between processes, files being archived then removed.
+        assert self.directory is not None
+        with open(self.directory / ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_all(self) -> list[tuple[Path, dict[str, Any]]]:
+        assert self.directory is not None
+        return [(path, snapshot) for path in self.directory.glob("*.json") for snapshot in self._read(path)]
+
+    @staticmethod
+    def _read(path: Path) -> list[dict[str, Any]]:
+        try:
+            return [json.loads(path.read_text())]
+        except (OSError, ValueError):
+            # Missing, or removed meanwhile.
+            return []
+
+    @staticmethod
+    def _write(path: Path, snapshot: dict[str, Any]) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(snapshot))
+        # Atomically, not to be read half written.
+        os.replace(tmp_path, path)
+
+    def render(self) -> str:
+        lines = []
+        for name, values in self.aggregate().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {_escape(metric.documentation, help=True)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels in sorted(values):
+                for sample, sample_labels, value in metric.samples(labels, values[labels]):
+                    lines.append(f"{sample}{_format_labels(sample_labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str, help: bool = False) -> str:
+    value = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return value if help else value.replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _is_running(filename: str) -> bool:
+    # Files are named after the PID of their process, i.e: "123-abcdef01.json".
+    try:
+        os.kill(int(filename.split("-")[0]), 0)
+    except ProcessLookupError:
+        return False
+    except (ValueError, PermissionError):
+        # Not named after a PID, or owned by another user.
+        return True
+    return True
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsFlusher:
+    """
+    Periodically dump the metrics of the process in background, for the
+    other workers to serve them, and archive those of dead workers.
+    """
+
+    def __init__(self, registry: MetricsRegistry, interval: float = 5.0) -> None:
+        self.registry = registry
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self.running or self.registry.directory is None:
+            return
+        self._task = asyncio.create_task(self._run(), name="metrics-flusher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # The counters of a stopped worker still count.
+        self.registry.retire()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.registry.dump()
+                self.registry.archive_dead()
+            except Exception:
+                logger.exception("Failed to dump metrics")
+            await asyncio.sleep(self.interval)
+
+
+metrics_registry: MetricsRegistry = MetricsRegistry(
+    directory=settings.METRICS_DIR,
+    # Gauges of a worker missing a few dumps are outdated, if not dead.
+    stale_after=settings.METRICS_FLUSH_INTERVAL * 3,
+)
+metrics_flusher: MetricsFlusher = MetricsFlusher(metrics_registry, interval=settings.METRICS_FLUSH_INTERVAL)
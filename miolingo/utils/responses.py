@@ -0,0 +1,32 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic_core import to_json
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON response of a Pydantic model (or a list of them), serialized straight
+    to bytes by pydantic-core, whereas FastAPI first dumps the response model
+    to plain objects, then encodes them again. Meant for listings of many
+    items, already built as models (the response model is only documented).
+
+    Returned as is by the endpoint, so headers set on the injected Response
+    (i.e: by dependencies) have to be passed along.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def get_json_response_class(encoder: str) -> type[JSONResponse]:
+    """
+    Default response class of the app, with the given JSON encoder.
+    """
+    if encoder == "orjson":
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Did you forgot to install orjson to encode responses with it?")
+        return ORJSONResponse
+    return JSONResponse
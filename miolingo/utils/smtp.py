@@ -0,0 +1,138 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from email.message import Message
+
+from fastapi_mail import ConnectionConfig
+from fastapi_mail.errors import ConnectionErrors
+
+import aiosmtplib
+
+from miolingo import logger
+
+
+@dataclass
+class PooledConnection:
+    smtp: aiosmtplib.SMTP
+    messages: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    """
+    Keep authenticated SMTP sessions open to send many messages per session.
+
+    Idle sessions are health checked with a NOOP before being reused, closed
+    once too old or after `max_messages`, and reconnected on failure.
+    """
+
+    def __init__(
+        self,
+        config: ConnectionConfig,
+        size: int = 1,
+        max_messages: int = 100,
+        keepalive: float = 30.0,
+        max_idle: float = 300.0,
+    ) -> None:
+        self.config = config
+        self.size = size
+        self.max_messages = max_messages
+        self.keepalive = keepalive
+        self.max_idle = max_idle
+
+        self.connects: int = 0
+
+        self._idle: list[PooledConnection] = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def send_message(self, message: Message) -> None:
+        async with self._semaphore:
+            conn = await self._acquire()
+            try:
+                await conn.smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self._close(conn)
+                if conn.messages == 0:
+                    raise
+                # The server dropped a reused session meanwhile, retry once on a new one.
+                logger.info("SMTP session lost, reconnecting")
+                conn = await self._connect()
+                try:
+                    await conn.smtp.send_message(message)
+                except BaseException:
+                    await self._close(conn)
+                    raise
+            except aiosmtplib.SMTPResponseException:
+                # Message rejected by the server, but the session is still usable.
+                await self._release(conn)
+                raise
+            except BaseException:
+                await self._close(conn)
+                raise
+
+            conn.messages += 1
+            await self._release(conn)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._close(self._idle.pop())
+
+    async def _acquire(self) -> PooledConnection:
+        while self._idle:
+            # Reuse the most recently used first, to let the others expire.
+            conn = self._idle.pop()
+            if await self._is_healthy(conn):
+                return conn
+            await self._close(conn)
+
+        return await self._connect()
+
+    async def _release(self, conn: PooledConnection) -> None:
+        if conn.messages >= self.max_messages:
+            await self._close(conn)
+            return
+
+        conn.last_used = time.monotonic()
+        self._idle.append(conn)
+
+    async def _is_healthy(self, conn: PooledConnection) -> bool:
+        if not conn.smtp.is_connected:
+            return False
+
+        idle = time.monotonic() - conn.last_used
+        if idle >= self.max_idle:
+            return False
+        if idle >= self.keepalive:
+            try:
+                await conn.smtp.noop()
+            except aiosmtplib.SMTPException:
+                return False
+
+        return True
+
+    async def _connect(self) -> PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            timeout=self.config.TIMEOUT,
+            port=self.config.MAIL_PORT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD)
+        except Exception as e:
+            smtp.close()
+            raise ConnectionErrors(f"Exception raised {e}, check your credentials or email service configuration")
+
+        self.connects += 1
+        return PooledConnection(smtp=smtp)
+
+    @staticmethod
+    async def _close(conn: PooledConnection) -> None:
+        try:
+            await conn.smtp.quit()
+        except aiosmtplib.SMTPException:
+            conn.smtp.close()
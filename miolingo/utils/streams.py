@@ -0,0 +1,82 @@
+import codecs
+import csv
+from typing import AsyncIterable, AsyncIterator, Iterator
+
+from fastapi.responses import StreamingResponse
+
+from starlette.types import Receive, Scope, Send
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    Streaming response of an endpoint still reading the request body. The
+    base class listens for the client disconnection meanwhile, which would
+    consume the body messages.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def read_csv(
+    chunks: AsyncIterable[bytes],
+    delimiter: str = ",",
+    encoding: str = "utf-8-sig",
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """
+    Parse CSV records as chunks of bytes come in, without loading the whole
+    file, and yield them with the line number they start at. Blank lines are
+    skipped.
+
+    Only lines with balanced quotes are handed to the CSV reader, so that a
+    quoted field may span lines and chunks. Raise UnicodeDecodeError on bad
+    encoding and csv.Error on records too large.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    limit = csv.field_size_limit()
+
+    line_num = 0
+    buffer = ""  # Incomplete last line
+    record: list[str] = []  # Lines of an incomplete record
+    record_size = 0
+    quoted = False
+
+    def parse(lines: list[str]) -> Iterator[tuple[int, list[str]]]:
+        nonlocal line_num
+        reader = csv.reader(lines, delimiter=delimiter)
+        start = line_num
+        for row in reader:
+            if row:
+                yield start + 1, row
+            start = line_num + reader.line_num
+        line_num += reader.line_num
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        if len(buffer) > limit:
+            raise csv.Error(f"field larger than field limit ({limit})")
+
+        complete: list[str] = []
+        for line in lines:
+            record.append(line + "\n")
+            record_size += len(line)
+            quoted ^= line.count('"') % 2 == 1
+            if not quoted:
+                complete += record
+                record.clear()
+                record_size = 0
+        if record_size > limit:
+            raise csv.Error(f"field larger than field limit ({limit})")
+
+        if complete:
+            for row in parse(complete):
+                yield row
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        record.append(buffer)
+    for row in parse(record):
+        yield row
@@ -0,0 +1,69 @@
+from pathlib import Path, PurePosixPath
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+)
+
+
+class MailTemplateRegistry:
+    """
+    Compile mail templates once and keep them in memory, including the fact
+    that a template is missing (i.e: no .txt alternative of an HTML one).
+
+    With `auto_reload`, templates are looked up again on each access and
+    recompiled when their file changed, which is only meant for development.
+    """
+
+    extensions: tuple[str, ...] = ("html", "txt")
+
+    def __init__(self, folder: Path, auto_reload: bool = False, bytecode_cache_dir: Path | None = None) -> None:
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+
+        # Same environment as FastMail one, but reused and without cache limit.
+        self.env = Environment(
+            loader=FileSystemLoader(folder),
+            cache_size=-1,
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
+        )
+        self._templates: dict[str, Template | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def load(self) -> None:
+        names = self.env.list_templates(extensions=self.extensions)
+        for name in names:
+            self._templates[name] = self.env.get_template(name)
+        # Then remember HTML templates without text alternative.
+        for name in names:
+            if name.endswith(".html"):
+                self.get_alternative(name)
+
+    def find(self, name: str) -> Template | None:
+        if not self.env.auto_reload and name in self._templates:
+            return self._templates[name]
+
+        try:
+            template: Template | None = self.env.get_template(name)
+        except TemplateNotFound:
+            template = None
+
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> Template:
+        template = self.find(name)
+        if template is None:
+            raise TemplateNotFound(name)
+        return template
+
+    def get_alternative(self, name: str) -> Template | None:
+        return self.find(str(PurePosixPath(name).with_suffix(".txt")))
@@ -0,0 +1,38 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable
+
+_word = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase words of the text without accents, joined with dashes: Unicode
+    compatibility decomposition (NFKD), then combining marks removal, case
+    folding, and any run of spaces or punctuation turned into a single dash.
+
+    Unlike ASCII slugs, non-latin scripts are kept (i.e: "Привет" -> "привет").
+    """
+    # Nothing to decompose nor to strip in plain ASCII, the most common case.
+    if not text.isascii():
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return "-".join(_word.findall(text.casefold()))
+
+
+@lru_cache(maxsize=10000)
+def slugify(text: str) -> str:
+    """
+    Normalize a text, cached as the same words are compared over and over
+    (i.e: validated, then saved, or searched).
+    """
+    return normalize(text)
+
+
+def slugify_batch(texts: Iterable[str]) -> list[str]:
+    """
+    Normalize texts in bulk (i.e: imports), bypassing the cache of `slugify()`
+    to not evict the words in use by a whole deck read once.
+    """
+    return [normalize(text) for text in texts]
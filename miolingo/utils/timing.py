@@ -0,0 +1,99 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from miolingo import logger, settings
+from miolingo.db.instrumentation import QueryStats, query_stats
+from miolingo.utils.metrics import Counter, Histogram, metrics_registry
+
+http_requests: Counter = metrics_registry.counter(
+    "miolingo_http_requests_total",
+    "Requests served, by route and status code.",
+    ["method", "path", "status"],
+)
+http_request_duration: Histogram = metrics_registry.histogram(
+    "miolingo_http_request_duration_seconds",
+    "Latency of requests, by route.",
+    ["method", "path"],
+)
+
+
+class TimingMiddleware:
+    """
+    Record the count and latency of requests by route, and the queries they
+    execute (see miolingo.db.instrumentation). Slow requests and statements
+    repeated within a request are logged.
+
+    Optionally, timings are sent back in a Server-Timing header, i.e: to be
+    shown by browser dev tools.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        server_timing: bool = False,
+        slow_threshold: float = settings.REQUEST_SLOW_THRESHOLD,
+        repeat_threshold: int = settings.REQUEST_QUERY_REPEAT_THRESHOLD,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.slow_threshold = slow_threshold
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        # Unless the app fails to respond.
+        status_code = 500
+
+        async def send_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", self.format_timing(time.perf_counter() - start, stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timing)
+        finally:
+            query_stats.reset(token)
+            self.record(scope, status_code, time.perf_counter() - start, stats)
+
+    @staticmethod
+    def format_timing(elapsed: float, stats: QueryStats) -> str:
+        return f'db;dur={stats.time * 1000:.1f};desc="{stats.count} queries", total;dur={elapsed * 1000:.1f}'
+
+    def record(self, scope: Scope, status_code: int, elapsed: float, stats: QueryStats) -> None:
+        route = scope.get("route")
+        # Path template of the route, not to have metrics per ID. Unmatched requests are not recorded.
+        path = getattr(route, "path", None)
+        if path is not None:
+            http_requests.inc(scope["method"], path, str(status_code))
+            http_request_duration.observe(elapsed, scope["method"], path)
+
+        path = path or scope["path"]
+        if elapsed >= self.slow_threshold:
+            logger.warning(
+                "Slow request %s %s: %.3fs, with %d queries in %.3fs",
+                scope["method"],
+                path,
+                elapsed,
+                stats.count,
+                stats.time,
+            )
+        for statement, count in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "Statement executed %d times by %s %s (N+1 queries?): %s",
+                count,
+                scope["method"],
+                path,
+                statement,
+            )
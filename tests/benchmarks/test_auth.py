@@ -0,0 +1,73 @@
+import logging
+import time
+from contextlib import nullcontext
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+import pytest
+
+from miolingo.backends import authentication
+
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest, jwt_strategy, write_jwt
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS: int = 2000
+
+
+@pytest.fixture(autouse=True)
+def quiet_httpx(caplog: pytest.LogCaptureFixture) -> None:
+    # Logging each request would dominate the measure.
+    caplog.set_level(logging.WARNING, logger="httpx")
+
+
+async def build_client(strategy: str) -> AsyncClientTest:
+    user = await UserFactoryRel.create_async()
+    client = AsyncClientTest()
+    if strategy != "jwt":
+        client.force_login(await user.awaitable_attrs.access_token)
+    else:
+        client.headers["Authorization"] = f"Bearer {await write_jwt(user)}"
+    return client
+
+
+@pytest.mark.parametrize("strategy", ["database", "database-cached", "jwt"])
+async def test_bench_current_user(
+    async_session_db: AsyncSession,
+    async_connection: AsyncConnection,
+    monkeypatch: pytest.MonkeyPatch,
+    strategy: str,
+) -> None:
+    """
+    Requests per second on /users/me as served by the app (reading the user
+    revision, then its row), run sequentially on the single test connection.
+    """
+    if strategy != "database-cached":
+        monkeypatch.setattr(authentication.token_cache, "maxsize", 0)
+    client = await build_client(strategy)
+    url = client.url_path_for("users:current_user")
+
+    queries: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if "SAVEPOINT" not in statement:
+            queries.append(statement)
+
+    with jwt_strategy() if strategy == "jwt" else nullcontext():
+        await client.get(url)  # Warm up, and fill the cache.
+
+        event.listen(async_connection.sync_connection, "before_cursor_execute", before_cursor_execute)
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await client.get(url)
+            assert response.status_code == 200
+        elapsed = time.perf_counter() - start
+        event.remove(async_connection.sync_connection, "before_cursor_execute", before_cursor_execute)
+
+    print(
+        f"\n/users/me ({strategy}): {REQUESTS / elapsed:.0f} req/s, "
+        f"{len(queries) / REQUESTS:.1f} queries/request"
+    )
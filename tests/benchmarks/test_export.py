@@ -0,0 +1,52 @@
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.backends.exports import VocabularyExport
+
+from tests.factories.users import UserFactoryRel
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("size", [10_000, 100_000])
+@pytest.mark.parametrize("file_format", ["csv", "ndjson"])
+async def test_bench_export(async_session_db: AsyncSession, size: int, file_format: str) -> None:
+    """
+    Time to first chunk and peak memory of a vocabulary export, which should not grow with its size.
+    """
+    user = await UserFactoryRel.create_async()
+    await async_session_db.execute(
+        text(
+            "INSERT INTO miolingo_translation (user_id, lang, text, slug, priority) "
+            "SELECT :user_id, 'fr', 'word ' || i, 'word-' || i, i % 10 FROM generate_series(1, :size) AS i"
+        ),
+        {"user_id": user.id, "size": size},
+    )
+    exporter = VocabularyExport(user.id, file_format=file_format)
+    header = len(exporter.encode_csv([exporter.columns])) if file_format == "csv" else 0
+
+    start = time.perf_counter()
+    first_rows = 0.0
+    sent = 0
+    async for chunk in exporter.run():
+        sent += len(chunk)
+        if sent > header:
+            first_rows = first_rows or time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+
+    # Measured apart, tracing allocations slows the export down a lot.
+    tracemalloc.start()
+    async for chunk in exporter.run():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"\nexport {file_format} of {size} rows: first rows={first_rows * 1000:.1f}ms, "
+        f"total={elapsed * 1000:.0f}ms, {sent / 1024 / 1024:.1f}MiB sent, peak memory={peak / 1024 / 1024:.1f}MiB"
+    )
@@ -0,0 +1,60 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+from tests.benchmarks.utils import report
+
+pytestmark = pytest.mark.benchmark
+
+RUNS: int = 5
+
+# i.e: "import time:       159 |     767345 | miolingo.commands.purge_tokens"
+IMPORTTIME_RE: re.Pattern = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)$")
+
+
+def import_time(module: str) -> dict[str, float]:
+    """
+    Time spent importing each module (excluding its own imports), in seconds,
+    by a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match is not None:
+            times[match.group(2)] = times.get(match.group(2), 0.0) + int(match.group(1)) / 1_000_000
+    return times
+
+
+@pytest.mark.parametrize(
+    "module, budget",
+    [
+        # Median import time allowed (ms), about 1.5 times the one measured when set.
+        ("miolingo", 50),
+        ("miolingo.db.base", 1100),
+        ("miolingo.commands.purge_tokens", 1200),
+        ("miolingo.commands.reschedule_reviews", 1250),
+        ("miolingo.main", 1400),
+    ],
+)
+def test_bench_importtime(module: str, budget: float) -> None:
+    """
+    Cold start of the app, the commands and Alembic (importing the models).
+    """
+    latencies, times = [], {}
+    for _ in range(RUNS):
+        times = import_time(module)
+        latencies.append(sum(times.values()))
+
+    stats = report(f"import {module}", latencies)
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+    print("slowest: " + ", ".join(f"{name}={t * 1000:.2f}" for name, t in slowest))
+    assert "fastapi_mail" not in times
+    assert stats["p50"] < budget
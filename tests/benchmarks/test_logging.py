@@ -0,0 +1,52 @@
+import logging
+import time
+
+import pytest
+
+from miolingo.conf.loggers import conf
+from miolingo.utils.logs import QueueHandler
+
+from tests.benchmarks.utils import report
+
+pytestmark = pytest.mark.benchmark
+
+RECORDS: int = 2000
+
+
+class SlowStream:
+    """
+    Stdout piped to a busy log collector: each write blocks a little.
+    """
+
+    def __init__(self, delay: float = 0.0002) -> None:
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, data: str) -> None:
+        time.sleep(self.delay)
+        self.lines += 1
+
+    def flush(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize("name", ["console", "queue"])
+def test_bench_logging(name: str) -> None:
+    """
+    Time spent by the logging caller (i.e: the event loop), per record.
+    """
+    stream = SlowStream()
+    handler = logging.StreamHandler(stream) if name == "console" else QueueHandler(maxsize=RECORDS, stream=stream)
+    handler.setFormatter(logging.Formatter(conf["formatters"]["default"]["format"]))
+    logger = logging.Logger("bench")
+    logger.addHandler(handler)
+
+    latencies = []
+    for i in range(RECORDS):
+        start = time.perf_counter()
+        logger.info("Request %d served in %.3fs", i, 0.1)
+        latencies.append(time.perf_counter() - start)
+    handler.close()
+
+    report(f"log {name}", latencies)
+    assert stream.lines == RECORDS
@@ -0,0 +1,99 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi_users.authentication.strategy.db import AccessTokenDatabase
+from fastapi_users.db import BaseUserDatabase
+
+import pytest
+
+from miolingo.backends.password import PasswordExecutor, password_helper
+from miolingo.deps.users import get_access_token_db, get_user_db
+from miolingo.main import app
+from miolingo.managers import users as user_managers
+from miolingo.models.users import AccessToken, User
+
+from tests.benchmarks.utils import report
+from tests.utils.client import AsyncClientTest
+
+pytestmark = pytest.mark.benchmark
+
+LOGINS: int = 50
+
+
+class InMemoryUserDatabase(BaseUserDatabase[User, uuid.UUID]):
+    # The test session is bound to a single connection, which can't serve concurrent logins.
+    def __init__(self, user: User) -> None:
+        self.user = user
+
+    async def get(self, id: uuid.UUID) -> User | None:
+        return self.user if id == self.user.id else None
+
+    async def get_by_email(self, email: str) -> User | None:
+        return self.user if email == self.user.email else None
+
+
+class InMemoryAccessTokenDatabase(AccessTokenDatabase[AccessToken]):
+    async def create(self, create_dict: dict[str, Any]) -> AccessToken:
+        return AccessToken(created_at=datetime.now(timezone.utc), **create_dict)
+
+
+@pytest.fixture
+def in_memory_db() -> Any:
+    user = User(
+        id=uuid.uuid4(),
+        email="bench@miolingo.com",
+        hashed_password=password_helper.hash("benchmark"),
+        first_name="Bench",
+        last_name="Mark",
+        is_active=True,
+        is_verified=True,
+        is_superuser=False,
+    )
+    app.dependency_overrides[get_user_db] = lambda: InMemoryUserDatabase(user)
+    app.dependency_overrides[get_access_token_db] = lambda: InMemoryAccessTokenDatabase()
+    yield user
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("pool", ["none", "thread"])
+async def test_bench_login_burst(in_memory_db: User, monkeypatch: pytest.MonkeyPatch, pool: str) -> None:
+    """
+    Latency of an unrelated endpoint while a burst of logins is hashing passwords.
+    """
+    monkeypatch.setattr(user_managers, "password_executor", PasswordExecutor(pool=pool))  # type: ignore[arg-type]
+    async_client = AsyncClientTest()
+    url_probe = app.openapi_url
+    await async_client.get(url_probe)  # Warm up the OpenAPI schema cache.
+
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            # Include the sleep to account for the time the loop was blocked before resuming.
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            response = await async_client.get(url_probe)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    async def burst() -> None:
+        responses = await asyncio.gather(
+            *[
+                async_client.post(
+                    url=async_client.url_path_for("auth:database.login"),
+                    data={"username": in_memory_db.email, "password": "benchmark"},
+                )
+                for _ in range(LOGINS)
+            ]
+        )
+        done.set()
+        assert all(r.status_code == 200 for r in responses)
+
+    await asyncio.gather(probe(), burst())
+    user_managers.password_executor.shutdown()
+
+    report(f"probe latency during {LOGINS} logins (pool={pool}, ms)", latencies)
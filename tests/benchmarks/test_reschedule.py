@@ -0,0 +1,73 @@
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import numpy as np
+import pytest
+
+from miolingo.backends.reschedule import reschedule, reschedule_reviews
+from miolingo.backends.scheduler import SchedulerParameters
+
+from tests.factories.users import UserFactory
+
+pytestmark = pytest.mark.benchmark
+
+# Set BENCH_REVIEWS=10000000 for the full size dataset, which takes a while to build.
+REVIEWS: int = int(os.environ.get("BENCH_REVIEWS", 1_000_000))
+
+
+def test_bench_reschedule_compute() -> None:
+    """
+    Vectorized recomputation against a Python loop over the same cards.
+    """
+    rng = np.random.default_rng(0)
+    ease = rng.integers(1300, 3000, REVIEWS, dtype=np.int32)
+    interval = rng.integers(1, 365, REVIEWS, dtype=np.int32)
+    repetitions = rng.integers(0, 10, REVIEWS, dtype=np.int32)
+    previous, parameters = SchedulerParameters(), SchedulerParameters(interval_modifier=0.8)
+
+    start = time.perf_counter()
+    reschedule(ease, interval, repetitions, previous, parameters)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ratio = parameters.interval_modifier / previous.interval_modifier
+    for e, i, r in zip(ease.tolist(), interval.tolist(), repetitions.tolist()):
+        max(e, parameters.min_ease), min(max(round(i * ratio), 1), parameters.max_interval) if r >= 2 else i
+    loop = time.perf_counter() - start
+
+    print(f"\nreschedule {REVIEWS} cards: numpy={vectorized * 1000:.0f}ms, python loop={loop * 1000:.0f}ms")
+
+
+async def test_bench_reschedule_reviews(async_session_db: AsyncSession) -> None:
+    """
+    Whole job on synthetic reviews, one card per translation of a single user.
+    """
+    user = await UserFactory.create_async()
+    await async_session_db.execute(
+        text(
+            "INSERT INTO miolingo_translation (user_id, lang, text, slug, priority) "
+            "SELECT :user_id, 'fr', 'word ' || i, 'word-' || i, 0 FROM generate_series(1, :size) AS i"
+        ),
+        {"user_id": user.id, "size": REVIEWS},
+    )
+    await async_session_db.execute(
+        text(
+            "INSERT INTO miolingo_review (translation_id, user_id, ease, interval, repetitions, reviewed_at) "
+            "SELECT id, user_id, 1300 + id % 1700, 1 + id % 365, id % 10, now() - (id % 30) * interval '1 day' "
+            "FROM miolingo_translation WHERE user_id = :user_id"
+        ),
+        {"user_id": user.id},
+    )
+
+    # Foreign keys are checked on update of rows inserted by the same transaction, which
+    # is only the case here (with the test transaction), so skip them as it would be.
+    await async_session_db.execute(text("SET LOCAL session_replication_role = replica"))
+
+    start = time.perf_counter()
+    count = await reschedule_reviews(SchedulerParameters(), SchedulerParameters(interval_modifier=0.8))
+    elapsed = time.perf_counter() - start
+
+    print(f"\nreschedule_reviews of {REVIEWS} cards: {count} updated in {elapsed:.1f}s, {REVIEWS / elapsed:.0f} cards/s")
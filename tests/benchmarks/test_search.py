@@ -0,0 +1,61 @@
+import os
+import random
+import string
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.crud.translations import TranslationDatabase
+
+from tests.benchmarks.utils import report, timer
+from tests.factories.users import UserFactory
+
+pytestmark = pytest.mark.benchmark
+
+WORDS: int = int(os.environ.get("BENCH_WORDS", 1_000_000))
+USERS: int = int(os.environ.get("BENCH_USERS", 100))
+QUERIES: int = 500
+P95_TARGET_MS: float = 20.0
+
+
+async def test_bench_search(async_session_db: AsyncSession) -> None:
+    """
+    Latencies of typo and prefix searches in the vocabulary of a user, among
+    the random words of many users, target p95 < 20ms.
+    """
+    if not await async_session_db.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")):
+        pytest.skip("pg_trgm extension is not available")
+
+    users = [await UserFactory.create_async() for _ in range(USERS)]
+    # Words spread evenly between the users.
+    await async_session_db.execute(
+        text(
+            "INSERT INTO miolingo_translation (user_id, lang, text, slug, priority) "
+            "SELECT (CAST(:user_ids AS uuid[]))[1 + i % :users], 'fr', word, word, i % 10 FROM ("
+            "  SELECT i, (SELECT string_agg(chr(97 + (random() * 25)::int), '') FROM generate_series(0, 4 + i % 6))"
+            "  AS word FROM generate_series(1, :size) AS i"
+            ") AS words ON CONFLICT DO NOTHING"
+        ),
+        {"user_ids": [user.id for user in users], "users": USERS, "size": WORDS},
+    )
+    await async_session_db.execute(text("ANALYZE miolingo_translation"))
+
+    user = users[0]
+    rng = random.Random(0)
+    stmt = text("SELECT slug FROM miolingo_translation WHERE user_id = :user_id ORDER BY random() LIMIT :limit")
+    slugs = (await async_session_db.scalars(stmt, {"user_id": user.id, "limit": QUERIES})).all()
+    # A letter replaced by another one, anywhere in the word.
+    typos = [s[:i] + rng.choice(string.ascii_lowercase) + s[i + 1 :] for s in slugs for i in [rng.randrange(len(s))]]
+    prefixes = [s[: rng.randint(3, 4)] for s in slugs]
+
+    translation_db = TranslationDatabase(async_session_db, user.id)
+    for name, queries in (("typo", typos), ("prefix", prefixes)):
+        latencies: list[float] = []
+        for q in queries:
+            with timer() as elapsed:
+                await translation_db.search(q)
+            latencies += elapsed
+        stats = report(f"search {name} among {WORDS} words of {USERS} users (ms)", latencies)
+        assert stats["p95"] < P95_TARGET_MS
@@ -0,0 +1,89 @@
+import time
+import tracemalloc
+import uuid
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+import pytest
+
+from miolingo.schemas.users import UserRead
+from miolingo.utils.responses import ModelResponse
+
+pytestmark = pytest.mark.benchmark
+
+adapter: TypeAdapter[list[UserRead]] = TypeAdapter(list[UserRead])
+
+
+def make_users(count: int) -> list[UserRead]:
+    return [
+        UserRead(
+            id=uuid.uuid4(),
+            email=f"user-{i}@miolingo.com",
+            is_verified=i % 2 == 0,
+            first_name="Zoé",
+            last_name=f"Doe {i}",
+        )
+        for i in range(count)
+    ]
+
+
+def default_path(users: list[UserRead]) -> bytes:
+    # What FastAPI does with a response model: serialize it, then encode it.
+    return JSONResponse(None).render(adapter.dump_python(users, mode="json"))
+
+
+def encoder_path(users: list[UserRead]) -> bytes:
+    # What FastAPI does without response model.
+    return JSONResponse(None).render(jsonable_encoder(users))
+
+
+def orjson_path(users: list[UserRead]) -> bytes:
+    return ORJSONResponse(None).render(adapter.dump_python(users, mode="json"))
+
+
+def model_path(users: list[UserRead]) -> bytes:
+    return ModelResponse(None).render(users)
+
+
+def measure(encode: Callable[[list[UserRead]], bytes], users: list[UserRead], rounds: int) -> tuple[float, int, bytes]:
+    """
+    Best time of a few rounds, then peak of the memory allocated meanwhile.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        body = encode(users)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    encode(users)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, body
+
+
+@pytest.mark.parametrize("count, rounds", [(10, 1000), (1000, 50), (100_000, 3)])
+def test_bench_serialization(count: int, rounds: int) -> None:
+    users = make_users(count)
+    paths: dict[str, Callable[[list[UserRead]], bytes]] = {
+        "default": default_path,
+        "jsonable_encoder": encoder_path,
+        "model_dump_json": model_path,
+    }
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        paths["orjson"] = orjson_path
+
+    results = {name: measure(encode, users, rounds) for name, encode in paths.items()}
+
+    print(f"\nserialize {count} users:")
+    for name, (elapsed, peak, _) in results.items():
+        print(f"  {name}: {elapsed * 1000:.3f}ms, peak={peak / 1024:.0f}KiB")
+    # Same payload whatever the path.
+    assert len({body for _, _, body in results.values()}) == 1
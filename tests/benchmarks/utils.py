@@ -0,0 +1,31 @@
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+
+def report(name: str, latencies: list[float]) -> dict[str, float]:
+    """
+    Print latencies percentiles in milliseconds, then return them.
+    """
+    stats = {
+        "count": len(latencies),
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "max": max(latencies) * 1000,
+    }
+    print(f"\n{name}: " + ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items()))
+    return stats
+
+
+@contextmanager
+def timer() -> Iterator[list[float]]:
+    elapsed: list[float] = []
+    start = time.perf_counter()
+    yield elapsed
+    elapsed.append(time.perf_counter() - start)
@@ -1,6 +1,6 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Iterator
 
-from sqlalchemy import make_url, text
+from sqlalchemy import event, make_url, text
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
@@ -12,16 +12,20 @@ from sqlalchemy.ext.asyncio import (
 import pytest
 
 from miolingo import settings
+from miolingo.backends.answers import answer_cache
+from miolingo.backends.authentication import token_cache, token_revocations
 from miolingo.conf.loggers import configure_loggers
 from miolingo.db.base import Base
+from miolingo.db.instrumentation import instrument_engine
 from miolingo.db.session import async_session_factory
 
 from tests.factories.base import BaseFactory
 
 
 @pytest.hookimpl(trylast=True)
-def pytest_sessionstart() -> None:
+def pytest_collection_finish() -> None:
     # Reconfigure loggers again to propagate logs to root logger, the only one captured by pytest(?)
+    # Done after collection, once the app module (configuring loggers too) has been imported.
     configure_loggers(handlers=settings.LOG_HANDLERS, level=settings.LOG_LEVEL, propagate=True)
 
 
@@ -61,6 +65,8 @@ async def create_database(anyio_backend: str, test_db_name: str) -> AsyncGenerat
 async def async_engine(anyio_backend, create_database, test_db_name: str) -> AsyncGenerator[AsyncEngine, None]:
     url = make_url(str(settings.POSTGRES_URI)).set(database=test_db_name)
     async_engine = create_async_engine(url=url)
+    # Like the app engines.
+    instrument_engine(async_engine)
     yield async_engine
     await async_engine.dispose()
 
@@ -98,3 +104,30 @@ async def async_session_db(create_tables, async_connection: AsyncConnection) ->
     yield async_session_db
 
     await async_transaction.rollback()  # rollback everything
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache() -> None:
+    # Transactions are rolled back between tests, so should be the cached tokens.
+    token_cache.clear()
+    token_revocations.clear()
+
+
+@pytest.fixture
+def queries(async_connection: AsyncConnection) -> Iterator[list[str]]:
+    """
+    Statements executed on the test connection meanwhile.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(async_connection.sync_connection, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(async_connection.sync_connection, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(autouse=True)
+def clear_answer_cache() -> None:
+    answer_cache.clear()
@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+
+from polyfactory import Use
+
+from miolingo.models.core import Review
+
+from tests.factories.base import BaseFactory
+
+
+class ReviewFactory(BaseFactory[Review]):
+    # A new card by default, due right now.
+    due_at = Use(lambda: datetime.now(timezone.utc))
+    ease = 2500
+    interval = 0
+    repetitions = 0
+    lapses = 0
+    reviewed_at = None
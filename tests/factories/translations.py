@@ -0,0 +1,23 @@
+from polyfactory import Ignore, Use
+from polyfactory.decorators import post_generated
+
+from miolingo.models.core import Translation
+from miolingo.utils.text import slugify
+
+from tests.factories.base import BaseFactory
+
+
+class TranslationFactory(BaseFactory[Translation]):
+    id = Ignore()  # Serial by the DB
+    lang = "fr"
+    # Suffixed to not break the unique constraint with a word already picked.
+    text = Use(lambda: f"{BaseFactory.__faker__.word()} {BaseFactory.__random__.randint(0, 100000)}")
+    priority = 0
+
+    created_at = Ignore()  # Default to DB now
+    modified_at = Ignore()
+
+    @post_generated
+    @classmethod
+    def slug(cls, text: str) -> str:
+        return slugify(text)
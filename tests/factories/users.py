@@ -1,3 +1,4 @@
+import hashlib
 import secrets
 
 from fastapi_users.password import PasswordHelper
@@ -5,18 +6,21 @@ from fastapi_users.password import PasswordHelper
 from polyfactory import Ignore, Use
 from polyfactory.decorators import post_generated
 
-from miolingo.models.users import AccessToken, User
+from miolingo.models.users import AccessToken, RefreshToken, User
 
 from tests.factories.base import BaseFactory
 
 
 class UserFactory(BaseFactory[User]):
     first_name = Use(BaseFactory.__faker__.first_name)
-    last_name = Use(BaseFactory.__faker__.last_name)
+    # Some last names are compound (i.e: "Le Goff"), which is not a valid email local part.
+    last_name = Use(lambda: BaseFactory.__faker__.last_name().replace(" ", ""))
 
     is_active = True
     is_superuser = False
     is_verified = True
+    vocabulary_revision = 0
+    revision = 0
 
     @post_generated
     @classmethod
@@ -43,3 +47,14 @@ class AccessTokenFactory(BaseFactory[AccessToken]):
     @classmethod
     def token(cls) -> str:
         return secrets.token_urlsafe()
+
+
+class RefreshTokenFactory(BaseFactory[RefreshToken]):
+    __set_relationships__ = True
+
+    user_id = Ignore()
+    created_at = Ignore()  # Default to DB now_utc
+
+    @classmethod
+    def token(cls) -> str:
+        return hashlib.sha256(secrets.token_bytes()).hexdigest()
@@ -0,0 +1,119 @@
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import pytest
+
+from miolingo import settings
+from miolingo.backends.authentication import token_cache
+from miolingo.db.replicas import ReplicaRouter
+from miolingo.deps import db as deps_db
+
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def test_token_cache_hit(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async()
+    access_token = await user.awaitable_attrs.access_token
+    async_client.force_login(access_token)
+
+    for _ in range(3):
+        response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+        assert response.status_code == 200
+        assert response.json()["id"] == str(user.id)
+
+    assert token_cache.misses == 1
+    assert token_cache.hits == 2
+    assert token_cache.key(access_token.token) in token_cache
+
+
+async def test_token_cache_invalid(async_client: AsyncClientTest) -> None:
+    async_client.headers.update({"Authorization": "Bearer foo"})
+
+    response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+    assert response.status_code == 401
+    assert len(token_cache) == 0
+
+
+async def test_token_cache_logout(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async()
+    access_token = await user.awaitable_attrs.access_token
+    async_client.force_login(access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+    assert response.status_code == 200
+    assert token_cache.key(access_token.token) in token_cache
+
+    response = await async_client.post(url=async_client.url_path_for("auth:database.logout"))
+    assert response.status_code == 204
+    assert token_cache.key(access_token.token) not in token_cache
+
+    response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+    assert response.status_code == 401
+
+
+async def test_token_cache_update(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async()
+    access_token = await user.awaitable_attrs.access_token
+    async_client.force_login(access_token)
+
+    response = await async_client.patch(
+        url=async_client.url_path_for("users:patch_current_user"),
+        json={"first_name": "Jean"},
+    )
+    assert response.status_code == 200
+    assert token_cache.key(access_token.token) not in token_cache
+
+    response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Jean"
+
+
+async def test_token_cache_deactivate(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    admin = await UserFactoryRel.create_async(is_superuser=True)
+    user = await UserFactoryRel.create_async()
+    user_token = await user.awaitable_attrs.access_token
+
+    async_client.force_login(user_token)
+    response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+    assert response.status_code == 200
+    assert token_cache.key(user_token.token) in token_cache
+
+    async_client.force_login(await admin.awaitable_attrs.access_token)
+    response = await async_client.patch(
+        url=async_client.url_path_for("users:patch_user", id=str(user.id)),
+        json={"is_active": False},
+    )
+    assert response.status_code == 200
+    assert token_cache.key(user_token.token) not in token_cache
+
+    async_client.force_login(user_token)
+    response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+    assert response.status_code == 401
+
+
+async def test_token_read_primary(
+    async_session_db: AsyncSession,
+    async_client: AsyncClientTest,
+    test_db_name: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Another connection outside of the test transaction doesn't see the
+    # token yet, just like a lagging replica (which could also still have a
+    # token deleted on the primary).
+    replica = create_async_engine(url=make_url(str(settings.POSTGRES_URI)).set(database=test_db_name))
+    monkeypatch.setattr(deps_db, "replica_router", ReplicaRouter([replica]))
+
+    user = await UserFactoryRel.create_async()
+    access_token = await user.awaitable_attrs.access_token
+    async_client.force_login(access_token)
+
+    try:
+        response = await async_client.get(url=async_client.url_path_for("users:current_user"))
+        # Never connected to.
+        assert replica.pool.checkedin() == 0  # type: ignore[attr-defined]
+    finally:
+        await replica.dispose()
+
+    assert response.status_code == 200
+    assert response.json()["id"] == str(user.id)
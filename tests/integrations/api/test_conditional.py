@@ -0,0 +1,139 @@
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.deps.caching import etag_matches
+from miolingo.models.users import User
+
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def login(async_client: AsyncClientTest) -> User:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    return user
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('"xyz", W/"abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+        ("", False),
+    ],
+)
+def test_etag_matches(if_none_match: str, expected: bool) -> None:
+    assert etag_matches('W/"abc"', if_none_match) is expected
+
+
+async def test_current_user(async_client: AsyncClientTest) -> None:
+    await login(async_client)
+    url = async_client.url_path_for("users:current_user")
+
+    response = await async_client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = await async_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = await async_client.patch(url, json={"first_name": "Jane"})
+    assert response.status_code == 200
+
+    response = await async_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Jane"
+    assert response.headers["etag"] != etag
+
+
+async def test_current_user_other_worker(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    url = async_client.url_path_for("users:current_user")
+    response = await async_client.get(url)
+    etag = response.headers["etag"]
+
+    # Updated by another worker, the token cache of this one still has the old snapshot.
+    await async_session_db.execute(update(User).where(User.id == user.id).values(first_name="Jane"))
+
+    response = await async_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Jane"
+    assert response.headers["etag"] != etag
+
+
+async def test_current_user_revision(async_client: AsyncClientTest, queries: list[str]) -> None:
+    await login(async_client)
+    url = async_client.url_path_for("users:current_user")
+    etag = (await async_client.get(url)).headers["etag"]
+
+    # Not a change of the user itself.
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fr", "text": "chat"},
+    )
+    assert response.status_code == 201
+
+    queries.clear()
+    response = await async_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    # Only the revision of the user authenticated by its cached token (savepoints being of the test transaction).
+    statements = [statement for statement in queries if "SAVEPOINT" not in statement]
+    assert len(statements) == 1
+    assert statements[0].startswith('SELECT "user".revision')
+
+
+async def test_translations(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation = await TranslationFactory.create_async(user_id=user.id)
+    list_url = async_client.url_path_for("translations:list")
+    get_url = async_client.url_path_for("translations:get", id=translation.id)
+
+    responses = [await async_client.get(url) for url in (list_url, get_url)]
+    etags = [response.headers["etag"] for response in responses]
+    assert all(response.status_code == 200 for response in responses)
+    # Per route and parameters.
+    assert etags[0] != etags[1]
+    assert (await async_client.get(list_url, params={"limit": 1})).headers["etag"] != etags[0]
+
+    for url, etag in zip((list_url, get_url), etags):
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    # Any change of the vocabulary, even of another word, gives new versions.
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "en", "text": "cat"},
+    )
+    assert response.status_code == 201
+
+    for url, etag in zip((list_url, get_url), etags):
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+async def test_translations_other_user(async_client: AsyncClientTest) -> None:
+    await login(async_client)
+    response = await async_client.get(async_client.url_path_for("translations:list"))
+
+    await login(async_client)
+    response = await async_client.get(
+        async_client.url_path_for("translations:list"),
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 200
+
+
+async def test_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.get(async_client.url_path_for("users:current_user"), headers={"If-None-Match": "*"})
+    assert response.status_code == 401
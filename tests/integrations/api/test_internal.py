@@ -0,0 +1,42 @@
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def test_db_pool(async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async(is_superuser=True)
+    async_client.force_login(await user.awaitable_attrs.access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("internal:db_pool"))
+
+    assert response.status_code == 200
+    content = response.json()
+    assert content["pool"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert content["size"] == 5
+
+
+async def test_db_pool_forbidden(async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("internal:db_pool"))
+    assert response.status_code == 403
+
+
+async def test_db_pool_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.get(url=async_client.url_path_for("internal:db_pool"))
+    assert response.status_code == 401
+
+
+async def test_timings(async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async(is_superuser=True)
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    await async_client.get(url=async_client.url_path_for("internal:db_pool"))
+
+    response = await async_client.get(url=async_client.url_path_for("internal:timings"))
+
+    assert response.status_code == 200
+    timing = next(item for item in response.json() if item["path"] == "/api/v1/internal/db/pool")
+    assert timing["method"] == "GET"
+    assert timing["count"] >= 1
+    assert timing["buckets"]["+Inf"] == timing["count"]
+    assert list(timing["buckets"])[0] == "0.005"
@@ -0,0 +1,196 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+from httpx import ASGITransport
+
+from miolingo import settings
+from miolingo.backends.authentication import JWTRefreshStrategy, hash_token, jwt_auth_backend
+from miolingo.managers.users import UserManager
+from miolingo.models.users import RefreshToken, User
+
+from tests.factories.users import RefreshTokenFactory, UserFactory
+from tests.utils.client import AsyncClientTest, build_auth_app, jwt_strategy, write_jwt
+
+
+@pytest.fixture
+async def jwt_client(async_session_db: AsyncSession) -> AsyncClientTest:
+    return AsyncClientTest(transport=ASGITransport(app=build_auth_app(jwt_auth_backend)))
+
+
+async def login(client: AsyncClientTest, user: User) -> dict[str, str]:
+    response = await client.post(
+        url=client.url_path_for("auth:jwt.login"),
+        data={"username": user.email, "password": "test"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def bearer(access_token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+async def test_login(async_session_db: AsyncSession, jwt_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+
+    tokens = await login(jwt_client, user)
+    assert tokens["token_type"] == "bearer"
+
+    refresh_token = await async_session_db.get(RefreshToken, hash_token(tokens["refresh_token"]))
+    assert refresh_token is not None
+    assert refresh_token.user_id == user.id
+
+
+async def test_current_user_queries(async_session_db: AsyncSession, queries: list[str]) -> None:
+    # The /users/me route as served by the app, not the fastapi-users one.
+    user = await UserFactory.create_async()
+    client = AsyncClientTest(headers=bearer(await write_jwt(user)))
+    queries.clear()
+
+    with jwt_strategy():
+        response = await client.get(url=client.url_path_for("users:current_user"))
+    assert response.status_code == 200
+    assert response.json()["id"] == str(user.id)
+    assert response.json()["email"] == user.email
+
+    # Authenticating doesn't query anything, the route reads the revision then the row of the user.
+    statements = [statement for statement in queries if "SAVEPOINT" not in statement]
+    assert len(statements) == 2
+    assert statements[0].startswith('SELECT "user".revision')
+    assert statements[1].startswith('SELECT "user".first_name')
+
+
+async def test_read_token_full_user(async_session_db: AsyncSession) -> None:
+    user = await UserFactory.create_async(vocabulary_revision=3)
+    strategy = JWTRefreshStrategy(
+        settings.SECRET,
+        lifetime_seconds=60,
+        refresh_token_db=None,  # type: ignore[arg-type]
+        refresh_lifetime_seconds=60,
+    )
+    token = await strategy.write_token(user)
+    # As read by another request.
+    async_session_db.expunge(user)
+    user_manager = UserManager(SQLAlchemyUserDatabase(async_session_db, User))
+
+    authenticated = await strategy.read_token(token, user_manager)
+    assert authenticated is not None
+    assert authenticated.email == user.email
+    assert inspect(authenticated).unloaded == {"hashed_password", "vocabulary_revision", "revision", "access_token"}
+    # Loaded explicitly where needed.
+    assert await authenticated.awaitable_attrs.vocabulary_revision == 3
+    assert await user_manager.check_password(authenticated, "test") is True
+
+
+async def test_read_token_invalid(jwt_client: AsyncClientTest) -> None:
+    response = await jwt_client.get(url=jwt_client.url_path_for("users:current_user"), headers=bearer("foo"))
+    assert response.status_code == 401
+
+
+async def test_refresh(async_session_db: AsyncSession, jwt_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+    tokens = await login(jwt_client, user)
+
+    response = await jwt_client.post(
+        url=jwt_client.url_path_for("auth:jwt.refresh"),
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed["refresh_token"] != tokens["refresh_token"]
+
+    response = await jwt_client.get(
+        url=jwt_client.url_path_for("users:current_user"),
+        headers=bearer(refreshed["access_token"]),
+    )
+    assert response.status_code == 200
+
+    # Refresh tokens are rotated.
+    response = await jwt_client.post(
+        url=jwt_client.url_path_for("auth:jwt.refresh"),
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 401
+    assert response.json()["detail"] == "REFRESH_BAD_TOKEN"
+
+
+async def test_refresh_expired(async_session_db: AsyncSession, jwt_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+    tokens = await login(jwt_client, user)
+    refresh_token = await async_session_db.get(RefreshToken, hash_token(tokens["refresh_token"]))
+    refresh_token.created_at = datetime.now(timezone.utc) - timedelta(days=365)
+    await async_session_db.commit()
+
+    response = await jwt_client.post(
+        url=jwt_client.url_path_for("auth:jwt.refresh"),
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 401
+
+
+async def test_refresh_inactive(async_session_db: AsyncSession, jwt_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async(is_active=False)
+    refresh_token = "foo"
+    await RefreshTokenFactory.create_async(token=hash_token(refresh_token), user_id=user.id)
+
+    response = await jwt_client.post(
+        url=jwt_client.url_path_for("auth:jwt.refresh"),
+        json={"refresh_token": refresh_token},
+    )
+    assert response.status_code == 401
+
+
+async def test_logout(async_session_db: AsyncSession, jwt_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+    tokens = await login(jwt_client, user)
+
+    response = await jwt_client.post(
+        url=jwt_client.url_path_for("auth:jwt.logout"),
+        headers=bearer(tokens["access_token"]),
+    )
+    assert response.status_code == 204
+
+    # Access token is revoked, and its refresh token deleted.
+    response = await jwt_client.get(
+        url=jwt_client.url_path_for("users:current_user"),
+        headers=bearer(tokens["access_token"]),
+    )
+    assert response.status_code == 401
+    result = await async_session_db.execute(select(RefreshToken).where(RefreshToken.user_id == user.id))
+    assert result.scalars().all() == []
+
+
+async def test_update_revokes(async_session_db: AsyncSession, jwt_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+    tokens = await login(jwt_client, user)
+
+    response = await jwt_client.patch(
+        url=jwt_client.url_path_for("users:patch_current_user"),
+        headers=bearer(tokens["access_token"]),
+        json={"first_name": "Jean"},
+    )
+    assert response.status_code == 200
+
+    # The user snapshot of the JWT is stale, a new one should be issued.
+    response = await jwt_client.get(
+        url=jwt_client.url_path_for("users:current_user"),
+        headers=bearer(tokens["access_token"]),
+    )
+    assert response.status_code == 401
+
+    response = await jwt_client.post(
+        url=jwt_client.url_path_for("auth:jwt.refresh"),
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 200
+
+    response = await jwt_client.get(
+        url=jwt_client.url_path_for("users:current_user"),
+        headers=bearer(response.json()["access_token"]),
+    )
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Jean"
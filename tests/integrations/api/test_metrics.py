@@ -0,0 +1,25 @@
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def test_metrics(async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async()
+    response = await async_client.post(
+        url=async_client.url_path_for("auth:database.login"),
+        data={"username": user.email, "password": "wrong"},
+    )
+    assert response.status_code == 400
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    await async_client.get(async_client.url_path_for("users:current_user"))
+
+    response = await async_client.get(async_client.url_path_for("metrics"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    lines = response.text.splitlines()
+    assert "# TYPE miolingo_http_requests_total counter" in lines
+    samples = {line.rsplit(" ", 1)[0] for line in lines if not line.startswith("#")}
+    assert 'miolingo_http_requests_total{method="GET",path="/users/me",status="200"}' in samples
+    assert 'miolingo_auth_logins_total{result="bad_password"}' in samples
+    assert 'miolingo_password_hash_duration_seconds_count{operation="verify"}' in samples
+    assert "miolingo_db_pool_size 5" in lines
@@ -0,0 +1,241 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.backends.answers import answer_cache
+from miolingo.models.core import Review, Translation, translation_link
+from miolingo.models.users import User
+
+from tests.factories.reviews import ReviewFactory
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def login(async_client: AsyncClientTest) -> User:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    return user
+
+
+async def create_review(user: User, **kwargs: object) -> Review:
+    translation = await TranslationFactory.create_async(user_id=user.id)
+    return await ReviewFactory.create_async(translation_id=translation.id, user_id=user.id, **kwargs)
+
+
+async def test_due(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    now = datetime.now(timezone.utc)
+    late = await create_review(user, due_at=now - timedelta(days=2), interval=3, repetitions=2)
+    new = await create_review(user, due_at=now - timedelta(minutes=1))
+    await create_review(user, due_at=now + timedelta(days=1))
+    await create_review(await UserFactoryRel.create_async(), due_at=now - timedelta(days=3))
+
+    response = await async_client.get(url=async_client.url_path_for("reviews:due"))
+
+    assert response.status_code == 200
+    data = response.json()
+    # Most overdue first.
+    assert [r["translation_id"] for r in data] == [late.translation_id, new.translation_id]
+    translation = await async_session_db.get(Translation, late.translation_id)
+    assert data[0]["text"] == translation.text
+    assert data[0]["interval"] == 3
+
+    response = await async_client.get(url=async_client.url_path_for("reviews:due"), params={"limit": 1})
+    assert [r["translation_id"] for r in response.json()] == [late.translation_id]
+
+
+async def test_due_index_range_scan(async_session_db: AsyncSession) -> None:
+    user = await UserFactoryRel.create_async()
+    await create_review(user)
+
+    # Such a small table would be scanned sequentially (or with a bitmap) otherwise.
+    await async_session_db.execute(text("SET LOCAL enable_seqscan = off"))
+    await async_session_db.execute(text("SET LOCAL enable_bitmapscan = off"))
+    result = await async_session_db.execute(
+        text(
+            "EXPLAIN SELECT translation_id FROM miolingo_review "
+            "WHERE user_id = :user_id AND due_at <= now() ORDER BY due_at LIMIT 20"
+        ),
+        {"user_id": user.id},
+    )
+    plan = "\n".join(result.scalars())
+    assert "Index Scan using ix_miolingo_review_user_id_due_at" in plan
+    assert "Sort" not in plan
+
+
+async def test_new_translation_is_due(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    await login(async_client)
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fr", "text": "chat"},
+    )
+    translation_id = response.json()["id"]
+
+    response = await async_client.get(url=async_client.url_path_for("reviews:due"))
+    assert [r["translation_id"] for r in response.json()] == [translation_id]
+    assert response.json()[0]["repetitions"] == 0
+
+
+async def test_grade(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    known = await create_review(user, interval=6, repetitions=2)
+    new = await create_review(user)
+
+    response = await async_client.post(
+        url=async_client.url_path_for("reviews:grade"),
+        json={
+            "answers": [
+                {"translation_id": known.translation_id, "grade": 5},
+                {"translation_id": new.translation_id, "grade": 1},
+                # Answered again later in the session.
+                {"translation_id": new.translation_id, "grade": 4},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["translation_id"] for r in data] == [known.translation_id, new.translation_id]
+    assert (data[0]["ease"], data[0]["interval"], data[0]["repetitions"]) == (2600, 15, 3)
+    assert (data[1]["ease"], data[1]["interval"], data[1]["repetitions"]) == (2500, 1, 1)
+
+    review = await async_session_db.scalar(
+        select(Review).where(Review.translation_id == known.translation_id).execution_options(populate_existing=True)
+    )
+    assert review is not None
+    assert review.reviewed_at is not None
+    assert review.due_at - review.reviewed_at == timedelta(days=15)
+
+
+async def test_grade_invalid(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    mine = await create_review(user)
+    other = await create_review(await UserFactoryRel.create_async())
+
+    response = await async_client.post(
+        url=async_client.url_path_for("reviews:grade"),
+        json={
+            "answers": [
+                {"translation_id": mine.translation_id, "grade": 5},
+                {"translation_id": other.translation_id, "grade": 5},
+            ]
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.REVIEW_INVALID_TRANSLATIONS
+
+    response = await async_client.post(
+        url=async_client.url_path_for("reviews:grade"),
+        json={"answers": [{"translation_id": mine.translation_id, "grade": 6}]},
+    )
+    assert response.status_code == 422
+
+
+async def create_card(session: AsyncSession, user: User, text: str, answers: list[str]) -> Review:
+    card = await TranslationFactory.create_async(user_id=user.id, text=text)
+    for i, answer in enumerate(answers):
+        translation = await TranslationFactory.create_async(user_id=user.id, lang="en", text=answer, priority=-i)
+        await session.execute(
+            translation_link.insert().values(
+                [
+                    {"source_id": card.id, "target_id": translation.id},
+                    {"source_id": translation.id, "target_id": card.id},
+                ]
+            )
+        )
+    return await ReviewFactory.create_async(translation_id=card.id, user_id=user.id)
+
+
+async def test_check(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    cat = await create_card(async_session_db, user, "chat", ["the cat", "kitty / pussycat"])
+    dog = await create_card(async_session_db, user, "chien", ["dog"])
+    bird = await create_card(async_session_db, user, "oiseau", [])
+
+    response = await async_client.post(
+        url=async_client.url_path_for("reviews:check"),
+        json={
+            "answers": [
+                {"translation_id": cat.translation_id, "answer": "pusycat"},
+                {"translation_id": dog.translation_id, "answer": "cat"},
+                {"translation_id": bird.translation_id, "answer": "bird"},
+                {"translation_id": dog.translation_id, "answer": "The Dog"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "translation_id": cat.translation_id,
+            "correct": True,
+            "typos": 1,
+            "grade": 4,
+            "expected": ["the cat", "kitty / pussycat"],
+        },
+        {"translation_id": dog.translation_id, "correct": False, "typos": None, "grade": 1, "expected": ["dog"]},
+        {"translation_id": bird.translation_id, "correct": False, "typos": None, "grade": 1, "expected": []},
+        {"translation_id": dog.translation_id, "correct": True, "typos": 0, "grade": 5, "expected": ["dog"]},
+    ]
+    # Nothing graded.
+    review = await async_session_db.get(Review, dog.translation_id)
+    assert review.reviewed_at is None
+
+
+async def test_check_cache(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    card = await create_card(async_session_db, user, "chat", ["cat"])
+    json = {"answers": [{"translation_id": card.translation_id, "answer": "cats"}]}
+
+    response = await async_client.post(url=async_client.url_path_for("reviews:check"), json=json)
+    assert response.json()[0]["expected"] == ["cat"]
+    assert answer_cache.stats["size"] == 1
+
+    # Texts of translations answering a card are reloaded once changed.
+    answer_id = await async_session_db.scalar(
+        select(translation_link.c.target_id).where(translation_link.c.source_id == card.translation_id)
+    )
+    response = await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=answer_id),
+        json={"text": "cats"},
+    )
+    assert response.status_code == 200
+    assert answer_cache.stats["size"] == 0
+
+    response = await async_client.post(url=async_client.url_path_for("reviews:check"), json=json)
+    assert response.json()[0]["expected"] == ["cats"]
+    assert response.json()[0]["typos"] == 0
+    assert answer_cache.stats["hits"] == 0
+
+    response = await async_client.post(url=async_client.url_path_for("reviews:check"), json=json)
+    assert answer_cache.stats["hits"] == 1
+
+
+async def test_check_invalid(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    mine = await create_card(async_session_db, user, "chat", ["cat"])
+    other = await create_card(async_session_db, await UserFactoryRel.create_async(), "chien", ["dog"])
+
+    response = await async_client.post(
+        url=async_client.url_path_for("reviews:check"),
+        json={
+            "answers": [
+                {"translation_id": mine.translation_id, "answer": "cat"},
+                {"translation_id": other.translation_id, "answer": "dog"},
+            ]
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.REVIEW_INVALID_TRANSLATIONS
+
+    response = await async_client.post(url=async_client.url_path_for("reviews:check"), json={"answers": []})
+    assert response.status_code == 422
+
+
+async def test_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.get(url=async_client.url_path_for("reviews:due"))
+    assert response.status_code == 401
@@ -0,0 +1,263 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.models.core import Translation, translation_link
+from miolingo.models.users import User
+
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def login(async_client: AsyncClientTest, **kwargs: bool) -> User:
+    user = await UserFactoryRel.create_async(**kwargs)
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    return user
+
+
+async def links(session: AsyncSession) -> set[tuple[int, int]]:
+    result = await session.execute(select(translation_link.c.source_id, translation_link.c.target_id))
+    return set(result.tuples())
+
+
+async def test_list(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    low = await TranslationFactory.create_async(user_id=user.id, lang="fr", priority=0)
+    high = await TranslationFactory.create_async(user_id=user.id, lang="fr", priority=5)
+    english = await TranslationFactory.create_async(user_id=user.id, lang="en")
+    await TranslationFactory.create_async(user_id=(await UserFactoryRel.create_async()).id)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:list"))
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["id"] for t in data["items"]] == [high.id, low.id, english.id]
+    assert data["items"][-1] == {"id": english.id, "lang": "en", "text": english.text, "priority": 0}
+    assert data["next_cursor"] is None
+    assert data["total"] is None
+
+    response = await async_client.get(url=async_client.url_path_for("translations:list"), params={"lang": "en"})
+    assert [t["id"] for t in response.json()["items"]] == [english.id]
+
+
+async def test_list_pages(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translations = await TranslationFactory.create_batch_async(size=5, user_id=user.id, lang="fr")
+
+    ids: list[int] = []
+    params: dict[str, str | int] = {"lang": "fr", "limit": 2}
+    for _ in range(3):
+        response = await async_client.get(url=async_client.url_path_for("translations:list"), params=params)
+        assert response.status_code == 200
+        ids += [t["id"] for t in response.json()["items"]]
+        params["cursor"] = response.json()["next_cursor"]
+
+    # Newest first with the same priority.
+    assert ids == [t.id for t in reversed(translations)]
+    assert params["cursor"] is None
+
+
+async def test_list_total(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    await TranslationFactory.create_batch_async(size=3, user_id=user.id)
+
+    response = await async_client.get(
+        url=async_client.url_path_for("translations:list"),
+        params={"with_total": True, "limit": 1},
+    )
+    assert response.status_code == 200
+    # Estimated, not counted.
+    assert isinstance(response.json()["total"], int)
+
+
+async def test_list_bad_cursor(async_client: AsyncClientTest) -> None:
+    await login(async_client)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:list"), params={"cursor": "foo"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.PAGINATION_BAD_CURSOR
+
+
+async def test_list_index_only(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    await TranslationFactory.create_batch_async(size=3, user_id=user.id)
+
+    # Such a small table would be scanned sequentially otherwise.
+    await async_session_db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await async_session_db.execute(
+        text(
+            "EXPLAIN SELECT id, lang, text, priority FROM miolingo_translation "
+            "WHERE user_id = :user_id AND (lang, priority, id) < ('fr', 0, 100) "
+            "ORDER BY lang DESC, priority DESC, id DESC LIMIT 50"
+        ),
+        {"user_id": user.id},
+    )
+    plan = "\n".join(result.scalars())
+    assert "Index Only Scan Backward using ix_miolingo_translation_user_id_lang_priority" in plan
+    assert "Sort" not in plan
+
+
+async def test_list_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.get(url=async_client.url_path_for("translations:list"))
+    assert response.status_code == 401
+
+
+async def test_create(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    cat = await TranslationFactory.create_async(user_id=user.id, lang="en", text="cat")
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fr", "text": "Chat noir", "priority": 2, "translation_ids": [cat.id]},
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["slug"] == "chat-noir"
+    assert data["priority"] == 2
+    assert data["created_at"] is not None
+    assert data["translations"] == [{"id": cat.id, "lang": "en", "text": "cat", "priority": 0}]
+    assert await links(async_session_db) == {(data["id"], cat.id), (cat.id, data["id"])}
+
+
+async def test_create_duplicate(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    await TranslationFactory.create_async(user_id=user.id, lang="fr", text="chat")
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fr", "text": "Chat!"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.TRANSLATION_ALREADY_EXISTS
+
+
+async def test_create_invalid_links(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    await login(async_client)
+    other = await TranslationFactory.create_async(user_id=(await UserFactoryRel.create_async()).id)
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fr", "text": "chat", "translation_ids": [other.id]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.TRANSLATION_INVALID_LINKS
+
+
+async def test_create_invalid_text(async_client: AsyncClientTest) -> None:
+    await login(async_client)
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fra", "text": "?!"},
+    )
+    assert response.status_code == 422
+    assert {e["loc"][-1] for e in response.json()["detail"]} == {"lang", "text"}
+
+
+async def test_create_unverified(async_client: AsyncClientTest) -> None:
+    await login(async_client, is_verified=False)
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:create"),
+        json={"lang": "fr", "text": "chat"},
+    )
+    assert response.status_code == 403
+
+
+async def test_get(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation = await TranslationFactory.create_async(user_id=user.id)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:get", id=translation.id))
+    assert response.status_code == 200
+    assert response.json()["slug"] == translation.slug
+    assert response.json()["translations"] == []
+
+
+async def test_get_other_user(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    await login(async_client)
+    translation = await TranslationFactory.create_async(user_id=(await UserFactoryRel.create_async()).id)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:get", id=translation.id))
+    assert response.status_code == 404
+
+
+async def test_update(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation, cat, dog = await TranslationFactory.create_batch_async(size=3, user_id=user.id)
+    await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"translation_ids": [cat.id]},
+    )
+
+    response = await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"text": "Chien", "translation_ids": [dog.id]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["text"] == "Chien"
+    assert data["slug"] == "chien"
+    assert [t["id"] for t in data["translations"]] == [dog.id]
+    assert await links(async_session_db) == {(translation.id, dog.id), (dog.id, translation.id)}
+
+
+async def test_update_keep_links(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation, cat = await TranslationFactory.create_batch_async(size=2, user_id=user.id)
+    await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"translation_ids": [cat.id]},
+    )
+
+    response = await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"priority": 3, "lang": None},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["priority"] == 3
+    assert response.json()["lang"] == translation.lang
+    assert [t["id"] for t in response.json()["translations"]] == [cat.id]
+
+
+async def test_update_duplicate(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation = await TranslationFactory.create_async(user_id=user.id, text="chat")
+    await TranslationFactory.create_async(user_id=user.id, text="chien")
+
+    response = await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"text": "Chien"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.TRANSLATION_ALREADY_EXISTS
+
+
+async def test_update_link_itself(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation = await TranslationFactory.create_async(user_id=user.id)
+
+    response = await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"translation_ids": [translation.id]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.TRANSLATION_INVALID_LINKS
+
+
+async def test_delete(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    translation, cat = await TranslationFactory.create_batch_async(size=2, user_id=user.id)
+    await async_client.patch(
+        url=async_client.url_path_for("translations:patch", id=translation.id),
+        json={"translation_ids": [cat.id]},
+    )
+
+    response = await async_client.delete(url=async_client.url_path_for("translations:delete", id=translation.id))
+
+    assert response.status_code == 204
+    assert await async_session_db.scalar(select(Translation).where(Translation.id == translation.id)) is None
+    assert await links(async_session_db) == set()
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.backends.exports import VocabularyExport
+from miolingo.crud.translations import TranslationDatabase
+from miolingo.db.pagination import Explain
+from miolingo.models.core import translation_link
+from miolingo.models.users import User
+
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def login(async_client: AsyncClientTest) -> User:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    return user
+
+
+async def test_export_csv(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    chat = await TranslationFactory.create_async(user_id=user.id, lang="fr", text='Chat "noir", 1')
+    cat = await TranslationFactory.create_async(user_id=user.id, lang="en", text="cat")
+    dog = await TranslationFactory.create_async(user_id=user.id, lang="en", text="dog", priority=1)
+    await TranslationFactory.create_async(user_id=(await UserFactoryRel.create_async()).id)
+    await async_session_db.execute(
+        translation_link.insert().values(
+            [
+                {"source_id": chat.id, "target_id": cat.id},
+                {"source_id": cat.id, "target_id": chat.id},
+                {"source_id": chat.id, "target_id": dog.id},
+                {"source_id": dog.id, "target_id": chat.id},
+            ]
+        )
+    )
+
+    response = await async_client.get(url=async_client.url_path_for("translations:export"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"] == 'attachment; filename="vocabulary.csv"'
+    # Same order as the listing.
+    assert list(csv.reader(io.StringIO(response.text))) == [
+        ["id", "lang", "text", "priority", "translation_ids"],
+        [str(chat.id), "fr", 'Chat "noir", 1', "0", f"{cat.id} {dog.id}"],
+        [str(dog.id), "en", "dog", "1", str(chat.id)],
+        [str(cat.id), "en", "cat", "0", str(chat.id)],
+    ]
+
+
+async def test_export_ndjson(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    chat = await TranslationFactory.create_async(user_id=user.id, lang="fr", text="Chat")
+    await TranslationFactory.create_async(user_id=user.id, lang="en")
+
+    response = await async_client.get(
+        url=async_client.url_path_for("translations:export"),
+        params={"format": "ndjson", "lang": "fr"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": chat.id, "lang": "fr", "text": "Chat", "priority": 0, "translation_ids": []},
+    ]
+
+
+async def test_export_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.get(url=async_client.url_path_for("translations:export"))
+    assert response.status_code == 401
+
+
+async def test_run_batches(async_session_db: AsyncSession) -> None:
+    user = await UserFactoryRel.create_async()
+    await TranslationFactory.create_batch_async(size=5, user_id=user.id)
+    exporter = VocabularyExport(user.id, file_format="ndjson", batch_size=2)
+
+    chunks = [chunk async for chunk in exporter.run()]
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+
+
+async def test_export_no_sort(async_session_db: AsyncSession) -> None:
+    user = await UserFactoryRel.create_async()
+    await TranslationFactory.create_batch_async(size=3, user_id=user.id)
+
+    # Such a small table would be scanned sequentially otherwise.
+    await async_session_db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = await async_session_db.scalar(Explain(TranslationDatabase(async_session_db, user.id)._export_stmt()))
+
+    # Rows come in the index order, no sort of all of them before sending the first one.
+    assert plan[0]["Plan"]["Node Type"] == "Index Only Scan"
+    assert plan[0]["Plan"]["Scan Direction"] == "Backward"
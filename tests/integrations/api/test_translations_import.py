@@ -0,0 +1,264 @@
+import json
+from typing import Any, AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.api.v1.errors import ErrorCode
+from miolingo.backends import imports
+from miolingo.backends.imports import VocabularyImport
+from miolingo.models.core import Review, Translation, translation_link
+from miolingo.models.users import User
+
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def login(async_client: AsyncClientTest) -> User:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    return user
+
+
+async def post_import(async_client: AsyncClientTest, content: str | bytes, **params: Any) -> list[dict[str, Any]]:
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:import"),
+        params={"source": "fr", "target": "en", **params},
+        content=content,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def words(session: AsyncSession, user: User) -> dict[tuple[str, str], str]:
+    result = await session.execute(
+        select(Translation.lang, Translation.slug, Translation.text).where(Translation.user_id == user.id)
+    )
+    return {(lang, slug): text for lang, slug, text in result.tuples()}
+
+
+async def linked(session: AsyncSession, user: User) -> set[tuple[str, str]]:
+    stmt = (
+        select(Translation.slug, translation_link.c.target_id)
+        .join(translation_link, translation_link.c.source_id == Translation.id)
+        .where(Translation.user_id == user.id, Translation.lang == "fr")
+    )
+    result = await session.execute(stmt)
+    targets = {t.id: t.slug for t in await session.scalars(select(Translation))}
+    return {(slug, targets[target_id]) for slug, target_id in result.tuples()}
+
+
+async def test_import(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    existing = await TranslationFactory.create_async(user_id=user.id, lang="fr", text="Chat")
+
+    events = await post_import(
+        async_client,
+        "#separator:comma\n"
+        "chat,cat\n"
+        "Chien,dog\n"
+        "chien,hound\n"
+        "chien,Dog\n"  # Duplicate pair
+        '"pomme, de terre","potato"\n',
+    )
+
+    assert events == [
+        {"event": "done", "rows": 5, "created": 6, "linked": 4, "error_count": 0, "errors": []},
+    ]
+    assert await words(async_session_db, user) == {
+        ("fr", "chat"): existing.text,
+        ("fr", "chien"): "Chien",
+        ("fr", "pomme-de-terre"): "pomme, de terre",
+        ("en", "cat"): "cat",
+        ("en", "dog"): "dog",
+        ("en", "hound"): "hound",
+        ("en", "potato"): "potato",
+    }
+    assert await linked(async_session_db, user) == {
+        ("chat", "cat"),
+        ("chien", "dog"),
+        ("chien", "hound"),
+        ("pomme-de-terre", "potato"),
+    }
+
+    # New words are cards to review.
+    reviews = await async_session_db.scalars(select(Review.translation_id).where(Review.user_id == user.id))
+    assert len(set(reviews)) == 6
+
+    # Importing again is a no-op.
+    events = await post_import(async_client, "chat,cat\n")
+    assert events[-1]["created"] == 0
+    assert events[-1]["linked"] == 0
+
+
+async def test_import_tsv(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+
+    events = await post_import(
+        async_client,
+        "front\tback\nmaison\thouse, home\tignored\n",
+        format="tsv",
+        header=True,
+    )
+
+    assert events[-1]["created"] == 2
+    assert await linked(async_session_db, user) == {("maison", "house-home")}
+
+
+async def test_import_source_only(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:import"),
+        params={"source": "fr"},
+        content="chat,cat\nchien\n",
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.text)["created"] == 2
+    assert await words(async_session_db, user) == {("fr", "chat"): "chat", ("fr", "chien"): "chien"}
+
+
+async def test_import_row_errors(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+
+    events = await post_import(async_client, f"chat,cat\n!?,what\nchien\n,empty\n{'a' * 2049},long\n")
+
+    assert events[-1]["rows"] == 5
+    assert events[-1]["created"] == 2
+    assert events[-1]["error_count"] == 4
+    assert events[-1]["errors"] == [
+        {"line": 2, "detail": "Text should contain at least a letter or a digit"},
+        {"line": 3, "detail": "Text is missing"},
+        {"line": 4, "detail": "Text is missing"},
+        {"line": 5, "detail": "Text should have at most 2048 characters"},
+    ]
+    assert set(await words(async_session_db, user)) == {("fr", "chat"), ("en", "cat")}
+
+    events = await post_import(async_client, "!?\n")
+    assert events[-1]["created"] == 0
+    assert events[-1]["error_count"] == 1
+
+
+async def test_import_failures(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+
+    events = await post_import(async_client, "chat,cat\ncrème,cream\n".encode("latin-1"))
+    assert events == [{"event": "error", "detail": ErrorCode.IMPORT_BAD_ENCODING}]
+    # Nothing saved.
+    assert await words(async_session_db, user) == {}
+
+
+async def test_import_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.post(
+        url=async_client.url_path_for("translations:import"),
+        params={"source": "fr"},
+        content="chat\n",
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("a\nb\nc\nd\ne\n", ErrorCode.IMPORT_TOO_MANY_ROWS),
+        ('"a\n' + "b" * 200_000, ErrorCode.IMPORT_BAD_FORMAT),
+    ],
+)
+async def test_run_failures(async_session_db: AsyncSession, content: str, expected: ErrorCode) -> None:
+    user = await UserFactoryRel.create_async()
+    importer = VocabularyImport(user.id, source="fr", max_rows=4)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield content.encode()
+
+    events = [event async for event in importer.run(chunks())]
+
+    assert [e.model_dump() for e in events] == [{"event": "error", "detail": expected}]
+
+
+async def test_run_progress(async_session_db: AsyncSession) -> None:
+    user = await UserFactoryRel.create_async()
+    importer = VocabularyImport(user.id, source="fr", progress_rows=2, max_errors=1)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"a\nb\n!\n?\nc\n"
+
+    events = [event.model_dump() async for event in importer.run(chunks())]
+
+    assert events == [
+        {"event": "progress", "rows": 2},
+        {"event": "progress", "rows": 4},
+        {
+            "event": "done",
+            "rows": 5,
+            "created": 3,
+            "linked": 0,
+            "error_count": 2,
+            "errors": [{"line": 3, "detail": "Text should contain at least a letter or a digit"}],
+        },
+    ]
+
+
+async def test_run_batches(async_session_db: AsyncSession) -> None:
+    user = await UserFactoryRel.create_async()
+    importer = VocabularyImport(user.id, source="fr", target="en", batch_rows=2)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        # Duplicates across batches are merged.
+        yield b"chat,cat\nchien,dog\nChat,Cat\nsouris,mouse\nchien,hound\n"
+
+    events = [event.model_dump() async for event in importer.run(chunks())]
+
+    assert events[-1] == {"event": "done", "rows": 5, "created": 7, "linked": 4, "error_count": 0, "errors": []}
+    assert await words(async_session_db, user) == {
+        ("fr", "chat"): "chat",
+        ("fr", "chien"): "chien",
+        ("fr", "souris"): "souris",
+        ("en", "cat"): "cat",
+        ("en", "dog"): "dog",
+        ("en", "mouse"): "mouse",
+        ("en", "hound"): "hound",
+    }
+
+
+async def test_run_failure_rollback(async_session_db: AsyncSession) -> None:
+    user = await UserFactoryRel.create_async()
+    importer = VocabularyImport(user.id, source="fr", max_rows=4, batch_rows=2)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"a\nb\nc\nd\ne\n"
+
+    events = [event.model_dump() async for event in importer.run(chunks())]
+
+    assert events == [{"event": "error", "detail": ErrorCode.IMPORT_TOO_MANY_ROWS}]
+    # Batches already parsed are not saved.
+    assert await words(async_session_db, user) == {}
+
+
+async def test_run_session_after_upload(async_session_db: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    user = await UserFactoryRel.create_async()
+    importer = VocabularyImport(user.id, source="fr", batch_rows=1)
+    calls: list[str] = []
+    session_factory = imports.async_session_factory
+
+    def spy_session_factory() -> AsyncSession:
+        calls.append("session")
+        return session_factory()
+
+    monkeypatch.setattr(imports, "async_session_factory", spy_session_factory)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in (b"a\n", b"b\n"):
+            calls.append("chunk")
+            yield chunk
+
+    events = [event.model_dump() async for event in importer.run(chunks())]
+
+    assert events[-1]["created"] == 2
+    # No connection held while the (maybe slow) client uploads.
+    assert calls == ["chunk", "chunk", "session"]
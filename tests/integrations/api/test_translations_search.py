@@ -0,0 +1,112 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.models.users import User
+
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+@pytest.fixture
+async def pg_trgm(async_session_db: AsyncSession) -> None:
+    # Only created with tables when the server ships contrib modules.
+    if not await async_session_db.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")):
+        pytest.skip("pg_trgm extension is not available")
+
+
+async def login(async_client: AsyncClientTest) -> User:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+    return user
+
+
+@pytest.mark.usefixtures("pg_trgm")
+async def test_search_ranking(async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    bonjour = await TranslationFactory.create_async(user_id=user.id, text="Bonjour")
+    bonjours = await TranslationFactory.create_async(user_id=user.id, text="bonjours", priority=1)
+    await TranslationFactory.create_async(user_id=user.id, text="Bonsoir", priority=2)
+    await TranslationFactory.create_async(user_id=user.id, text="chat")
+    await TranslationFactory.create_async(user_id=(await UserFactoryRel.create_async()).id, text="Bonjour")
+
+    response = await async_client.get(url=async_client.url_path_for("translations:search"), params={"q": "bonjoru"})
+
+    assert response.status_code == 200
+    # The most similar first, whatever their priority. Too different words are left out.
+    assert [item["id"] for item in response.json()] == [bonjour.id, bonjours.id]
+    assert response.json()[0] == {
+        "id": bonjour.id,
+        "lang": "fr",
+        "text": "Bonjour",
+        "priority": 0,
+        "similarity": pytest.approx(0.4545, abs=1e-4),
+    }
+
+
+@pytest.mark.usefixtures("pg_trgm")
+async def test_search_prefix(async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    short = await TranslationFactory.create_async(user_id=user.id, text="éléphant")
+    long = await TranslationFactory.create_async(user_id=user.id, text="Éléphant de mer", priority=5)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:search"), params={"q": "ELE"})
+
+    assert response.status_code == 200
+    # Too short to be similar, but starting with the query, regardless of case and accents.
+    assert [item["id"] for item in response.json()] == [short.id, long.id]
+
+
+@pytest.mark.usefixtures("pg_trgm")
+async def test_search_priority(async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    low = await TranslationFactory.create_async(user_id=user.id, lang="fr", text="table")
+    high = await TranslationFactory.create_async(user_id=user.id, lang="en", text="table", priority=1)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:search"), params={"q": "table"})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [high.id, low.id]
+
+
+@pytest.mark.usefixtures("pg_trgm")
+async def test_search_lang_limit(async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    words = [await TranslationFactory.create_async(user_id=user.id, text=f"maison {i}", priority=i) for i in range(3)]
+    await TranslationFactory.create_async(user_id=user.id, lang="en", text="maison")
+
+    response = await async_client.get(
+        url=async_client.url_path_for("translations:search"),
+        params={"q": "maison", "lang": "fr", "limit": 2},
+    )
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [words[2].id, words[1].id]
+
+
+async def test_search_no_letter(async_client: AsyncClientTest) -> None:
+    user = await login(async_client)
+    await TranslationFactory.create_async(user_id=user.id)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:search"), params={"q": " ?! "})
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.parametrize("params", [{}, {"q": ""}, {"q": "a", "limit": 0}, {"q": "a", "limit": 101}])
+async def test_search_invalid(async_client: AsyncClientTest, params: dict) -> None:
+    await login(async_client)
+
+    response = await async_client.get(url=async_client.url_path_for("translations:search"), params=params)
+
+    assert response.status_code == 422
+
+
+async def test_search_unauthorized(async_client: AsyncClientTest) -> None:
+    response = await async_client.get(url=async_client.url_path_for("translations:search"), params={"q": "a"})
+
+    assert response.status_code == 401
+
@@ -6,7 +6,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bs4 import BeautifulSoup
+from pwdlib.hashers.bcrypt import BcryptHasher
 
+from miolingo.backends.mails import mail_dispatcher
 from miolingo.managers.users import UserManager
 from miolingo.models import AccessToken, User
 from miolingo.utils.mails import fast_mail
@@ -104,6 +106,7 @@ async def test_user_request_verify(async_session_db: AsyncSession, async_client:
             url=async_client.url_path_for("verify:request-token"),
             json={"email": user.email},
         )
+        await mail_dispatcher.join()
 
     assert response.status_code == 202
     assert response.json() is None
@@ -140,6 +143,7 @@ async def test_user_forgot_password(async_session_db: AsyncSession, async_client
             url=async_client.url_path_for("reset:forgot_password"),
             json={"email": user.email},
         )
+        await mail_dispatcher.join()
 
     assert response.status_code == 202
     assert response.json() is None
@@ -166,7 +170,7 @@ async def test_user_forgot_password(async_session_db: AsyncSession, async_client
     assert response.json() is None
 
     user = await async_session_db.get(User, user.id)
-    assert UserManager(user).check_password(user, new_passwd) is True
+    assert await UserManager(user).check_password(user, new_passwd) is True
 
 
 async def test_user_login(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
@@ -239,3 +243,98 @@ async def test_user_me(async_session_db: AsyncSession, async_client: AsyncClient
     assert content["is_active"] is True
     assert content["is_superuser"] is True
     assert content["is_verified"] is True
+
+
+async def test_user_login_unknown(async_client: AsyncClientTest) -> None:
+    response = await async_client.post(
+        url=async_client.url_path_for("auth:database.login"),
+        data={
+            "username": "unknown@miolingo.com",
+            "password": "test",
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.LOGIN_BAD_CREDENTIALS
+
+
+async def test_user_login_invalid_password(async_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+
+    response = await async_client.post(
+        url=async_client.url_path_for("auth:database.login"),
+        data={
+            "username": user.email,
+            "password": "foo",
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.LOGIN_BAD_CREDENTIALS
+
+
+async def test_user_login_upgrade_hash(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    # Bcrypt is only kept to verify legacy hashes, so login should upgrade it.
+    user = await UserFactory.create_async(hashed_password=BcryptHasher().hash("test"))
+
+    response = await async_client.post(
+        url=async_client.url_path_for("auth:database.login"),
+        data={
+            "username": user.email,
+            "password": "test",
+        },
+    )
+
+    assert response.status_code == 200
+    await async_session_db.refresh(user)
+    assert user.hashed_password.startswith("$argon2")
+
+
+async def test_user_forgot_password_inactive(async_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async(is_active=False)
+
+    with fast_mail.record_messages() as outbox:
+        response = await async_client.post(
+            url=async_client.url_path_for("reset:forgot_password"),
+            json={"email": user.email},
+        )
+        await mail_dispatcher.join()
+
+    assert response.status_code == 202
+    assert len(outbox) == 0
+
+
+async def test_user_reset_password_invalid_token(async_client: AsyncClientTest) -> None:
+    response = await async_client.post(
+        url=async_client.url_path_for("reset:reset_password"),
+        json={
+            "token": "foo",
+            "password": "adminadmin",
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.RESET_PASSWORD_BAD_TOKEN
+
+
+async def test_user_reset_password_token_used(async_client: AsyncClientTest) -> None:
+    user = await UserFactory.create_async()
+
+    with fast_mail.record_messages() as outbox:
+        await async_client.post(
+            url=async_client.url_path_for("reset:forgot_password"),
+            json={"email": user.email},
+        )
+        await mail_dispatcher.join()
+    href = BeautifulSoup(get_payload(outbox[0]), features="html.parser").find("a")["href"]
+    token: str = parse_qs(urlparse(href).query)["token"][0]
+
+    for status_code in (200, 400):  # Fingerprint doesn't match anymore the second time.
+        response = await async_client.post(
+            url=async_client.url_path_for("reset:reset_password"),
+            json={
+                "token": token,
+                "password": "adminadmin",
+            },
+        )
+        assert response.status_code == status_code
@@ -0,0 +1,58 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.api.v1.errors import ErrorCode
+
+from tests.factories.users import UserFactory, UserFactoryRel
+from tests.utils.client import AsyncClientTest
+
+
+async def test_list_users(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    admin = await UserFactoryRel.create_async(is_superuser=True, email="admin@miolingo.com")
+    async_client.force_login(await admin.awaitable_attrs.access_token)
+    users = [admin] + await UserFactory.create_batch_async(size=4)
+
+    emails: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    for _ in range(3):
+        response = await async_client.get(url=async_client.url_path_for("users:list"), params=params)
+        assert response.status_code == 200
+        emails += [u["email"] for u in response.json()["items"]]
+        params["cursor"] = response.json()["next_cursor"]
+
+    assert emails == sorted(u.email for u in users)
+    assert params["cursor"] is None
+
+
+async def test_list_users_total(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    admin = await UserFactoryRel.create_async(is_superuser=True)
+    async_client.force_login(await admin.awaitable_attrs.access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("users:list"), params={"with_total": True})
+    assert response.status_code == 200
+    # From table statistics, which could be outdated.
+    assert isinstance(response.json()["total"], int | None)
+
+
+async def test_list_users_bad_cursor(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    admin = await UserFactoryRel.create_async(is_superuser=True)
+    async_client.force_login(await admin.awaitable_attrs.access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("users:list"), params={"cursor": "foo"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == ErrorCode.PAGINATION_BAD_CURSOR
+
+
+async def test_list_users_forbidden(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    user = await UserFactoryRel.create_async()
+    async_client.force_login(await user.awaitable_attrs.access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("users:list"))
+    assert response.status_code == 403
+
+
+async def test_list_limit_max(async_session_db: AsyncSession, async_client: AsyncClientTest) -> None:
+    admin = await UserFactoryRel.create_async(is_superuser=True)
+    async_client.force_login(await admin.awaitable_attrs.access_token)
+
+    response = await async_client.get(url=async_client.url_path_for("users:list"), params={"limit": 100000})
+    assert response.status_code == 422
@@ -1,12 +1,24 @@
+from typing import AsyncGenerator
+
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
 import pytest
 
+from miolingo.backends.mails import mail_dispatcher
+
 from tests.utils.client import AsyncClientTest
 
 
 @pytest.fixture
 async def async_client(async_session_db: AsyncSession) -> AsyncClientTest:
     return AsyncClientTest()
+
+
+@pytest.fixture(autouse=True)
+async def start_mail_dispatcher() -> AsyncGenerator[None, None]:
+    # Like the app lifespan would do, tests should wait for it with join().
+    mail_dispatcher.start()
+    yield
+    await mail_dispatcher.stop()
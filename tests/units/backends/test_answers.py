@@ -0,0 +1,118 @@
+import random
+import uuid
+
+import pytest
+
+from miolingo.backends.answers import (
+    AnswerCache,
+    AnswerChecker,
+    ExpectedAnswers,
+    answer_key,
+    answer_variants,
+    edit_distance,
+)
+
+
+def osa_distance(a: str, b: str) -> int:
+    # Reference implementation, on the whole matrix.
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Le Chat", "chat"),
+        ("l'éléphant", "elephant"),
+        ("to eat", "eat"),
+        ("The", "the"),
+        ("pomme de terre", "pomme-de-terre"),
+        ("?", ""),
+    ],
+)
+def test_answer_key(text: str, expected: str) -> None:
+    assert answer_key(text) == expected
+
+
+def test_answer_variants() -> None:
+    assert answer_variants("le chat / la chatte; matou ;") == {"chat", "chatte", "matou"}
+
+
+@pytest.mark.parametrize(
+    "a, b, max_distance, expected",
+    [
+        ("chat", "chat", 0, 0),
+        ("chat", "chta", 1, 1),
+        ("chat", "cht", 1, 1),
+        ("chat", "chats", 1, 1),
+        ("chat", "chien", 2, None),
+        ("chat", "c", 2, None),
+        ("", "ab", 2, 2),
+        ("elephant", "elefant", 2, 2),
+        ("elephant", "elefant", 1, None),
+    ],
+)
+def test_edit_distance(a: str, b: str, max_distance: int, expected: int | None) -> None:
+    assert edit_distance(a, b, max_distance) == expected
+
+
+def test_edit_distance_reference() -> None:
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = "".join(rng.choices("abc", k=rng.randint(0, 7)))
+        b = "".join(rng.choices("abc", k=rng.randint(0, 7)))
+        max_distance = rng.randint(0, 3)
+        distance = osa_distance(a, b)
+
+        assert edit_distance(a, b, max_distance) == (distance if distance <= max_distance else None), (a, b)
+
+
+@pytest.mark.parametrize(
+    "answer, correct, typos, grade",
+    [
+        ("Éléphant", True, 0, 5),
+        ("un elephant", True, 0, 5),
+        ("elefant", True, 2, 4),
+        ("chat", True, 0, 5),
+        ("cht", True, 1, 4),
+        ("ct", False, None, 1),
+        ("souris", False, None, 1),
+        (" ", False, None, 0),
+    ],
+)
+def test_check_answer(answer: str, correct: bool, typos: int | None, grade: int) -> None:
+    checker = AnswerChecker(review_db=None, max_typos=2, chars_per_typo=4)  # type: ignore
+    expected = ExpectedAnswers.from_texts(["l'éléphant", "chat / chatte"])
+
+    result = checker.check_answer(1, answer, expected)
+
+    assert (result.correct, result.typos, result.grade) == (correct, typos, grade)
+    assert result.expected == ["l'éléphant", "chat / chatte"]
+
+
+def test_distance_closest_variant() -> None:
+    checker = AnswerChecker(review_db=None, max_typos=2, chars_per_typo=1)  # type: ignore
+
+    assert checker.distance("chatts", frozenset({"chatons", "chattes"})) == 1
+
+
+def test_answer_cache_evict() -> None:
+    cache = AnswerCache(maxsize=10)
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    expected = ExpectedAnswers.from_texts(["chat"])
+    for key in [(user_id, 1), (user_id, 2), (user_id, 3), (other_id, 1)]:
+        cache.set(key, expected)
+
+    cache.evict(user_id, [1, 4])
+    assert len(cache) == 3
+    cache.evict_user(user_id)
+    assert [key for key, _ in cache] == [(other_id, 1)]
@@ -0,0 +1,71 @@
+import time
+import uuid
+
+from fastapi_users.jwt import decode_jwt
+
+from miolingo.backends.authentication import (
+    USER_SNAPSHOT_FIELDS,
+    AccessTokenCache,
+    JWTRefreshStrategy,
+    TokenRevocationList,
+)
+from miolingo.models.users import User
+
+from tests.factories.users import UserFactory
+
+
+def build_jwt_strategy(revocations: TokenRevocationList) -> JWTRefreshStrategy:
+    return JWTRefreshStrategy(
+        "secret",
+        lifetime_seconds=60,
+        refresh_token_db=None,  # type: ignore[arg-type]
+        refresh_lifetime_seconds=3600,
+        revocations=revocations,
+    )
+
+
+def test_revocation_list() -> None:
+    revocations = TokenRevocationList(maxsize=10, ttl=60)
+    user_id = uuid.uuid4()
+    claims = {"sub": str(user_id), "jti": "foo", "iat": time.time()}
+    assert revocations.is_revoked(claims) is False
+
+    revocations.revoke("foo", expires_at=time.time() + 60)
+    assert revocations.is_revoked(claims) is True
+    assert revocations.is_revoked({**claims, "jti": "bar"}) is False
+
+    revocations.revoke_user(user_id)
+    assert revocations.is_revoked({**claims, "jti": "bar"}) is True
+    # Issued after the revocation.
+    assert revocations.is_revoked({**claims, "jti": "bar", "iat": time.time()}) is False
+
+
+async def test_jwt_write_token() -> None:
+    user: User = UserFactory.build()
+    strategy = build_jwt_strategy(TokenRevocationList(maxsize=10, ttl=60))
+
+    claims = decode_jwt(await strategy.write_token(user), "secret", strategy.token_audience)
+    assert claims["sub"] == str(user.id)
+    assert claims["user"]["email"] == user.email
+    # Neither the password hash, nor values changing along.
+    assert set(claims["user"]) == set(USER_SNAPSHOT_FIELDS) - {"id"}
+    assert "sid" not in claims
+
+
+async def test_jwt_destroy_token() -> None:
+    user: User = UserFactory.build()
+    revocations = TokenRevocationList(maxsize=10, ttl=60)
+    strategy = build_jwt_strategy(revocations)
+    token = await strategy.write_token(user)
+
+    # Without refresh token, the JWT is only revoked.
+    await strategy.destroy_token(token, user)
+    assert len(revocations.tokens) == 1
+
+    await strategy.destroy_token("foo", user)
+    assert len(revocations.tokens) == 1
+
+
+async def test_jwt_read_token_none() -> None:
+    strategy = build_jwt_strategy(TokenRevocationList(maxsize=10, ttl=60))
+    assert await strategy.read_token(None, None) is None  # type: ignore[arg-type]
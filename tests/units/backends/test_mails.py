@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from miolingo.backends.mails import Mail, MailDispatcher, send_mail
+from miolingo.utils import mails as mail_utils
+
+from tests.utils.mails import get_payload
+from tests.utils.smtp import SMTPSink, build_sink_mailer
+
+
+def build_mail(subject: str = "Test") -> Mail:
+    return Mail(
+        subject=subject,
+        recipients=["test@example.com"],
+        template_name="users/request_verify.html",
+        template_body={"fullname": "foo", "verify_link": "http://test"},
+    )
+
+
+class FakeSender:
+    def __init__(self, fail: int = 0, delay: float = 0) -> None:
+        self.fail = fail
+        self.delay = delay
+        self.calls: list[Mail] = []
+        self.sent: list[Mail] = []
+        self.sending: int = 0
+        self.max_sending: int = 0
+
+    async def __call__(self, mail: Mail) -> None:
+        self.calls.append(mail)
+        self.sending += 1
+        self.max_sending = max(self.max_sending, self.sending)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sending -= 1
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("SMTP down")
+        self.sent.append(mail)
+
+
+async def test_dispatcher_inline() -> None:
+    sender = FakeSender()
+    dispatcher = MailDispatcher(send=sender)
+    assert dispatcher.running is False
+
+    await dispatcher.enqueue(build_mail())
+    assert len(sender.sent) == 1
+    assert dispatcher.sent == 1
+
+
+async def test_dispatcher_background() -> None:
+    sender = FakeSender(delay=0.01)
+    dispatcher = MailDispatcher(send=sender, workers=2)
+    dispatcher.start()
+    dispatcher.start()  # Idempotent
+    assert dispatcher.running is True
+
+    for i in range(5):
+        await dispatcher.enqueue(build_mail(f"Test {i}"))
+    # Enqueue returns before sending.
+    assert len(sender.sent) == 0
+    assert dispatcher.pending > 0
+
+    await dispatcher.join()
+    assert sorted(m.subject for m in sender.sent) == [f"Test {i}" for i in range(5)]
+    assert dispatcher.pending == 0
+
+    await dispatcher.stop()
+    assert dispatcher.running is False
+    await dispatcher.stop()  # Idempotent
+
+
+async def test_dispatcher_batch() -> None:
+    sender = FakeSender(delay=0.01)
+    dispatcher = MailDispatcher(send=sender, workers=1, batch_size=3)
+    dispatcher.start()
+
+    batches: list[int] = []
+    send_batch = dispatcher._send_batch
+
+    async def spy(batch: list[Mail]) -> None:
+        batches.append(len(batch))
+        await send_batch(batch)
+
+    dispatcher._send_batch = spy  # type: ignore[method-assign]
+    for _ in range(7):
+        await dispatcher.enqueue(build_mail())
+    await dispatcher.stop()
+
+    assert batches == [3, 3, 1]
+    assert len(sender.sent) == 7
+    # Mails of a batch are sent concurrently, but no more than the batch size.
+    assert sender.max_sending == 3
+
+
+async def test_dispatcher_retry(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr("miolingo.backends.mails.random.uniform", lambda a, b: b)
+    sender = FakeSender(fail=3)
+    dispatcher = MailDispatcher(send=sender, max_retries=5, retry_delay=1, retry_delay_max=3)
+    monkeypatch.setattr("miolingo.backends.mails.asyncio.sleep", fake_sleep)
+
+    await dispatcher.enqueue(build_mail())
+
+    assert delays == [1, 2, 3]
+    assert len(sender.calls) == 4
+    assert dispatcher.sent == 1
+    assert dispatcher.failed == 0
+
+
+async def test_dispatcher_retry_exhausted(caplog: pytest.LogCaptureFixture) -> None:
+    sender = FakeSender(fail=10)
+    dispatcher = MailDispatcher(send=sender, max_retries=2, retry_delay=0)
+
+    await dispatcher.enqueue(build_mail())
+
+    assert len(sender.calls) == 3
+    assert dispatcher.failed == 1
+    assert "Failed to send mail 'Test' after 3 attempt(s)" in caplog.text
+
+
+async def test_dispatcher_stop_drain() -> None:
+    sender = FakeSender(delay=0.01)
+    dispatcher = MailDispatcher(send=sender, workers=1)
+    dispatcher.start()
+
+    for _ in range(3):
+        await dispatcher.enqueue(build_mail())
+    await dispatcher.stop(timeout=5)
+
+    assert len(sender.sent) == 3
+
+
+async def test_dispatcher_stop_timeout(caplog: pytest.LogCaptureFixture) -> None:
+    sender = FakeSender(delay=1)
+    dispatcher = MailDispatcher(send=sender, workers=1)
+    dispatcher.start()
+
+    for _ in range(3):
+        await dispatcher.enqueue(build_mail())
+    await dispatcher.stop(timeout=0.01)
+
+    assert len(sender.sent) == 0
+    assert dispatcher.running is False
+    assert "Mail dispatcher stopped with 2 pending mail(s) lost" in caplog.text
+
+
+async def test_dispatcher_smtp_sink(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with SMTPSink(fail=1) as sink:
+        fast_mail = build_sink_mailer(sink)
+        monkeypatch.setattr(mail_utils, "fast_mail", fast_mail)
+        dispatcher = MailDispatcher(send=send_mail, batch_size=10, max_retries=1, retry_delay=0)
+        dispatcher.start()
+
+        for i in range(3):
+            await dispatcher.enqueue(build_mail(f"Hello {i}"))
+        await dispatcher.stop(timeout=5)
+        await fast_mail.pool.close()
+
+    assert dispatcher.sent == 3
+    assert sorted(m["Subject"] for m in sink.messages) == ["Hello 0", "Hello 1", "Hello 2"]
+    assert "http://test" in get_payload(sink.messages[0])
+    # The whole batch is sent over the same SMTP session.
+    assert sink.connections == 1
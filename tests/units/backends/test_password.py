@@ -0,0 +1,51 @@
+import pytest
+
+from miolingo.backends.password import ExecutorPasswordHelper, PasswordExecutor, password_helper
+
+
+@pytest.mark.parametrize("pool", ["thread", "process", "none"])
+async def test_password_executor(pool: str) -> None:
+    executor = PasswordExecutor(pool=pool, max_workers=1)  # type: ignore[arg-type]
+
+    hashed_password = await executor.hash("foo")
+    assert password_helper.verify_and_update("foo", hashed_password)[0] is True
+
+    assert (await executor.verify_and_update("foo", hashed_password))[0] is True
+    assert (await executor.verify_and_update("bar", hashed_password))[0] is False
+
+    executor.shutdown()
+    assert executor._executor is None
+
+
+async def test_password_executor_lazy() -> None:
+    executor = PasswordExecutor(pool="thread", max_workers=1)
+    assert executor._executor is None
+
+    await executor.hash("foo")
+    assert executor._executor is not None
+    executor.shutdown()
+
+
+async def test_password_executor_none() -> None:
+    executor = PasswordExecutor(pool="none")
+    assert executor.executor is None
+    executor.shutdown()
+
+
+async def test_executor_password_helper(caplog: pytest.LogCaptureFixture) -> None:
+    executor = PasswordExecutor(pool="none")
+    helper = ExecutorPasswordHelper(executor)
+
+    await helper.prepare_hash("foo")
+    hashed_password = helper.hash("foo")
+    await helper.prepare_verify("foo", hashed_password)
+    assert helper.verify_and_update("foo", hashed_password) == (True, None)
+    assert caplog.records == []
+
+    # Only once.
+    assert helper.verify_and_update("foo", hashed_password) == (True, None)
+    assert helper.hash("foo") != hashed_password
+    assert [r.getMessage() for r in caplog.records] == [
+        "Password verified in the event loop, as it was not prepared",
+        "Password hashed in the event loop, as it was not prepared",
+    ]
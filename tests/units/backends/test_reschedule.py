@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import numpy as np
+import pytest
+
+from miolingo.backends.reschedule import reschedule, reschedule_reviews
+from miolingo.backends.scheduler import MemoryState, SchedulerParameters, schedule
+from miolingo.models.core import Review
+
+from tests.factories.reviews import ReviewFactory
+from tests.factories.translations import TranslationFactory
+from tests.factories.users import UserFactory
+
+
+def test_reschedule() -> None:
+    previous = SchedulerParameters()
+    parameters = SchedulerParameters(min_ease=1500, max_interval=200, interval_modifier=0.5)
+
+    ease, interval = reschedule(
+        np.array([1300, 2500, 2500, 2500, 2500], dtype=np.int32),
+        np.array([10, 1, 6, 15, 1000], dtype=np.int32),
+        np.array([3, 1, 2, 0, 9], dtype=np.int32),
+        previous,
+        parameters,
+    )
+
+    assert ease.tolist() == [1500, 2500, 2500, 2500, 2500]
+    # Learning steps and lapsed cards are not scaled.
+    assert interval.tolist() == [5, 1, 3, 15, 200]
+
+
+def test_reschedule_same_as_schedule() -> None:
+    previous = SchedulerParameters()
+    parameters = SchedulerParameters(interval_modifier=2.0)
+    states = [schedule(MemoryState(ease=2500, interval=i, repetitions=3), 4, previous) for i in range(1, 50)]
+
+    _, interval = reschedule(
+        np.array([s.ease for s in states]),
+        np.array([s.interval for s in states]),
+        np.array([s.repetitions for s in states]),
+        previous,
+        parameters,
+    )
+
+    # Up to rounding, which happens twice.
+    expected = [schedule(MemoryState(ease=2500, interval=i, repetitions=3), 4, parameters) for i in range(1, 50)]
+    assert np.abs(interval - np.array([s.interval for s in expected])).max() <= 1
+
+
+async def test_reschedule_reviews(async_session_db: AsyncSession) -> None:
+    user = await UserFactory.create_async()
+    reviewed_at = datetime.now(timezone.utc) - timedelta(days=1)
+    reviews = []
+    for interval, repetitions in [(10, 3), (20, 4), (1, 1), (30, 5), (40, 6)]:
+        translation = await TranslationFactory.create_async(user_id=user.id)
+        reviews.append(
+            await ReviewFactory.create_async(
+                translation_id=translation.id,
+                user_id=user.id,
+                interval=interval,
+                repetitions=repetitions,
+                reviewed_at=reviewed_at,
+            )
+        )
+    translation = await TranslationFactory.create_async(user_id=user.id)
+    new = await ReviewFactory.create_async(translation_id=translation.id, user_id=user.id)
+
+    count = await reschedule_reviews(
+        SchedulerParameters(),
+        SchedulerParameters(interval_modifier=0.5),
+        batch_size=2,
+    )
+
+    assert count == 4
+    result = await async_session_db.execute(
+        select(Review.translation_id, Review.interval, Review.due_at)
+        .order_by(Review.translation_id)
+        .execution_options(populate_existing=True)
+    )
+    rows = result.all()
+    assert [interval for _, interval, _ in rows] == [5, 10, 1, 15, 20, 0]
+    assert rows[0].due_at == reviews[0].reviewed_at + timedelta(days=5)
+    # Unchanged.
+    assert rows[2].due_at == reviews[2].due_at
+    assert rows[5].due_at == new.due_at
+
+
+async def test_reschedule_reviews_none(async_session_db: AsyncSession) -> None:
+    assert await reschedule_reviews(SchedulerParameters(), SchedulerParameters()) == 0
+
+    user = await UserFactory.create_async()
+    translation = await TranslationFactory.create_async(user_id=user.id)
+    await ReviewFactory.create_async(
+        translation_id=translation.id,
+        user_id=user.id,
+        interval=10,
+        repetitions=3,
+        reviewed_at=datetime.now(timezone.utc),
+    )
+    # Same parameters, nothing to update.
+    assert await reschedule_reviews(SchedulerParameters(), SchedulerParameters()) == 0
@@ -0,0 +1,35 @@
+import pytest
+
+from miolingo.backends.scheduler import MemoryState, SchedulerParameters, schedule
+
+
+def test_schedule_success() -> None:
+    state = MemoryState()
+
+    state = schedule(state, 4)
+    assert state == MemoryState(ease=2500, interval=1, repetitions=1, lapses=0)
+    state = schedule(state, 5)
+    assert state == MemoryState(ease=2600, interval=6, repetitions=2, lapses=0)
+    state = schedule(state, 3)
+    # Interval grows with the ease before this answer.
+    assert state == MemoryState(ease=2460, interval=16, repetitions=3, lapses=0)
+
+
+@pytest.mark.parametrize("grade", [0, 1, 2])
+def test_schedule_failure(grade: int) -> None:
+    state = schedule(MemoryState(ease=2200, interval=30, repetitions=4, lapses=1), grade)
+    # Learnt again from the beginning, ease kept.
+    assert state == MemoryState(ease=2200, interval=1, repetitions=0, lapses=2)
+
+    # Not a lapse until learnt once.
+    assert schedule(state, grade).lapses == 2
+
+
+def test_schedule_parameters() -> None:
+    parameters = SchedulerParameters(min_ease=2000, max_interval=100, interval_modifier=0.5)
+
+    assert schedule(MemoryState(ease=2000, interval=10, repetitions=3), 3, parameters).ease == 2000
+    assert schedule(MemoryState(ease=2000, interval=10, repetitions=3), 5, parameters).interval == 10
+    assert schedule(MemoryState(ease=5000, interval=100, repetitions=3), 5, parameters).interval == 100
+    # Learning steps are not scaled.
+    assert schedule(MemoryState(repetitions=1), 5, parameters).interval == 6
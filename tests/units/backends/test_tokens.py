@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.backends import tokens
+from miolingo.backends.tokens import TokenJanitor, purge_expired_tokens
+from miolingo.models.users import AccessToken
+
+from tests.factories.users import AccessTokenFactory, RefreshTokenFactory, UserFactory
+
+
+async def count_tokens(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count()).select_from(AccessToken))
+
+
+async def create_tokens(expired: int, fresh: int) -> None:
+    created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    for _ in range(expired):
+        await AccessTokenFactory.create_async(created_at=created_at)
+    for _ in range(fresh):
+        await AccessTokenFactory.create_async()
+
+
+async def test_purge_expired_tokens(async_session_db: AsyncSession) -> None:
+    await create_tokens(expired=5, fresh=2)
+
+    assert await purge_expired_tokens(lifetime=3600, batch_size=2) == 5
+    assert await count_tokens(async_session_db) == 2
+
+
+async def test_purge_expired_tokens_none(async_session_db: AsyncSession) -> None:
+    await create_tokens(expired=0, fresh=2)
+
+    assert await purge_expired_tokens(lifetime=3600, batch_size=2) == 0
+    assert await count_tokens(async_session_db) == 2
+
+
+async def test_janitor(async_session_db: AsyncSession, caplog: pytest.LogCaptureFixture) -> None:
+    await create_tokens(expired=3, fresh=1)
+    user = await UserFactory.create_async()
+    await RefreshTokenFactory.create_async(user_id=user.id, created_at=datetime.now(timezone.utc) - timedelta(days=2))
+    janitor = TokenJanitor(interval=0.01, lifetime=3600, refresh_lifetime=86400, batch_size=10)
+
+    with caplog.at_level(logging.INFO, logger="miolingo"):
+        janitor.start()
+        assert janitor.running is True
+        janitor.start()  # Already started, no-op
+
+        while janitor.purged < 4:
+            await asyncio.sleep(0.01)
+        await janitor.stop()
+
+    assert janitor.running is False
+    assert await count_tokens(async_session_db) == 1
+    assert "Purged 4 expired token(s)" in caplog.text
+
+    await janitor.stop()  # Already stopped, no-op
+
+
+async def test_janitor_disabled() -> None:
+    janitor = TokenJanitor(interval=0)
+    janitor.start()
+    assert janitor.running is False
+
+
+async def test_janitor_error(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    calls: list[int] = []
+
+    async def fail(*args: type, **kwargs: int) -> int:
+        calls.append(1)
+        raise ConnectionError("DB down")
+
+    monkeypatch.setattr(tokens, "purge_expired_tokens", fail)
+    janitor = TokenJanitor(interval=0.01)
+
+    janitor.start()
+    while len(calls) < 2:
+        await asyncio.sleep(0.01)
+    await janitor.stop()
+
+    # Failures are logged, then purge is retried on next run.
+    assert "Failed to purge expired tokens" in caplog.text
@@ -0,0 +1,22 @@
+import pytest
+
+from miolingo.commands import purge_tokens
+from miolingo.models.users import AccessToken, RefreshToken
+
+
+def test_main(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    calls: list[tuple] = []
+
+    async def purge_expired_tokens(model: type, **kwargs: int) -> int:
+        calls.append((model, kwargs))
+        return 3
+
+    monkeypatch.setattr(purge_tokens, "purge_expired_tokens", purge_expired_tokens)
+
+    purge_tokens.main(["--lifetime", "60", "--refresh-lifetime", "120", "--batch-size", "10"])
+
+    assert calls == [
+        (AccessToken, {"lifetime": 60, "batch_size": 10}),
+        (RefreshToken, {"lifetime": 120, "batch_size": 10}),
+    ]
+    assert capsys.readouterr().out == "6 expired token(s) purged\n"
@@ -0,0 +1,19 @@
+import pytest
+
+from miolingo.backends.scheduler import SchedulerParameters
+from miolingo.commands import reschedule_reviews
+
+
+def test_main(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    calls: list[tuple] = []
+
+    async def reschedule(previous: SchedulerParameters, **kwargs: int) -> int:
+        calls.append((previous, kwargs))
+        return 3
+
+    monkeypatch.setattr(reschedule_reviews, "reschedule_reviews", reschedule)
+
+    reschedule_reviews.main(["--previous-interval-modifier", "0.8", "--batch-size", "10"])
+
+    assert calls == [(SchedulerParameters(interval_modifier=0.8), {"batch_size": 10})]
+    assert capsys.readouterr().out == "3 review(s) rescheduled\n"
@@ -0,0 +1,25 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from miolingo.db.instrumentation import QueryStats, query_stats
+
+
+async def test_query_stats(async_session_db: AsyncSession) -> None:
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        for _ in range(3):
+            await async_session_db.execute(text("SELECT 1"))
+        await async_session_db.execute(text("SELECT 2"))
+    finally:
+        query_stats.reset(token)
+    # Out of requests.
+    await async_session_db.execute(text("SELECT 1"))
+
+    # Along with the savepoints of the test transaction.
+    assert stats.statements["SELECT 1"] == 3
+    assert stats.statements["SELECT 2"] == 1
+    assert stats.count == sum(stats.statements.values())
+    assert stats.time > 0
+    assert stats.repeated(3) == [("SELECT 1", 3)]
+    assert stats.repeated(4) == []
@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import pytest
+
+from miolingo.db.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+from miolingo.models.core import Translation
+from miolingo.models.users import User
+
+from tests.factories.users import UserFactory
+
+
+def test_cursor() -> None:
+    user_id = uuid.uuid4()
+    created_at = datetime.now(timezone.utc)
+    columns = (User.email, Translation.created_at, Translation.user_id, Translation.id)
+
+    cursor = encode_cursor(["foo@miolingo.com", created_at, user_id, 12])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, columns) == ["foo@miolingo.com", created_at, user_id, 12]
+
+
+def test_cursor_untyped() -> None:
+    cursor = encode_cursor(["foo"])
+    assert decode_cursor(cursor, [column("foo")]) == ["foo"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "!!",
+        encode_cursor(["foo"])[:-2],
+        encode_cursor([12, 12]),
+        encode_cursor(["foo", "bar"]),
+        encode_cursor(["foo", 12, 13]),
+        "eyJmb28iOiAxfQ",  # {"foo": 1}
+    ],
+)
+def test_cursor_invalid(cursor: str) -> None:
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, (Translation.user_id, Translation.id))
+
+
+async def test_estimate_count_table(async_session_db: AsyncSession) -> None:
+    await UserFactory.create_batch_async(size=3)
+    await async_session_db.execute(text('ANALYZE "user"'))
+
+    assert await estimate_count(async_session_db, select(User)) == 3
+
+
+async def test_estimate_count_filtered(async_session_db: AsyncSession) -> None:
+    user = await UserFactory.create_async()
+    await async_session_db.execute(text('ANALYZE "user"'))
+
+    assert await estimate_count(async_session_db, select(User).where(User.email == user.email)) == 1
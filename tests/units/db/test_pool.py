@@ -0,0 +1,98 @@
+import asyncio
+import logging
+
+from sqlalchemy import exc, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import pytest
+
+from miolingo import settings
+from miolingo.db.pool import InstrumentedAsyncAdaptedQueuePool, get_pool_status, warm_up_pool
+
+
+@pytest.fixture
+async def instrumented_engine(test_db_name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url=make_url(str(settings.POSTGRES_URI)).set(database=test_db_name),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+async def test_pool_status(instrumented_engine: AsyncEngine) -> None:
+    status = get_pool_status(instrumented_engine)
+    assert status == {
+        "pool": "InstrumentedAsyncAdaptedQueuePool",
+        "size": 1,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": -1,
+        "checkouts": 0,
+        "timeouts": 0,
+        "wait_time": 0.0,
+        "wait_time_max": 0.0,
+    }
+
+    async with instrumented_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        status = get_pool_status(instrumented_engine)
+        assert status["checked_out"] == 1
+        assert status["overflow"] == 0
+        assert status["checkouts"] == 1
+        assert status["wait_time"] > 0
+
+    status = get_pool_status(instrumented_engine)
+    assert status["checked_in"] == 1
+    assert status["checked_out"] == 0
+
+
+async def test_pool_timeout(instrumented_engine: AsyncEngine, caplog: pytest.LogCaptureFixture, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_WAIT_WARNING", 0.05)
+
+    async with instrumented_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with instrumented_engine.connect():
+                pass  # pragma: no cover
+
+    status = get_pool_status(instrumented_engine)
+    assert status["timeouts"] == 1
+    assert status["wait_time_max"] >= 0.1
+    assert "Waited" in caplog.text
+    assert caplog.records[-1].levelno == logging.WARNING
+
+
+async def test_pool_wait(instrumented_engine: AsyncEngine) -> None:
+    async def query() -> None:
+        async with instrumented_engine.connect() as conn:
+            await conn.execute(text("SELECT pg_sleep(0.02)"))
+
+    # Second one waits for the first one to release the single connection.
+    await asyncio.gather(query(), query())
+    assert get_pool_status(instrumented_engine)["wait_time_max"] >= 0.02
+
+
+async def test_pool_status_null_pool() -> None:
+    engine = create_async_engine(url=str(settings.POSTGRES_URI), poolclass=NullPool)
+    assert get_pool_status(engine) == {"pool": "NullPool"}
+
+
+async def test_warm_up_pool(instrumented_engine: AsyncEngine) -> None:
+    # No more than the pool size.
+    await warm_up_pool(instrumented_engine, 3)
+
+    status = get_pool_status(instrumented_engine)
+    assert status["checked_in"] == 1
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 1
+
+
+async def test_warm_up_pool_error(caplog: pytest.LogCaptureFixture) -> None:
+    engine = create_async_engine(url=make_url(str(settings.POSTGRES_URI)).set(database="missing"), poolclass=NullPool)
+
+    await warm_up_pool(engine, 1)
+    assert caplog.records[-1].getMessage() == "Failed to warm up the DB pool"
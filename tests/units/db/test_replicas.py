@@ -0,0 +1,55 @@
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+import pytest
+
+from miolingo import settings
+from miolingo.db.replicas import ReplicaRouter
+from miolingo.db.session import async_session_factory
+from miolingo.deps import db as deps_db
+
+
+@pytest.fixture
+async def replica_engines(test_db_name: str) -> list[AsyncEngine]:
+    url = make_url(str(settings.POSTGRES_URI)).set(database=test_db_name)
+    engines = [create_async_engine(url=url) for _ in range(2)]
+    yield engines
+    for engine in engines:
+        await engine.dispose()
+
+
+def test_router_without_replicas() -> None:
+    assert ReplicaRouter([]).get_engine() is None
+
+
+def test_router_round_robin(replica_engines: list[AsyncEngine]) -> None:
+    router = ReplicaRouter(replica_engines)
+    assert [router.get_engine() for _ in range(4)] == replica_engines * 2
+
+
+async def test_router_least_connections(replica_engines: list[AsyncEngine]) -> None:
+    router = ReplicaRouter(replica_engines, selection="least_connections")
+    assert router.get_engine() is replica_engines[0]
+
+    async with replica_engines[0].connect():
+        assert router.get_engine() is replica_engines[1]
+        assert router.get_engine() is replica_engines[1]
+
+    assert router.get_engine() is replica_engines[0]
+
+
+async def test_read_session_primary() -> None:
+    async for session in deps_db.get_async_read_session():
+        assert session.bind is async_session_factory.kw["bind"]
+
+
+async def test_read_session_replica(replica_engines: list[AsyncEngine], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(deps_db, "replica_router", ReplicaRouter(replica_engines))
+
+    binds = []
+    for _ in range(2):
+        async for session in deps_db.get_async_read_session():
+            binds.append(session.bind)
+            assert (await session.scalar(text("SELECT 1"))) == 1
+
+    assert binds == replica_engines
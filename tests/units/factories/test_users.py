@@ -64,7 +64,7 @@ async def test_user_factory_default_password() -> None:
     user = await UserFactory.create_async()
     assert user.id is not None
 
-    assert UserManager(user).check_password(user, "test") is True
+    assert await UserManager(user).check_password(user, "test") is True
 
 
 async def test_user_factory_refresh(async_session_db: AsyncSession) -> None:
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(module: str) -> set[str]:
+    # In a fresh interpreter, nothing being imported yet.
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(*sys.modules, sep='\\n')"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "module, unwanted",
+    [
+        # Settings are only loaded on first access.
+        ("miolingo", ["fastapi", "fastapi_mail", "sqlalchemy", "pydantic", "miolingo.conf.settings"]),
+        # Alembic.
+        ("miolingo.db.base", ["fastapi_mail", "miolingo.main", "miolingo.utils.mails"]),
+        ("miolingo.commands.purge_tokens", ["fastapi_mail", "miolingo.main", "miolingo.utils.mails"]),
+        ("miolingo.commands.reschedule_reviews", ["fastapi_mail", "miolingo.main", "miolingo.utils.mails"]),
+        # Mails are only set up by the lifespan.
+        ("miolingo.main", ["fastapi_mail", "miolingo.utils.mails"]),
+    ],
+)
+def test_lazy_imports(module: str, unwanted: list[str]) -> None:
+    modules = imported_modules(module)
+    assert module in modules
+    assert modules.isdisjoint(unwanted)
@@ -1,14 +1,14 @@
 from email.message import Message
 
-from fastapi_mail import FastMail
+import pytest
 
 from miolingo.conf.settings import BASE_DIR, Settings
 from miolingo.utils import mails as mail_utils
-from miolingo.utils.mails import send_mail_with_template
+from miolingo.utils.mails import PooledFastMail, send_mail_with_template
 from tests.utils.mails import get_payload
 
 test_settings = Settings(MAIL_TEMPLATE_FOLDER=BASE_DIR / "tests" / "units" / "templates" / "mails")
-fast_mail = FastMail(test_settings.SMTP_CONFIG)
+fast_mail = PooledFastMail(test_settings.SMTP_CONFIG)
 
 
 async def test_mail_alternative_none(monkeypatch):
@@ -49,3 +49,44 @@ async def test_mail_alternative(monkeypatch):
     assert msg["Subject"] == "Test"
     assert "Test alt for foo" in get_payload(msg)
     assert "Test alt for foo" == get_payload(msg, "text/plain")
+
+
+async def test_mail_alternative_fresh_registry(monkeypatch):
+    # Templates not loaded yet (i.e: no lifespan), the first mail still has its alternative.
+    fresh_mail = PooledFastMail(test_settings.SMTP_CONFIG)
+    assert fresh_mail.templates is not None
+    assert len(fresh_mail.templates) == 0
+    monkeypatch.setattr(mail_utils, "fast_mail", fresh_mail)
+
+    with fresh_mail.record_messages() as outbox:
+        await send_mail_with_template(
+            subject="Test",
+            recipients=["test@example.com"],
+            template_name="dummy_alt.html",
+            template_body={
+                "name": "foo",
+            },
+        )
+
+    assert "Test alt for foo" == get_payload(outbox[0], "text/plain")
+
+
+async def test_mail_metrics(monkeypatch):
+    monkeypatch.setattr(mail_utils, "fast_mail", fast_mail)
+    failures = mail_utils.mail_send_failures.values.get(("dummy.html",), 0)
+    count = sum(mail_utils.mail_send_duration.values.get(("dummy.html",), [0])[:-1])
+
+    async def send_message(*args, **kwargs):
+        raise ConnectionError()
+
+    monkeypatch.setattr(fast_mail, "send_message", send_message)
+    with pytest.raises(ConnectionError):
+        await send_mail_with_template(
+            subject="Test",
+            recipients=["test@example.com"],
+            template_name="dummy.html",
+            template_body={"name": "foo"},
+        )
+
+    assert mail_utils.mail_send_failures.values[("dummy.html",)] == failures + 1
+    assert sum(mail_utils.mail_send_duration.values[("dummy.html",)][:-1]) == count + 1
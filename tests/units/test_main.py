@@ -0,0 +1,22 @@
+from miolingo.backends.mails import mail_dispatcher
+from miolingo.backends.password import password_executor
+from miolingo.backends.tokens import token_janitor
+from miolingo.db.session import async_engine
+from miolingo.main import app, lifespan
+
+
+async def test_lifespan() -> None:
+    async with lifespan(app):
+        assert mail_dispatcher.running is True
+        assert token_janitor.running is True
+        # Warmed up.
+        assert async_engine.pool.checkedin() >= 1  # type: ignore[attr-defined]
+
+        await password_executor.hash("foo")
+        assert password_executor._executor is not None
+
+    assert mail_dispatcher.running is False
+    assert token_janitor.running is False
+    assert password_executor._executor is None
+    # Disposed.
+    assert async_engine.pool.checkedin() == 0  # type: ignore[attr-defined]
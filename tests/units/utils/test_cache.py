@@ -0,0 +1,82 @@
+from miolingo.utils.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_miss() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+
+    assert cache.get("foo") is None
+    cache.set("foo", 1)
+    assert cache.get("foo") == 1
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.stats == {"size": 1, "maxsize": 2, "hits": 1, "misses": 1}
+
+
+def test_cache_lru() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("foo", 1)
+    cache.set("bar", 2)
+
+    # Touch foo to make bar the least recently used.
+    assert cache.get("foo") == 1
+    cache.set("baz", 3)
+
+    assert "bar" not in cache
+    assert "foo" in cache
+    assert "baz" in cache
+    assert len(cache) == 2
+
+
+def test_cache_ttl() -> None:
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60, timer=timer)
+
+    cache.set("foo", 1)
+    cache.set("bar", 2, ttl=10)
+    cache.set("baz", 3, ttl=120)  # Capped by the cache TTL
+
+    timer.now = 30
+    assert cache.get("foo") == 1
+    assert cache.get("bar") is None
+    assert cache.get("baz") == 3
+
+    timer.now = 60
+    assert cache.get("foo") is None
+    assert cache.get("baz") is None
+    assert len(cache) == 0
+
+
+def test_cache_ttl_expired() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10)
+    cache.set("foo", 1, ttl=-1)
+    assert "foo" not in cache
+
+
+def test_cache_disabled() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=0)
+    cache.set("foo", 1)
+    assert cache.get("foo") is None
+
+
+def test_cache_pop_clear() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10)
+    cache.set("foo", 1)
+    cache.set("bar", 2)
+    cache.get("foo")
+
+    assert cache.pop("foo") == 1
+    assert cache.pop("foo") is None
+    assert list(cache) == [("bar", 2)]
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
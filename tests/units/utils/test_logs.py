@@ -0,0 +1,91 @@
+import io
+import json
+import logging
+
+import pytest
+
+from miolingo import settings
+from miolingo.conf.loggers import LOGGER_MIOLINGO, configure_loggers
+from miolingo.utils.logs import JSONFormatter, QueueHandler, collect_dropped_records, dropped_records
+
+
+def make_record(msg: str, *args: object, level: int = logging.INFO, **extra: object) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {"name": "test", "levelno": level, "levelname": logging.getLevelName(level), "msg": msg, "args": args, **extra}
+    )
+
+
+def test_json_formatter() -> None:
+    try:
+        raise ValueError("boom")
+    except ValueError as exc:
+        record = make_record("Hello %s", "world", exc_info=(type(exc), exc, exc.__traceback__), user_id=1)
+    record.stack_info = "Stack (most recent call last):"
+
+    data = json.loads(JSONFormatter().format(record))
+
+    assert data["level"] == "INFO"
+    assert data["logger"] == "test"
+    assert data["message"] == "Hello world"
+    assert data["user_id"] == 1
+    assert data["time"].endswith("+00:00")
+    assert data["exception"].endswith("ValueError: boom")
+    assert data["stack"] == "Stack (most recent call last):"
+
+
+def test_queue_handler() -> None:
+    stream = io.StringIO()
+    handler = QueueHandler(stream=stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    args = ["a"]
+
+    handler.handle(make_record("Got %s", args))
+    # Arguments are merged when logged, not when written.
+    args.append("b")
+    handler.close()
+
+    assert stream.getvalue() == "INFO Got ['a']\n"
+
+
+def test_queue_handler_full() -> None:
+    stream = io.StringIO()
+    handler = QueueHandler(maxsize=2, stream=stream)
+    # Nothing written meanwhile.
+    handler.listener.stop()
+    dropped = QueueHandler.total_dropped()
+
+    for i in range(3):
+        handler.handle(make_record(f"info {i}"))
+    assert handler.dropped == 1
+    # Errors take the place of the oldest record instead.
+    handler.handle(make_record("error", level=logging.ERROR))
+    assert handler.dropped == 2
+    collect_dropped_records()
+    assert dropped_records.values[()] == dropped + 2
+
+    handler.listener.start()
+    handler.close()
+    assert stream.getvalue() == "info 1\nerror\n"
+    # Still counted once closed, but only once.
+    handler.close()
+    collect_dropped_records()
+    assert dropped_records.values[()] == dropped + 2
+
+
+@pytest.mark.parametrize("handlers", [["queue"], ["queue_json"]])
+def test_configure_loggers(handlers: list[str], capsys: pytest.CaptureFixture) -> None:
+    try:
+        configure_loggers(handlers=handlers, level=logging.INFO, queue_size=5)
+        [handler] = logging.getLogger(LOGGER_MIOLINGO).handlers
+        assert isinstance(handler, QueueHandler)
+        assert handler.queue.maxsize == 5
+
+        logging.getLogger(LOGGER_MIOLINGO).info("Hello %s", "world")
+    finally:
+        # Closing the handler writes pending records.
+        configure_loggers(handlers=settings.LOG_HANDLERS, level=settings.LOG_LEVEL, propagate=True)
+
+    output = capsys.readouterr().out
+    assert "Hello world" in output
+    if handlers == ["queue_json"]:
+        assert json.loads(output)["message"] == "Hello world"
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from miolingo.utils.metrics import ARCHIVE_FILENAME, MetricsFlusher, MetricsRegistry
+
+
+class Metrics:
+    def __init__(self, directory: Path | None = None, stale_after: float = 60.0) -> None:
+        self.registry = MetricsRegistry(directory=directory, stale_after=stale_after)
+        self.requests = self.registry.counter("test_requests_total", "Requests.", ["path"])
+        self.connections = self.registry.gauge("test_connections", "Connections.")
+        self.duration = self.registry.histogram("test_duration_seconds", "Duration.", buckets=[0.1, 1.0])
+
+
+def test_render() -> None:
+    metrics = Metrics()
+    metrics.requests.inc("/a")
+    metrics.requests.inc("/a", amount=2)
+    metrics.requests.inc('/"b"\\')
+    metrics.connections.set(1.5)
+    for value in (0.05, 0.1, 0.5, 2.0):
+        metrics.duration.observe(value)
+
+    assert metrics.registry.render() == (
+        "# HELP test_requests_total Requests.\n"
+        "# TYPE test_requests_total counter\n"
+        'test_requests_total{path="/\\"b\\"\\\\"} 1\n'
+        'test_requests_total{path="/a"} 3\n'
+        "# HELP test_connections Connections.\n"
+        "# TYPE test_connections gauge\n"
+        "test_connections 1.5\n"
+        "# HELP test_duration_seconds Duration.\n"
+        "# TYPE test_duration_seconds histogram\n"
+        'test_duration_seconds_bucket{le="0.1"} 2\n'
+        'test_duration_seconds_bucket{le="1.0"} 3\n'
+        'test_duration_seconds_bucket{le="+Inf"} 4\n'
+        "test_duration_seconds_sum 2.65\n"
+        "test_duration_seconds_count 4\n"
+    )
+
+
+def test_register_twice() -> None:
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        metrics.registry.counter("test_requests_total", "Again.")
+
+
+def test_collector(caplog: pytest.LogCaptureFixture) -> None:
+    metrics = Metrics()
+
+    def failing() -> None:
+        raise RuntimeError()
+
+    metrics.registry.add_collector(failing)
+    metrics.registry.add_collector(lambda: metrics.connections.set(3))
+
+    assert "test_connections 3\n" in metrics.registry.render()
+    assert caplog.records[0].getMessage() == "Failed to collect metrics"
+
+
+def test_multiprocess(tmp_path: Path) -> None:
+    # Metrics of two workers, sharing the directory.
+    metrics, other = Metrics(tmp_path, stale_after=10), Metrics(tmp_path)
+    metrics.requests.inc("/a")
+    metrics.connections.set(1)
+    metrics.duration.observe(0.5)
+    other.requests.inc("/a", amount=2)
+    other.requests.inc("/b")
+    other.connections.set(2)
+    other.duration.observe(2.0)
+    other.registry.dump()
+    # Its own dump is not added up to its live values.
+    metrics.registry.dump()
+
+    values = metrics.registry.aggregate()
+    assert values["test_requests_total"] == {("/a",): 3, ("/b",): 1}
+    assert values["test_connections"] == {(): 3}
+    assert values["test_duration_seconds"] == {(): [0, 1, 1, 2.5]}
+    # Live values are left untouched.
+    assert metrics.duration.values == {(): [0, 1, 0, 0.5]}
+
+    # Gauges of a worker which did not dump for a while (i.e: dead) are ignored.
+    path = tmp_path / other.registry.filename
+    snapshot = json.loads(path.read_text())
+    path.write_text(json.dumps({**snapshot, "time": snapshot["time"] - 60}))
+
+    values = metrics.registry.aggregate()
+    assert values["test_requests_total"] == {("/a",): 3, ("/b",): 1}
+    assert values["test_connections"] == {(): 1}
+
+
+def test_retire(tmp_path: Path) -> None:
+    metrics, first, second = Metrics(tmp_path), Metrics(tmp_path), Metrics(tmp_path)
+    first.requests.inc("/a")
+    first.connections.set(1)
+    first.duration.observe(0.5)
+    second.requests.inc("/a", amount=2)
+    second.duration.observe(2.0)
+    first.registry.dump()
+
+    # Counters and histograms are added up in the archive, not gauges.
+    first.registry.retire()
+    second.registry.retire()
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == [ARCHIVE_FILENAME]
+    archive = json.loads((tmp_path / ARCHIVE_FILENAME).read_text())
+    assert archive["metrics"] == {
+        "test_requests_total": [[["/a"], 3.0]],
+        "test_duration_seconds": [[[], [0, 1, 1, 2.5]]],
+    }
+
+    values = metrics.registry.aggregate()
+    assert values["test_requests_total"] == {("/a",): 3}
+    assert values["test_connections"] == {}
+
+
+def test_archive_dead(tmp_path: Path) -> None:
+    metrics, other = Metrics(tmp_path, stale_after=10), Metrics(tmp_path)
+    other.requests.inc("/a")
+    other.registry.dump()
+    metrics.registry.dump()
+    snapshot = json.loads((tmp_path / other.registry.filename).read_text())
+    # Stale, but not named after a PID, of a running PID, or of a PID not running anymore.
+    running = f"{os.getpid()}-00000000.json"
+    for filename in ["stray.json", running, "999999999-00000000.json"]:
+        (tmp_path / filename).write_text(json.dumps({**snapshot, "time": snapshot["time"] - 60}))
+
+    metrics.registry.archive_dead()
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == sorted(
+        [ARCHIVE_FILENAME, metrics.registry.filename, other.registry.filename, "stray.json", running]
+    )
+    assert metrics.registry.aggregate()["test_requests_total"] == {("/a",): 4}
+
+    # Nothing to archive anymore.
+    metrics.registry.archive_dead()
+    assert metrics.registry.aggregate()["test_requests_total"] == {("/a",): 4}
+
+
+async def test_flusher(tmp_path: Path) -> None:
+    metrics = Metrics(tmp_path)
+    flusher = MetricsFlusher(metrics.registry, interval=60)
+    path = tmp_path / metrics.registry.filename
+
+    flusher.start()
+    assert flusher.running is True
+    await asyncio.sleep(0)
+    assert path.exists()
+
+    metrics.requests.inc("/a")
+    await flusher.stop()
+    assert flusher.running is False
+    # Last values archived on stop.
+    assert not path.exists()
+    archive = json.loads((tmp_path / ARCHIVE_FILENAME).read_text())
+    assert archive["metrics"]["test_requests_total"] == [[["/a"], 1.0]]
+
+
+async def test_flusher_single_process() -> None:
+    metrics = Metrics()
+    flusher = MetricsFlusher(metrics.registry)
+
+    flusher.start()
+    assert flusher.running is False
+    await flusher.stop()
+    metrics.registry.dump()
+    metrics.registry.retire()
+    metrics.registry.archive_dead()
+    assert metrics.registry.load() == []
+
+
+async def test_flusher_error(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    flusher = MetricsFlusher(Metrics(tmp_path / "missing").registry, interval=60)
+
+    with caplog.at_level(logging.ERROR):
+        flusher.start()
+        await asyncio.sleep(0)
+    flusher._task.cancel()  # type: ignore[union-attr]
+
+    assert caplog.records[0].getMessage() == "Failed to dump metrics"
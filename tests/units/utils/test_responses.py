@@ -0,0 +1,60 @@
+import sys
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+import pytest
+
+from miolingo.schemas.pagination import Page
+from miolingo.schemas.translations import TranslationMatch
+from miolingo.schemas.users import UserRead
+from miolingo.utils.responses import ModelResponse, get_json_response_class
+
+
+def make_page() -> Page[UserRead]:
+    return Page[UserRead](
+        items=[
+            UserRead(id=uuid.uuid4(), email="jane.doe@miolingo.com", first_name="Jane", last_name="Doe"),
+            UserRead(id=uuid.uuid4(), email="zoe@miolingo.com", first_name="Zoé", last_name='"Ü\\\n'),
+        ],
+        next_cursor="abc",
+    )
+
+
+def test_model_response() -> None:
+    page = make_page()
+    # As FastAPI serializes the response model, then encodes it.
+    expected = JSONResponse(TypeAdapter(Page[UserRead]).dump_python(page, mode="json")).body
+
+    response = ModelResponse(page, headers={"ETag": 'W/"abc"'})
+
+    assert response.body == expected
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+def test_model_response_list() -> None:
+    items = [TranslationMatch(id=1, lang="fr", text="chat", priority=0, similarity=0.1 + 0.2)]
+
+    assert ModelResponse(items).body == JSONResponse(jsonable_encoder(items)).body
+
+
+@pytest.mark.parametrize(
+    "encoder, expected",
+    [
+        ("json", JSONResponse),
+        ("orjson", ORJSONResponse),
+    ],
+)
+def test_get_json_response_class(encoder: str, expected: type[JSONResponse]) -> None:
+    assert get_json_response_class(encoder) is expected
+
+
+def test_get_json_response_class_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Not installed.
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    with pytest.raises(RuntimeError):
+        get_json_response_class("orjson")
@@ -0,0 +1,207 @@
+from email.message import EmailMessage
+
+from fastapi_mail.errors import ConnectionErrors
+
+import aiosmtplib
+import pytest
+
+from miolingo.conf.settings import Settings
+from miolingo.utils import mails as mail_utils
+from miolingo.utils.smtp import PooledConnection, SMTPConnectionPool
+
+from tests.utils.mails import get_payload
+from tests.utils.smtp import SMTPSink, build_sink_mailer
+
+
+def build_message(subject: str = "Test") -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@miolingo.com"
+    message["To"] = "test@example.com"
+    message["Subject"] = subject
+    message.set_content("Hello")
+    return message
+
+
+def build_pool(sink: SMTPSink, **kwargs) -> SMTPConnectionPool:
+    return build_sink_mailer(sink, **kwargs).pool
+
+
+async def test_pool_reuse() -> None:
+    async with SMTPSink() as sink:
+        pool = build_pool(sink)
+        for i in range(3):
+            await pool.send_message(build_message(f"Test {i}"))
+        await pool.close()
+
+    assert [m["Subject"] for m in sink.messages] == ["Test 0", "Test 1", "Test 2"]
+    assert sink.connections == 1
+    assert pool.connects == 1
+    # Only authenticated once.
+    assert sink.commands.count(b"AUTH") == 1
+    assert sink.commands[-1] == b"QUIT"
+
+
+async def test_pool_max_messages() -> None:
+    async with SMTPSink() as sink:
+        pool = build_pool(sink, max_messages=2)
+        for _ in range(5):
+            await pool.send_message(build_message())
+        await pool.close()
+
+    assert len(sink.messages) == 5
+    assert sink.connections == 3
+
+
+async def test_pool_keepalive() -> None:
+    async with SMTPSink() as sink:
+        pool = build_pool(sink, keepalive=0)
+        for _ in range(2):
+            await pool.send_message(build_message())
+        await pool.close()
+
+    assert sink.commands.count(b"NOOP") == 1
+    assert sink.connections == 1
+
+
+async def test_pool_max_idle() -> None:
+    async with SMTPSink() as sink:
+        pool = build_pool(sink, max_idle=0)
+        for _ in range(2):
+            await pool.send_message(build_message())
+        await pool.close()
+
+    assert sink.connections == 2
+
+
+async def test_pool_noop_failed(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def noop(*args, **kwargs):
+        raise aiosmtplib.SMTPServerDisconnected("gone")
+
+    async with SMTPSink() as sink:
+        pool = build_pool(sink, keepalive=0)
+        await pool.send_message(build_message())
+        monkeypatch.setattr(pool._idle[0].smtp, "noop", noop)
+        await pool.send_message(build_message())
+        await pool.close()
+
+    assert len(sink.messages) == 2
+    assert sink.connections == 2
+
+
+async def test_pool_closed_connection() -> None:
+    async with SMTPSink() as sink:
+        pool = build_pool(sink)
+        await pool.send_message(build_message())
+        pool._idle[0].smtp.close()
+        await pool.send_message(build_message())
+        await pool.close()
+
+    assert len(sink.messages) == 2
+    assert sink.connections == 2
+
+
+async def test_pool_reconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def is_healthy(conn: PooledConnection) -> bool:
+        return True
+
+    async with SMTPSink(drop=True) as sink:
+        pool = build_pool(sink)
+        # Pretend the session dropped by the server is still alive.
+        monkeypatch.setattr(pool, "_is_healthy", is_healthy)
+        for _ in range(3):
+            await pool.send_message(build_message())
+        await pool.close()
+
+    assert len(sink.messages) == 3
+    assert sink.connections == 3
+
+
+async def test_pool_disconnected_new_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def send_message(*args, **kwargs):
+        raise aiosmtplib.SMTPServerDisconnected("gone")
+
+    monkeypatch.setattr(aiosmtplib.SMTP, "send_message", send_message)
+    async with SMTPSink() as sink:
+        pool = build_pool(sink)
+        with pytest.raises(aiosmtplib.SMTPServerDisconnected):
+            await pool.send_message(build_message())
+
+    assert pool._idle == []
+
+
+async def test_pool_reconnect_failed(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+    send_message = aiosmtplib.SMTP.send_message
+
+    async def flaky_send_message(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) > 1:
+            raise aiosmtplib.SMTPServerDisconnected("gone")
+        return await send_message(self, *args, **kwargs)
+
+    monkeypatch.setattr(aiosmtplib.SMTP, "send_message", flaky_send_message)
+    async with SMTPSink() as sink:
+        pool = build_pool(sink)
+        await pool.send_message(build_message())
+        with pytest.raises(aiosmtplib.SMTPServerDisconnected):
+            await pool.send_message(build_message())
+
+    assert len(calls) == 3
+    assert pool._idle == []
+
+
+async def test_pool_rejected() -> None:
+    async with SMTPSink(fail=1) as sink:
+        pool = build_pool(sink)
+        with pytest.raises(aiosmtplib.SMTPDataError):
+            await pool.send_message(build_message())
+        await pool.send_message(build_message())
+        await pool.close()
+
+    # The session is kept after a rejected message.
+    assert len(sink.messages) == 1
+    assert sink.connections == 1
+
+
+async def test_pool_unexpected_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def send_message(*args, **kwargs):
+        raise aiosmtplib.SMTPReadTimeoutError("timeout")
+
+    async with SMTPSink() as sink:
+        pool = build_pool(sink)
+        monkeypatch.setattr(aiosmtplib.SMTP, "send_message", send_message)
+        with pytest.raises(aiosmtplib.SMTPReadTimeoutError):
+            await pool.send_message(build_message())
+
+    assert pool._idle == []
+
+
+async def test_pool_connect_error() -> None:
+    async with SMTPSink() as sink:
+        port = sink.port
+    test_settings = Settings(MAIL_SERVER="127.0.0.1", MAIL_PORT=port, MAIL_STARTTLS=False, MAIL_SUPPRESS_SEND=0)
+    pool = SMTPConnectionPool(test_settings.SMTP_CONFIG)
+
+    with pytest.raises(ConnectionErrors):
+        await pool.send_message(build_message())
+
+
+async def test_pooled_fast_mail(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with SMTPSink() as sink:
+        fast_mail = build_sink_mailer(sink)
+        monkeypatch.setattr(mail_utils, "fast_mail", fast_mail)
+
+        with fast_mail.record_messages() as outbox:
+            for _ in range(2):
+                await mail_utils.send_mail_with_template(
+                    subject="Test",
+                    recipients=["test@example.com"],
+                    template_name="users/request_verify.html",
+                    template_body={"fullname": "foo", "verify_link": "http://test"},
+                )
+        await fast_mail.pool.close()
+
+    assert len(outbox) == 2
+    assert len(sink.messages) == 2
+    assert "http://test" in get_payload(sink.messages[0])
+    assert sink.connections == 1
@@ -0,0 +1,47 @@
+import csv
+from typing import AsyncIterator
+
+import pytest
+
+from miolingo.utils.streams import read_csv
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1024])
+async def test_read_csv(size: int) -> None:
+    data = '﻿chat,cat\n\n"multi\nline",x\r\nmot,"""quoted"""\nlast'.encode()
+
+    rows = [row async for row in read_csv(chunked(data, size))]
+
+    assert rows == [
+        (1, ["chat", "cat"]),
+        (3, ["multi\nline", "x"]),
+        (5, ["mot", '"quoted"']),
+        (6, ["last"]),
+    ]
+
+
+async def test_read_csv_delimiter() -> None:
+    rows = [row async for row in read_csv(chunked(b"a,b\tc\n", 2), delimiter="\t")]
+    assert rows == [(1, ["a,b", "c"])]
+
+
+async def test_read_csv_bad_encoding() -> None:
+    with pytest.raises(UnicodeDecodeError):
+        [row async for row in read_csv(chunked("crème".encode("latin-1"), 2))]
+
+
+async def test_read_csv_too_large() -> None:
+    limit = csv.field_size_limit(10)
+    try:
+        # Both a too long line and an unclosed quoted field spanning lines.
+        with pytest.raises(csv.Error):
+            [row async for row in read_csv(chunked(b"a" * 20, 4))]
+        with pytest.raises(csv.Error):
+            [row async for row in read_csv(chunked(b'"' + b"a\n" * 10, 4))]
+    finally:
+        csv.field_size_limit(limit)
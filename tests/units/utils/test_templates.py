@@ -0,0 +1,85 @@
+import os
+import shutil
+from pathlib import Path
+
+from jinja2 import TemplateNotFound
+
+import pytest
+
+from miolingo.conf.settings import BASE_DIR
+from miolingo.utils.templates import MailTemplateRegistry
+
+TEMPLATE_FOLDER: Path = BASE_DIR / "tests" / "units" / "templates" / "mails"
+
+
+@pytest.fixture
+def template_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "mails"
+    shutil.copytree(TEMPLATE_FOLDER, folder)
+    return folder
+
+
+def test_registry_load() -> None:
+    registry = MailTemplateRegistry(TEMPLATE_FOLDER)
+    assert len(registry) == 0
+
+    registry.load()
+    # Including the missing dummy.txt alternative.
+    assert len(registry) == 4
+    assert registry.get("dummy.html").render(name="foo")
+
+
+def test_registry_get_not_found() -> None:
+    registry = MailTemplateRegistry(TEMPLATE_FOLDER)
+    with pytest.raises(TemplateNotFound):
+        registry.get("foo.html")
+
+
+def test_registry_alternative() -> None:
+    registry = MailTemplateRegistry(TEMPLATE_FOLDER)
+    registry.load()
+
+    template = registry.get_alternative("dummy_alt.html")
+    assert template is not None
+    assert template.render(name="foo") == "Test alt for foo"
+
+    assert registry.get_alternative("dummy.html") is None
+    # Missing alternative is cached too.
+    assert "dummy.txt" in registry._templates
+
+
+def test_registry_cached(template_folder: Path) -> None:
+    registry = MailTemplateRegistry(template_folder)
+    registry.load()
+    (template_folder / "dummy.html").unlink()
+    (template_folder / "dummy.txt").write_text("New alt for {{ name }}")
+
+    # Never looked up again on disk.
+    assert registry.get("dummy.html") is not None
+    assert registry.get_alternative("dummy.html") is None
+
+
+def test_registry_auto_reload(template_folder: Path) -> None:
+    registry = MailTemplateRegistry(template_folder, auto_reload=True)
+    registry.load()
+    assert registry.get_alternative("dummy.html") is None
+
+    path = template_folder / "dummy.txt"
+    path.write_text("New alt for {{ name }}")
+    assert registry.get_alternative("dummy.html").render(name="foo") == "New alt for foo"
+
+    path.write_text("Changed alt for {{ name }}")
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    assert registry.get_alternative("dummy.html").render(name="foo") == "Changed alt for foo"
+
+
+def test_registry_bytecode_cache(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache" / "jinja"
+
+    MailTemplateRegistry(TEMPLATE_FOLDER, bytecode_cache_dir=cache_dir).load()
+    assert len(list(cache_dir.iterdir())) == 3
+
+    # Another worker would load them from the bytecode cache.
+    registry = MailTemplateRegistry(TEMPLATE_FOLDER, bytecode_cache_dir=cache_dir)
+    registry.load()
+    assert registry.get("dummy.html").render(name="foo")
@@ -0,0 +1,37 @@
+import pytest
+
+from miolingo.utils.text import normalize, slugify, slugify_batch
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("chat", "chat"),
+        ("  Crème brûlée ! ", "creme-brulee"),
+        ("pomme_de  terre", "pomme-de-terre"),
+        ("Straße", "strasse"),
+        ("Привет, мир", "привет-мир"),
+        ("ﬁn ½", "fin-1-2"),
+        ("İstanbul", "istanbul"),
+        ("!?", ""),
+    ],
+)
+def test_normalize(text: str, expected: str) -> None:
+    assert normalize(text) == expected
+
+
+def test_slugify_cached() -> None:
+    slugify.cache_clear()
+
+    assert slugify("Crème brûlée") == "creme-brulee"
+    assert slugify("Crème brûlée") == "creme-brulee"
+
+    assert slugify.cache_info().hits == 1
+
+
+def test_slugify_batch() -> None:
+    slugify.cache_clear()
+
+    assert slugify_batch(["Crème brûlée", "", "Straße"]) == ["creme-brulee", "", "strasse"]
+    # Not cached, not to evict the words in use.
+    assert slugify.cache_info().currsize == 0
@@ -0,0 +1,77 @@
+import logging
+import re
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.types import Receive, Scope, Send
+
+from miolingo.db.instrumentation import query_stats
+from miolingo.db.session import async_session_factory
+from miolingo.utils.timing import TimingMiddleware, http_request_duration, http_requests
+
+
+@pytest.fixture
+def timing_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{id}")
+    async def get_item(id: int) -> dict[str, int]:
+        async with async_session_factory() as session:
+            for _ in range(id):
+                await session.execute(text("SELECT 1"))
+        return {"id": id}
+
+    return app
+
+
+async def test_middleware(timing_app: FastAPI, caplog: pytest.LogCaptureFixture) -> None:
+    timing_app.add_middleware(TimingMiddleware, server_timing=True, slow_threshold=60, repeat_threshold=3)
+    http_requests.values.pop(("GET", "/items/{id}", "200"), None)
+    http_request_duration.values.pop(("GET", "/items/{id}"), None)
+
+    async with AsyncClient(transport=ASGITransport(app=timing_app), base_url="http://test") as client:
+        with caplog.at_level(logging.WARNING):
+            response = await client.get("/items/2")
+            assert caplog.records == []
+
+            await client.get("/items/3")
+            await client.get("/unknown")
+
+    assert response.status_code == 200
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+', response.headers["server-timing"])
+    # Per route, not per path.
+    assert http_requests.values[("GET", "/items/{id}", "200")] == 2
+    assert sum(http_request_duration.values[("GET", "/items/{id}")][:-1]) == 2
+    assert not any(path == "/unknown" for _, path, _ in http_requests.values)
+    assert [record.getMessage() for record in caplog.records] == [
+        "Statement executed 3 times by GET /items/{id} (N+1 queries?): SELECT 1",
+    ]
+
+
+async def test_middleware_slow(timing_app: FastAPI, caplog: pytest.LogCaptureFixture) -> None:
+    timing_app.add_middleware(TimingMiddleware, slow_threshold=0)
+
+    async with AsyncClient(transport=ASGITransport(app=timing_app), base_url="http://test") as client:
+        with caplog.at_level(logging.WARNING):
+            response = await client.get("/items/1")
+
+    assert "server-timing" not in response.headers
+    [record] = caplog.records
+    assert record.getMessage().startswith("Slow request GET /items/{id}: ")
+    # Method, path, elapsed time, queries and their time.
+    assert record.args[3] >= 1
+
+
+async def test_middleware_not_http() -> None:
+    scopes = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        scopes.append(scope)
+
+    await TimingMiddleware(app)({"type": "lifespan"}, None, None)  # type: ignore
+
+    assert scopes == [{"type": "lifespan"}]
+    assert query_stats.get() is None
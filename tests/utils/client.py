@@ -1,9 +1,19 @@
-from typing import Any
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from fastapi import FastAPI
+from fastapi_users import FastAPIUsers
+from fastapi_users.authentication import AuthenticationBackend
 
 from httpx import ASGITransport, AsyncClient, Headers
 
+from miolingo.api.v1.endpoints import auth
+from miolingo.backends.authentication import get_database_strategy, get_jwt_strategy
 from miolingo.main import app
-from miolingo.models import AccessToken
+from miolingo.managers.users import get_user_manager
+from miolingo.models import AccessToken, User
+from miolingo.schemas.users import UserRead, UserUpdate
 
 
 class AsyncClientTest(AsyncClient):
@@ -12,8 +22,8 @@ class AsyncClientTest(AsyncClient):
         kwargs.setdefault("transport", ASGITransport(app=app))
         super().__init__(*args, **kwargs)
 
-    def url_path_for(self, name: str) -> str:
-        return self._transport.app.url_path_for(name)
+    def url_path_for(self, name: str, **path_params: Any) -> str:
+        return self._transport.app.url_path_for(name, **path_params)
 
     def force_login(self, access_token: AccessToken) -> None:
         # @TODO - should be binary ?? should it be base64 encoded too?
@@ -25,3 +35,36 @@ class AsyncClientTest(AsyncClient):
 
     def force_logout(self) -> None:
         self.headers = Headers()
+
+
+def build_auth_app(backend: AuthenticationBackend) -> FastAPI:
+    """
+    Build an app with the auth and users routes of another backend than the configured one.
+    """
+    users = FastAPIUsers[User, uuid.UUID](get_user_manager, [backend])
+    auth_app = FastAPI()
+    auth_app.include_router(users.get_auth_router(backend, requires_verification=True), prefix="/auth")
+    auth_app.include_router(auth.router, prefix="/auth")
+    auth_app.include_router(
+        users.get_users_router(UserRead, UserUpdate, requires_verification=True),
+        prefix="/users",
+    )
+    return auth_app
+
+
+@contextmanager
+def jwt_strategy() -> Iterator[None]:
+    """
+    Authenticate the requests to the app (with its own routes) by JWT, whatever
+    the configured backend, both sharing the bearer transport.
+    """
+    app.dependency_overrides[get_database_strategy] = get_jwt_strategy
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_database_strategy, None)
+
+
+async def write_jwt(user: User) -> str:
+    # An access token only, without refresh one.
+    return await get_jwt_strategy(refresh_token_db=None).write_token(user)  # type: ignore[arg-type]
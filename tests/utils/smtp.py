@@ -0,0 +1,105 @@
+import asyncio
+from email import message_from_bytes
+from email.message import Message
+from types import TracebackType
+from typing import Any, Self
+
+from miolingo.conf.settings import Settings
+from miolingo.utils.mails import PooledFastMail
+from miolingo.utils.smtp import SMTPConnectionPool
+
+
+class SMTPSink:
+    """
+    Minimal in-process SMTP server standing for a real relay in tests.
+
+    Accept any credentials and store received messages. The next `fail`
+    messages are rejected with a transient error to exercise retries. With
+    `drop`, sessions are closed by the server after each message.
+    """
+
+    def __init__(self, fail: int = 0, drop: bool = False) -> None:
+        self.fail = fail
+        self.drop = drop
+        self.messages: list[Message] = []
+        self.commands: list[bytes] = []
+        self.connections: int = 0
+        self.port: int = 0
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> Self:
+        self._server = await asyncio.start_server(self._handle, host="127.0.0.1", port=0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        def reply(*lines: str) -> None:
+            for i, line in enumerate(lines):
+                sep = " " if i == len(lines) - 1 else "-"
+                writer.write(f"{line[:3]}{sep}{line[4:]}\r\n".encode())
+
+        reply("220 sink ESMTP")
+        data: list[bytes] | None = None
+
+        while line := await reader.readline():
+            if data is not None:
+                if line == b".\r\n":
+                    if self.fail:
+                        self.fail -= 1
+                        reply("451 try again later")
+                    else:
+                        self.messages.append(message_from_bytes(b"".join(data)))
+                        reply("250 queued")
+                    data = None
+                    await writer.drain()
+                    if self.drop:
+                        break
+                else:
+                    data.append(line[1:] if line.startswith(b"..") else line)
+                continue
+
+            command = line[:4].upper()
+            self.commands.append(command)
+            if command == b"EHLO":
+                reply("250 sink", "250 AUTH PLAIN")
+            elif command == b"AUTH":
+                reply("235 authenticated")
+            elif command == b"DATA":
+                reply("354 end data with <CR><LF>.<CR><LF>")
+                data = []
+            elif command == b"QUIT":
+                reply("221 bye")
+                break
+            else:
+                reply("250 ok")
+
+            await writer.drain()
+
+        writer.close()
+
+
+def build_sink_mailer(sink: SMTPSink, **kwargs: Any) -> PooledFastMail:
+    """
+    Build a mailer really sending to the given sink, through a pool of SMTP sessions.
+    """
+    test_settings = Settings(
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=sink.port,
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        MAIL_SUPPRESS_SEND=0,
+    )
+    assert test_settings.SMTP_CONFIG is not None
+    return PooledFastMail(test_settings.SMTP_CONFIG, pool=SMTPConnectionPool(test_settings.SMTP_CONFIG, **kwargs))